@@ -13,22 +13,52 @@ Usage:
 
     With specific model:
         python -m scripts.batch_caption --input video.mp4 --model pulchowk
+
+    Resume an interrupted run, writing JSONL:
+        python -m scripts.batch_caption --input videos/ --output captions.jsonl --resume
+
+    Larger batches and more decoder workers:
+        python -m scripts.batch_caption --input videos/ --batch-size 8 --decode-workers 4
+
+    As a worker on a shared queue (see scripts.work_queue), on any number of hosts:
+        python -m scripts.batch_caption --queue /shared/archive.queue
+
+    With the warm model of a running server (no model loading):
+        python -m scripts.batch_caption --input clip.mp4 --server unix:/run/scene-descriptor/caption.sock
+        python -m scripts.batch_caption --input clips/ --server https://captions.example:8080 --upload
 """
 
 import argparse
-import csv
 import os
 import sys
 import time
+from functools import partial
 from pathlib import Path
-from typing import List, Optional
+from typing import Iterator, List, Optional
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-from scene_descriptor.config import settings, HP
-from scene_descriptor.models import get_model_manager, read_video_frames, sample_frames, convert_frames_to_av
-from scene_descriptor.enums import ModelType
+from scene_descriptor.config import settings
+from scene_descriptor.models import get_model_manager
+from scene_descriptor.enums import ModelType, OutputFormat
+from scene_descriptor.services import (
+    BatchCaptionPipeline,
+    CaptionCache,
+    CaptionServerClient,
+    ClipResult,
+    JsonlResultWriter,
+    LeaseHeartbeat,
+    WorkQueue,
+    default_worker_id,
+    error_log_path,
+    error_record,
+    open_result_writer,
+    result_record,
+)
+from scene_descriptor.services.output_service import DEFAULT_FSYNC_INTERVAL
+from scene_descriptor.services.work_queue_service import DEFAULT_LEASE_SECONDS
+from scene_descriptor.utils.exceptions import RequestError
 from scene_descriptor.utils.logging import setup_logging, get_logger
 
 logger = get_logger(__name__)
@@ -41,12 +71,52 @@ def parse_args() -> argparse.Namespace:
     )
     parser.add_argument(
         "--input", "-i",
-        required=True,
-        help="Input video file or directory"
+        help="Input video file or directory (with --queue: enqueue these first)"
+    )
+    parser.add_argument(
+        "--queue",
+        type=Path,
+        help="Work as a queue worker: lease videos from this queue and commit captions to it"
+    )
+    parser.add_argument(
+        "--lease-seconds",
+        type=float,
+        default=DEFAULT_LEASE_SECONDS,
+        help=f"Queue lease duration, renewed by heartbeat (default: {DEFAULT_LEASE_SECONDS:g})"
+    )
+    parser.add_argument(
+        "--server",
+        help="Caption with a running server's loaded model: http(s)://host:port or unix:/path/to/socket"
+    )
+    parser.add_argument(
+        "--upload",
+        action="store_true",
+        help="With --server: upload file contents instead of sending paths (required for http(s) servers)"
     )
     parser.add_argument(
         "--output", "-o",
-        help="Output CSV file (default: captions.csv)"
+        help="Output file, or directory for Parquet (default: captions.csv)"
+    )
+    parser.add_argument(
+        "--format",
+        choices=[f.value for f in OutputFormat],
+        help="Output format (default: from the output extension, else csv)"
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Keep existing output and skip videos that already have a caption"
+    )
+    parser.add_argument(
+        "--errors",
+        type=Path,
+        help="Error log for failed videos (default: <output>.errors.jsonl)"
+    )
+    parser.add_argument(
+        "--fsync-interval",
+        type=float,
+        default=DEFAULT_FSYNC_INTERVAL,
+        help=f"Seconds between syncs of results to disk (default: {DEFAULT_FSYNC_INTERVAL:g})"
     )
     parser.add_argument(
         "--model", "-m",
@@ -82,8 +152,44 @@ def parse_args() -> argparse.Namespace:
         default=Path("frames"),
         help="Directory to save frames (default: frames/)"
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore the caption cache and caption every file (cache hits don't save frames)"
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=4,
+        help="Clips captioned per generate call (default: 4)"
+    )
+    parser.add_argument(
+        "--decode-workers",
+        type=int,
+        default=0,
+        help="Parallel decoder workers (default: 0 = half the cores, up to 4)"
+    )
+    parser.add_argument(
+        "--prefetch",
+        type=int,
+        default=8,
+        help="Clips decoded ahead of inference (default: 8)"
+    )
+    parser.add_argument(
+        "--codec-threads",
+        type=int,
+        default=0,
+        help="Threads per decoder (default: 0 = codec chooses)"
+    )
 
-    return parser.parse_args()
+    args = parser.parse_args()
+    if not args.input and not args.queue:
+        parser.error("--input is required unless --queue is given")
+    if args.server and (args.queue or args.save_frames):
+        parser.error("--server cannot be combined with --queue or --save-frames")
+    if args.server and not args.server.startswith("unix:") and not args.upload:
+        parser.error("the server accepts paths only on its Unix socket; use --upload with http(s) servers")
+    return args
 
 
 def get_video_files(input_path: str) -> List[Path]:
@@ -113,66 +219,181 @@ def get_video_files(input_path: str) -> List[Path]:
     return []
 
 
-def caption_video(
-    video_path: Path,
-    model_manager,
-    max_length: int = 50,
-    save_frames: bool = False,
-    frames_dir: Path = None
-) -> Optional[str]:
+def save_sampled_frames(video_path: Path, frames, frames_dir: Path) -> None:
     """
-    Generate caption for a single video.
+    Save a video's sampled frames as JPEG files.
 
     Args:
-        video_path: Path to the video file
-        model_manager: Initialized ModelManager
-        max_length: Maximum caption length
-        save_frames: Whether to save sampled frames
+        video_path: Path to the video file (names the frame files)
+        frames: Sampled RGB frames
         frames_dir: Directory to save frames
+    """
+    import cv2
+
+    frames_dir.mkdir(parents=True, exist_ok=True)
+    video_name = video_path.stem
+    for i, frame in enumerate(frames):
+        frame_path = frames_dir / f"{video_name}_frame_{i}.jpg"
+        # Convert RGB to BGR for OpenCV
+        cv2.imwrite(str(frame_path), frame[:, :, ::-1])
+    logger.info(f"Saved {len(frames)} frames to {frames_dir}")
+
+
+def initialize_model(args: argparse.Namespace):
+    """
+    Load the ML models and select the requested one.
 
     Returns:
-        Generated caption or None if failed
+        Initialized ModelManager, or None if loading failed
     """
+    logger.info("Initializing ML models...")
     try:
-        logger.info(f"Processing: {video_path}")
-        start_time = time.time()
+        model_manager = get_model_manager()
+        model_manager.initialize(args.model_dir)
+
+        # Switch model if requested
+        if args.model == "pulchowk":
+            model_manager.switch_model(ModelType.PULCHOWK)
+
+        logger.info(f"Using model: {model_manager.current_model_type.value}")
+        return model_manager
+    except Exception as e:
+        logger.critical(f"Failed to initialize models: {e}")
+        return None
 
-        # Read video frames
-        frames = read_video_frames(str(video_path))
-        logger.debug(f"Read {len(frames)} frames")
 
-        # Sample frames
-        sampled = sample_frames(frames, HP.CLIP_LENGTH)
-        logger.debug(f"Sampled {len(sampled)} frames")
+def build_pipeline(args: argparse.Namespace, model_manager) -> BatchCaptionPipeline:
+    """Create the decode/inference pipeline from command line options."""
+    frame_hook = None
+    if args.save_frames:
+        frame_hook = partial(save_sampled_frames, frames_dir=args.frames_dir)
+
+    cache = None
+    if settings.caption_cache_enabled and not args.no_cache:
+        cache = CaptionCache()
+
+    return BatchCaptionPipeline(
+        model_manager,
+        batch_size=args.batch_size,
+        decode_workers=args.decode_workers or None,
+        prefetch=args.prefetch,
+        codec_threads=args.codec_threads,
+        max_length=args.max_length,
+        frame_hook=frame_hook,
+        cache=cache,
+    )
 
-        # Save frames if requested
-        if save_frames and frames_dir:
-            frames_dir.mkdir(parents=True, exist_ok=True)
-            import cv2
-            video_name = video_path.stem
-            for i, frame in enumerate(sampled):
-                frame_path = frames_dir / f"{video_name}_frame_{i}.jpg"
-                # Convert RGB to BGR for OpenCV
-                cv2.imwrite(str(frame_path), frame[:, :, ::-1])
-            logger.info(f"Saved {len(sampled)} frames to {frames_dir}")
 
-        # Convert to AV format
-        converted = convert_frames_to_av(sampled)
+def log_summary(pipeline: Optional[BatchCaptionPipeline], wall_seconds: float, videos: int) -> None:
+    """Log cache hits and per-stage timing of a finished run."""
+    if pipeline is None:
+        return
 
-        # Preprocess for model
-        pixel_values = model_manager.preprocess_frames(converted)
+    if pipeline.cache is not None:
+        stats = pipeline.cache.stats()
+        logger.info(
+            f"Caption cache: {stats.session_hits} hits, {stats.session_misses} misses "
+            f"({stats.entries} entries in {stats.path})"
+        )
+        pipeline.cache.close()
 
-        # Generate caption
-        caption = model_manager.generate_caption(pixel_values, max_length)
+    logger.info("Stage timing:")
+    for line in pipeline.timings.summary(wall_seconds, videos):
+        logger.info(f"  {line}")
 
-        duration = time.time() - start_time
-        logger.info(f"Caption ({duration:.2f}s): {caption}")
 
-        return caption
+def caption_on_server(args: argparse.Namespace, videos: List[Path]) -> Iterator[ClipResult]:
+    """
+    Caption videos with a running server's model, a chunk of paths (or one upload) per request.
 
-    except Exception as e:
-        logger.error(f"Failed to caption {video_path}: {e}", exc_info=True)
-        return None
+    Raises:
+        RequestError: If the server cannot be reached
+    """
+    client = CaptionServerClient(args.server)
+    health = client.health()
+    logger.info(f"Using server {args.server} (model: {health.get('current_model')})")
+    if health.get("current_model") and health["current_model"] != args.model:
+        logger.warning(f"Server runs {health['current_model']}; --model is ignored with --server")
+
+    if args.upload:
+        for video_path in videos:
+            try:
+                yield client.caption_upload(video_path, args.max_length)
+            except RequestError as e:
+                if isinstance(e.cause, OSError):
+                    raise
+                yield ClipResult(video_path, error=str(e))
+        return
+
+    chunk_size = max(args.batch_size, args.prefetch)
+    for offset in range(0, len(videos), chunk_size):
+        chunk = videos[offset:offset + chunk_size]
+        try:
+            yield from client.caption_paths(chunk, args.max_length)
+        except RequestError as e:
+            if isinstance(e.cause, OSError):
+                raise
+            for video_path in chunk:
+                yield ClipResult(video_path.resolve(), error=str(e))
+
+
+def run_queue_worker(args: argparse.Namespace) -> int:
+    """
+    Caption videos leased from a shared work queue until it is finished.
+
+    Captions and failures are committed to the queue; export them with
+    scripts.work_queue.
+    """
+    work_queue = WorkQueue(args.queue)
+    worker = default_worker_id()
+
+    if args.input:
+        work_queue.enqueue(get_video_files(args.input))
+
+    progress = work_queue.progress()
+    if progress.finished:
+        logger.info(f"Queue {args.queue} has nothing left to do")
+        work_queue.close()
+        return 0
+    logger.info(f"Worker {worker} joining queue {args.queue}: {progress.pending} pending")
+
+    model_manager = initialize_model(args)
+    if model_manager is None:
+        work_queue.close()
+        return 1
+
+    pipeline = build_pipeline(args, model_manager)
+
+    # Lease about as many items as the pipeline keeps in flight
+    leased = {}
+
+    def leased_paths():
+        for item in work_queue.drain(worker, max(args.batch_size, args.prefetch), args.lease_seconds):
+            leased[item.path] = item
+            yield Path(item.path)
+
+    succeeded = 0
+    failed = 0
+    start_time = time.time()
+    with LeaseHeartbeat(work_queue, worker, args.lease_seconds):
+        for result in pipeline.run(leased_paths()):
+            item = leased.pop(str(result.video_path))
+            if result.ok:
+                logger.info(f"Caption for {result.video_path.name}: {result.caption}")
+                succeeded += work_queue.commit(item.id, worker, result.caption)
+            else:
+                logger.error(f"Failed to caption {result.video_path}: {result.error}")
+                work_queue.fail(item.id, worker, result.error)
+                failed += 1
+    wall_seconds = time.time() - start_time
+
+    logger.info("=" * 60)
+    logger.info(f"Worker {worker}: {succeeded} captions committed, {failed} failures")
+    log_summary(pipeline, wall_seconds, succeeded + failed)
+    logger.info("=" * 60)
+
+    work_queue.close()
+    return 0
 
 
 def main() -> int:
@@ -187,6 +408,9 @@ def main() -> int:
     logger.info("Batch Video Captioning")
     logger.info("=" * 60)
 
+    if args.queue:
+        return run_queue_worker(args)
+
     # Get video files
     videos = get_video_files(args.input)
     if not videos:
@@ -195,54 +419,75 @@ def main() -> int:
 
     logger.info(f"Found {len(videos)} video(s) to process")
 
-    # Initialize model
-    logger.info("Initializing ML models...")
+    # Open outputs; results are appended as each video finishes
+    output_path = Path(args.output or "captions.csv")
+    output_format = OutputFormat(args.format) if args.format else None
     try:
-        model_manager = get_model_manager()
-        model_manager.initialize(args.model_dir)
-
-        # Switch model if requested
-        if args.model == "pulchowk":
-            model_manager.switch_model(ModelType.PULCHOWK)
-
-        logger.info(f"Using model: {model_manager.current_model_type.value}")
+        writer = open_result_writer(
+            output_path,
+            output_format,
+            append=args.resume,
+            fsync_interval=args.fsync_interval
+        )
     except Exception as e:
-        logger.critical(f"Failed to initialize models: {e}")
+        logger.critical(f"Failed to open output {output_path}: {e}")
         return 1
-
-    # Process videos
-    results = []
-    for video_path in videos:
-        caption = caption_video(
-            video_path,
-            model_manager,
-            max_length=args.max_length,
-            save_frames=args.save_frames,
-            frames_dir=args.frames_dir
-        )
-        if caption:
-            results.append((video_path.name, caption))
-
-    # Save results
-    if results:
-        output_file = args.output or "captions.csv"
-        output_path = Path(output_file)
-
-        with open(output_path, "w", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow(["video", "caption"])
-            writer.writerows(results)
-
-        logger.info(f"Saved {len(results)} captions to {output_path}")
+    errors_path = args.errors or error_log_path(output_path)
+    error_log = JsonlResultWriter(errors_path, append=args.resume, fsync_interval=args.fsync_interval)
+
+    pending = videos
+    if args.resume:
+        done = writer.completed()
+        pending = [v for v in videos if str(v.resolve()) not in done and v.name not in done]
+        logger.info(f"Resuming: {len(videos) - len(pending)} already captioned, {len(pending)} to go")
+
+    succeeded = 0
+    failed = 0
+    wall_seconds = 0.0
+    pipeline = None
+
+    with writer, error_log:
+        if pending:
+            if args.server:
+                results = caption_on_server(args, pending)
+            else:
+                model_manager = initialize_model(args)
+                if model_manager is None:
+                    return 1
+
+                # Process videos: decoding overlaps batched inference
+                pipeline = build_pipeline(args, model_manager)
+                results = pipeline.run(pending)
+
+            start_time = time.time()
+            try:
+                for result in results:
+                    if result.ok:
+                        logger.info(f"Caption for {result.video_path.name}: {result.caption}")
+                        writer.write(result_record(result.video_path, result.caption))
+                        succeeded += 1
+                    else:
+                        logger.error(f"Failed to caption {result.video_path}: {result.error}")
+                        error_log.write(error_record(result.video_path, result.error))
+                        failed += 1
+            except RequestError as e:
+                logger.critical(str(e))
+                return 1
+            wall_seconds = time.time() - start_time
+
+    logger.info(f"Saved {succeeded} captions to {output_path}")
+    if failed:
+        logger.info(f"Logged {failed} failures to {errors_path}")
 
     # Summary
     logger.info("=" * 60)
-    logger.info(f"Processed: {len(videos)} videos")
-    logger.info(f"Successful: {len(results)} captions")
-    logger.info(f"Failed: {len(videos) - len(results)}")
+    logger.info(f"Processed: {len(pending)} videos ({len(videos) - len(pending)} skipped)")
+    logger.info(f"Successful: {succeeded} captions")
+    logger.info(f"Failed: {failed}")
+    log_summary(pipeline, wall_seconds, len(pending))
     logger.info("=" * 60)
 
-    return 0 if results else 1
+    return 0 if succeeded or not pending else 1
 
 
 if __name__ == "__main__":
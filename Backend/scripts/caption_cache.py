@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Caption Cache Maintenance
+
+Inspect and prune the offline caption cache used by batch_caption.
+
+Usage:
+    Show cache size and hits:
+        python -m scripts.caption_cache stats
+
+    Drop entries unused for 30 days and keep at most 100k:
+        python -m scripts.caption_cache prune --older-than 30 --max-entries 100000
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from scene_descriptor.config import settings
+from scene_descriptor.services import CaptionCache
+from scene_descriptor.utils.logging import setup_logging, get_logger
+
+logger = get_logger(__name__)
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Inspect and prune the caption cache"
+    )
+    parser.add_argument(
+        "--cache",
+        type=Path,
+        default=settings.caption_cache_path,
+        help=f"Cache database (default: {settings.caption_cache_path})"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("stats", help="Show cache size and hit counts")
+
+    prune = subparsers.add_parser("prune", help="Remove old or unneeded entries")
+    prune.add_argument(
+        "--older-than",
+        type=float,
+        metavar="DAYS",
+        help="Drop entries not used for this many days"
+    )
+    prune.add_argument(
+        "--max-entries",
+        type=int,
+        help="Keep at most this many entries (least recently used go first)"
+    )
+    prune.add_argument(
+        "--keep-model",
+        metavar="MODEL_ID",
+        help="Drop entries from every other model identity"
+    )
+
+    return parser.parse_args()
+
+
+def main() -> int:
+    """Main entry point."""
+    args = parse_args()
+    setup_logging(log_level="INFO", console_output=True)
+
+    if not args.cache.exists():
+        logger.error(f"No caption cache at {args.cache}")
+        return 1
+
+    cache = CaptionCache(args.cache)
+    try:
+        if args.command == "prune":
+            cache.prune(
+                older_than_days=args.older_than,
+                max_entries=args.max_entries,
+                keep_model=args.keep_model,
+            )
+        print(json.dumps(cache.stats().to_dict(), indent=2))
+    finally:
+        cache.close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
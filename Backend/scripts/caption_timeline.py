@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Timeline Captioning Script
+
+Caption long videos segment by segment and write a WebVTT or SRT
+subtitle track per video, for recorded walks, lectures and other long
+footage.
+
+Usage:
+    One caption every 10 seconds:
+        python -m scripts.caption_timeline --input walk.mp4
+
+    Segments at scene cuts, SRT output into a directory:
+        python -m scripts.caption_timeline --input lectures/ --scenes --format srt --output-dir subs/
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from scene_descriptor.config import settings
+from scene_descriptor.services import caption_timeline, write_timeline
+from scene_descriptor.utils.logging import setup_logging, get_logger
+from scripts.batch_caption import build_pipeline, get_video_files, initialize_model, log_summary
+
+logger = get_logger(__name__)
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Caption long videos as a subtitle timeline"
+    )
+    parser.add_argument(
+        "--input", "-i",
+        required=True,
+        help="Input video file or directory"
+    )
+    parser.add_argument(
+        "--output-dir", "-o",
+        type=Path,
+        help="Directory for subtitle files (default: next to each video)"
+    )
+    parser.add_argument(
+        "--format",
+        choices=["vtt", "srt"],
+        default="vtt",
+        help="Subtitle format (default: vtt)"
+    )
+    parser.add_argument(
+        "--segment-seconds",
+        type=float,
+        default=10.0,
+        help="Segment length for fixed segmentation (default: 10)"
+    )
+    parser.add_argument(
+        "--scenes",
+        action="store_true",
+        help="Split at scene cuts instead of fixed lengths"
+    )
+    parser.add_argument(
+        "--min-scene",
+        type=float,
+        default=2.0,
+        help="Shortest scene segment in seconds (default: 2)"
+    )
+    parser.add_argument(
+        "--max-scene",
+        type=float,
+        default=30.0,
+        help="Longest scene segment in seconds (default: 30)"
+    )
+    parser.add_argument(
+        "--model", "-m",
+        choices=["git", "pulchowk"],
+        default="git",
+        help="Model to use for captioning (default: git)"
+    )
+    parser.add_argument(
+        "--model-dir",
+        type=Path,
+        default=settings.model_dir,
+        help=f"Directory containing ML models (default: {settings.model_dir})"
+    )
+    parser.add_argument(
+        "--max-length",
+        type=int,
+        default=50,
+        help="Maximum caption length (default: 50)"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore the caption cache and caption every segment"
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=4,
+        help="Segments captioned per generate call (default: 4)"
+    )
+    parser.add_argument(
+        "--decode-workers",
+        type=int,
+        default=0,
+        help="Segments decoded in parallel (default: 0 = half the cores, up to 4)"
+    )
+    parser.add_argument(
+        "--prefetch",
+        type=int,
+        default=8,
+        help="Segments decoded ahead of inference (default: 8)"
+    )
+    parser.add_argument(
+        "--codec-threads",
+        type=int,
+        default=0,
+        help="Threads per decoder (default: 0 = codec chooses)"
+    )
+    parser.add_argument(
+        "--verbose", "-v",
+        action="store_true",
+        help="Enable verbose output"
+    )
+    parser.set_defaults(save_frames=False, frames_dir=None)
+
+    return parser.parse_args()
+
+
+def main() -> int:
+    """Main entry point."""
+    args = parse_args()
+
+    log_level = "DEBUG" if args.verbose else "INFO"
+    setup_logging(log_level=log_level, console_output=True)
+
+    videos = get_video_files(args.input)
+    if not videos:
+        logger.error("No video files found")
+        return 1
+
+    model_manager = initialize_model(args)
+    if model_manager is None:
+        return 1
+
+    pipeline = build_pipeline(args, model_manager)
+
+    written = 0
+    start_time = time.time()
+    for video_path in videos:
+        output_dir = args.output_dir or video_path.parent
+        output_path = output_dir / f"{video_path.stem}.{args.format}"
+        try:
+            cues = caption_timeline(
+                video_path,
+                pipeline,
+                segment_seconds=args.segment_seconds,
+                scenes=args.scenes,
+                min_scene_seconds=args.min_scene,
+                max_scene_seconds=args.max_scene,
+            )
+        except Exception as e:
+            logger.error(f"Failed to caption timeline of {video_path}: {e}")
+            continue
+
+        write_timeline(cues, output_path, args.format)
+        logger.info(f"Wrote {len(cues)} cues to {output_path}")
+        written += 1
+
+    logger.info("=" * 60)
+    logger.info(f"Timelines written: {written}/{len(videos)}")
+    log_summary(pipeline, time.time() - start_time, written)
+    logger.info("=" * 60)
+
+    return 0 if written else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
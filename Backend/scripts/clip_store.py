@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Preprocessed Clip Store
+
+Decode and preprocess a corpus once into a memory-mapped clip store, then
+caption it as often as needed (other model, other caption length) without
+touching the videos again.
+
+Usage:
+    Prepare a store (needs only the processor, not the models):
+        python -m scripts.clip_store prepare --input videos/ --store corpus.clips
+
+    Caption it with each model:
+        python -m scripts.clip_store caption --store corpus.clips --output git.csv
+        python -m scripts.clip_store caption --store corpus.clips --model pulchowk --output pulchowk.jsonl
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from scene_descriptor.config import settings
+from scene_descriptor.enums import OutputFormat
+from scene_descriptor.models import get_model_manager
+from scene_descriptor.services import (
+    BatchCaptionPipeline,
+    ClipStore,
+    JsonlResultWriter,
+    caption_clip_store,
+    error_log_path,
+    error_record,
+    open_result_writer,
+    prepare_clip_store,
+    result_record,
+)
+from scene_descriptor.services.clip_store_service import STORE_DTYPES
+from scene_descriptor.utils.logging import setup_logging, get_logger
+from scripts.batch_caption import get_video_files, initialize_model
+
+logger = get_logger(__name__)
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Prepare and caption a store of preprocessed clips"
+    )
+    parser.add_argument(
+        "--model-dir",
+        type=Path,
+        default=settings.model_dir,
+        help=f"Directory containing ML models (default: {settings.model_dir})"
+    )
+    parser.add_argument(
+        "--verbose", "-v",
+        action="store_true",
+        help="Enable verbose output"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    prepare = subparsers.add_parser("prepare", help="Decode and preprocess videos into a store")
+    prepare.add_argument(
+        "--input", "-i",
+        required=True,
+        help="Input video file or directory"
+    )
+    prepare.add_argument(
+        "--store", "-s",
+        type=Path,
+        required=True,
+        help="Store directory to create"
+    )
+    prepare.add_argument(
+        "--dtype",
+        choices=STORE_DTYPES,
+        default="float16",
+        help="Stored element type (default: float16)"
+    )
+    prepare.add_argument(
+        "--decode-workers",
+        type=int,
+        default=0,
+        help="Videos decoded in parallel (default: 0 = half the cores, up to 4)"
+    )
+    prepare.add_argument(
+        "--prefetch",
+        type=int,
+        default=8,
+        help="Most clips decoded ahead of writing (default: 8)"
+    )
+    prepare.add_argument(
+        "--codec-threads",
+        type=int,
+        default=0,
+        help="Threads per decoder (default: 0 = codec chooses)"
+    )
+
+    caption = subparsers.add_parser("caption", help="Caption every clip in a store")
+    caption.add_argument(
+        "--store", "-s",
+        type=Path,
+        required=True,
+        help="Prepared store directory"
+    )
+    caption.add_argument(
+        "--output", "-o",
+        type=Path,
+        default=Path("captions.csv"),
+        help="Output file, or directory for Parquet (default: captions.csv)"
+    )
+    caption.add_argument(
+        "--format",
+        choices=[f.value for f in OutputFormat],
+        help="Output format (default: from the output extension, else csv)"
+    )
+    caption.add_argument(
+        "--resume",
+        action="store_true",
+        help="Append to an existing output, skipping clips already captioned"
+    )
+    caption.add_argument(
+        "--model", "-m",
+        choices=["git", "pulchowk"],
+        default="git",
+        help="Model to use for captioning (default: git)"
+    )
+    caption.add_argument(
+        "--max-length",
+        type=int,
+        default=50,
+        help="Maximum caption length (default: 50)"
+    )
+    caption.add_argument(
+        "--batch-size",
+        type=int,
+        default=8,
+        help="Clips captioned per generate call (default: 8)"
+    )
+
+    return parser.parse_args()
+
+
+def prepare(args: argparse.Namespace) -> int:
+    """Decode and preprocess the input videos into a new store."""
+    videos = get_video_files(args.input)
+    if not videos:
+        logger.error("No video files found")
+        return 1
+
+    model_manager = get_model_manager()
+    try:
+        model_manager.load_processor(args.model_dir)
+    except Exception as e:
+        logger.critical(f"Failed to load processor: {e}")
+        return 1
+
+    pipeline = BatchCaptionPipeline(
+        model_manager,
+        decode_workers=args.decode_workers or None,
+        prefetch=args.prefetch,
+        codec_threads=args.codec_threads,
+    )
+
+    start_time = time.time()
+    try:
+        store = prepare_clip_store(
+            args.store,
+            videos,
+            pipeline,
+            model_manager.processor_identity,
+            dtype=args.dtype
+        )
+    except (FileExistsError, ValueError) as e:
+        logger.error(str(e))
+        return 1
+    wall_seconds = time.time() - start_time
+
+    logger.info("=" * 60)
+    logger.info(f"Stored {len(store)}/{len(videos)} clips in {args.store}")
+    for line in pipeline.timings.summary(wall_seconds, len(videos)):
+        logger.info(f"  {line}")
+    logger.info("=" * 60)
+    return 0
+
+
+def caption(args: argparse.Namespace) -> int:
+    """Caption every clip in a store with the requested model."""
+    try:
+        store = ClipStore(args.store)
+    except FileNotFoundError as e:
+        logger.error(str(e))
+        return 1
+
+    output_format = OutputFormat(args.format) if args.format else None
+    try:
+        writer = open_result_writer(args.output, output_format, append=args.resume)
+    except Exception as e:
+        logger.critical(f"Failed to open output {args.output}: {e}")
+        return 1
+    errors_path = error_log_path(args.output)
+    error_log = JsonlResultWriter(errors_path, append=args.resume)
+
+    skip = writer.completed() if args.resume else None
+    if skip:
+        logger.info(f"Resuming: {len(skip)} clips already captioned")
+
+    succeeded = 0
+    failed = 0
+    with writer, error_log:
+        model_manager = initialize_model(args)
+        if model_manager is None:
+            return 1
+
+        start_time = time.time()
+        try:
+            for result in caption_clip_store(store, model_manager, args.batch_size, args.max_length, skip):
+                if result.ok:
+                    logger.info(f"Caption for {result.video_path.name}: {result.caption}")
+                    writer.write(result_record(result.video_path, result.caption))
+                    succeeded += 1
+                else:
+                    error_log.write(error_record(result.video_path, result.error))
+                    failed += 1
+        except ValueError as e:
+            logger.error(str(e))
+            return 1
+        wall_seconds = time.time() - start_time
+
+    rate = (succeeded + failed) / wall_seconds if wall_seconds > 0 else 0.0
+    logger.info("=" * 60)
+    logger.info(f"Captioned {succeeded}/{len(store)} clips from {args.store} ({rate:.2f} clips/s)")
+    if failed:
+        logger.info(f"Logged {failed} failures to {errors_path}")
+    logger.info("=" * 60)
+    return 0 if succeeded or not failed else 1
+
+
+def main() -> int:
+    """Main entry point."""
+    args = parse_args()
+
+    log_level = "DEBUG" if args.verbose else "INFO"
+    setup_logging(log_level=log_level, console_output=True)
+
+    if args.command == "prepare":
+        return prepare(args)
+    return caption(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
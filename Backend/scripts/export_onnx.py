@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+ONNX Export Script
+
+Export a caption model's prefill and decoder step to ONNX for the
+ONNX Runtime backend (INFERENCE_BACKEND=onnx).
+
+Usage:
+    python -m scripts.export_onnx
+    python -m scripts.export_onnx --model pulchowk --output-dir ml-models/onnx
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from scene_descriptor.config import settings, HP, MODEL_CONST
+from scene_descriptor.models import get_model_manager
+from scene_descriptor.models.onnx_export import export_git_onnx
+from scene_descriptor.enums import ModelType
+from scene_descriptor.utils.logging import setup_logging, get_logger
+
+logger = get_logger(__name__)
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Export a caption model to ONNX"
+    )
+    parser.add_argument(
+        "--model", "-m",
+        choices=["git", "pulchowk"],
+        default="git",
+        help="Model to export (default: git)"
+    )
+    parser.add_argument(
+        "--model-dir",
+        type=Path,
+        default=settings.model_dir,
+        help=f"Directory containing ML models (default: {settings.model_dir})"
+    )
+    parser.add_argument(
+        "--output-dir", "-o",
+        type=Path,
+        default=settings.onnx_model_dir,
+        help=f"Directory for exported models (default: {settings.onnx_model_dir})"
+    )
+    parser.add_argument(
+        "--opset",
+        type=int,
+        default=17,
+        help="ONNX opset version (default: 17)"
+    )
+    parser.add_argument(
+        "--verbose", "-v",
+        action="store_true",
+        help="Enable verbose output"
+    )
+
+    return parser.parse_args()
+
+
+def main() -> int:
+    """Main entry point."""
+    args = parse_args()
+
+    log_level = "DEBUG" if args.verbose else "INFO"
+    setup_logging(log_level=log_level, console_output=True)
+
+    # Export from the plain fp32 PyTorch model
+    settings.inference_backend = "torch"
+    settings.model_precision = "fp32"
+    settings.quantized_models = ""
+    settings.precision_report = False
+    settings.warmup_iterations = 0
+
+    try:
+        model_manager = get_model_manager()
+        model_manager.initialize(args.model_dir)
+        model_manager.switch_model(ModelType(args.model))
+    except Exception as e:
+        logger.critical(f"Failed to initialize models: {e}")
+        return 1
+
+    crop_size = model_manager.processor.image_processor.crop_size
+    output_dir = args.output_dir / args.model
+
+    try:
+        export_git_onnx(
+            model_manager.model,
+            output_dir,
+            clip_length=HP.CLIP_LENGTH,
+            image_size=crop_size["height"],
+            opset=args.opset,
+        )
+        model_manager.processor.save_pretrained(output_dir / MODEL_CONST.PROCESSOR_SUBDIR)
+    except Exception as e:
+        logger.critical(f"ONNX export failed: {e}", exc_info=True)
+        return 1
+
+    logger.info(f"Exported {args.model} model to {output_dir}")
+    logger.info("Run the server with INFERENCE_BACKEND=onnx to use it")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
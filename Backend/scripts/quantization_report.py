@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Quantization Comparison Report
+
+Caption the same videos with the fp32 model and its dynamic int8 version,
+then report caption agreement and per-caption latency.
+
+Usage:
+    python -m scripts.quantization_report --input videos/
+    python -m scripts.quantization_report --input videos/ --model pulchowk --output report.csv
+"""
+
+import argparse
+import csv
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import List, Tuple
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import torch
+
+from scene_descriptor.config import settings, HP, MODEL_CONST
+from scene_descriptor.models import (
+    get_model_manager,
+    read_video_frames,
+    sample_frames,
+    convert_frames_to_av,
+    load_or_quantize_int8,
+    model_fingerprint,
+)
+from scene_descriptor.enums import ModelType
+from scene_descriptor.utils.logging import setup_logging, get_logger
+from scripts.batch_caption import get_video_files
+
+logger = get_logger(__name__)
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Compare fp32 and int8 captions on a set of videos"
+    )
+    parser.add_argument(
+        "--input", "-i",
+        required=True,
+        help="Input video file or directory"
+    )
+    parser.add_argument(
+        "--output", "-o",
+        help="Optional CSV file for per-video results"
+    )
+    parser.add_argument(
+        "--model", "-m",
+        choices=["git", "pulchowk"],
+        default="git",
+        help="Model to compare (default: git)"
+    )
+    parser.add_argument(
+        "--model-dir",
+        type=Path,
+        default=settings.model_dir,
+        help=f"Directory containing ML models (default: {settings.model_dir})"
+    )
+    parser.add_argument(
+        "--max-length",
+        type=int,
+        default=settings.max_caption_length,
+        help=f"Maximum caption length (default: {settings.max_caption_length})"
+    )
+    parser.add_argument(
+        "--verbose", "-v",
+        action="store_true",
+        help="Enable verbose output"
+    )
+
+    return parser.parse_args()
+
+
+def token_f1(reference: str, candidate: str) -> float:
+    """
+    Word-overlap F1 between two captions.
+
+    Args:
+        reference: fp32 caption
+        candidate: int8 caption
+
+    Returns:
+        F1 score in [0, 1]
+    """
+    ref_tokens = reference.lower().split()
+    cand_tokens = candidate.lower().split()
+    if not ref_tokens or not cand_tokens:
+        return float(ref_tokens == cand_tokens)
+
+    overlap = sum((Counter(ref_tokens) & Counter(cand_tokens)).values())
+    if overlap == 0:
+        return 0.0
+
+    precision = overlap / len(cand_tokens)
+    recall = overlap / len(ref_tokens)
+    return 2 * precision * recall / (precision + recall)
+
+
+def timed_caption(model, processor, pixel_values, max_length: int) -> Tuple[str, float]:
+    """
+    Generate one caption and measure its latency.
+
+    Returns:
+        Tuple of (caption, seconds)
+    """
+    start_time = time.perf_counter()
+    with torch.no_grad():
+        generated_ids = model.generate(pixel_values=pixel_values, max_length=max_length)
+    caption = processor.batch_decode(generated_ids, skip_special_tokens=True)[0]
+    return caption, time.perf_counter() - start_time
+
+
+def main() -> int:
+    """Main entry point."""
+    args = parse_args()
+
+    log_level = "DEBUG" if args.verbose else "INFO"
+    setup_logging(log_level=log_level, console_output=True)
+
+    videos = get_video_files(args.input)
+    if not videos:
+        logger.error("No video files found")
+        return 1
+
+    # Load the fp32 baseline regardless of QUANTIZED_MODELS
+    settings.quantized_models = ""
+    try:
+        model_manager = get_model_manager()
+        model_manager.initialize(args.model_dir)
+        model_manager.switch_model(ModelType(args.model))
+    except Exception as e:
+        logger.critical(f"Failed to initialize models: {e}")
+        return 1
+
+    fp32_model = model_manager.model.to("cpu")
+    sources = [args.model_dir / "git-base-vatex"]
+    if args.model == ModelType.PULCHOWK.value:
+        sources.append(args.model_dir / "pulchowk-model" / MODEL_CONST.PULCHOWK_MODEL_FILE)
+    int8_model = load_or_quantize_int8(
+        fp32_model,
+        name=args.model,
+        fingerprint=model_fingerprint(sources),
+        cache_dir=settings.quantization_cache_dir,
+    )
+    processor = model_manager.processor
+
+    rows: List[tuple] = []
+    for video_path in videos:
+        try:
+            frames = sample_frames(read_video_frames(str(video_path)), HP.CLIP_LENGTH)
+            pixel_values = model_manager.preprocess_frames(convert_frames_to_av(frames)).to("cpu")
+
+            fp32_caption, fp32_time = timed_caption(fp32_model, processor, pixel_values, args.max_length)
+            int8_caption, int8_time = timed_caption(int8_model, processor, pixel_values, args.max_length)
+        except Exception as e:
+            logger.error(f"Failed to compare {video_path}: {e}")
+            continue
+
+        rows.append((
+            video_path.name,
+            fp32_caption,
+            int8_caption,
+            fp32_caption == int8_caption,
+            round(token_f1(fp32_caption, int8_caption), 4),
+            round(fp32_time, 4),
+            round(int8_time, 4),
+        ))
+        logger.info(f"{video_path.name}: fp32='{fp32_caption}' int8='{int8_caption}'")
+
+    if not rows:
+        logger.error("No videos could be compared")
+        return 1
+
+    if args.output:
+        with open(args.output, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["video", "fp32", "int8", "exact_match", "token_f1", "fp32_seconds", "int8_seconds"])
+            writer.writerows(rows)
+        logger.info(f"Saved per-video results to {args.output}")
+
+    count = len(rows)
+    exact = sum(row[3] for row in rows) / count
+    f1 = sum(row[4] for row in rows) / count
+    fp32_mean = sum(row[5] for row in rows) / count
+    int8_mean = sum(row[6] for row in rows) / count
+
+    logger.info("=" * 60)
+    logger.info(f"Videos compared:     {count}")
+    logger.info(f"Exact caption match: {exact:.1%}")
+    logger.info(f"Mean token F1:       {f1:.3f}")
+    logger.info(f"fp32 mean latency:   {fp32_mean:.3f}s")
+    logger.info(f"int8 mean latency:   {int8_mean:.3f}s ({fp32_mean / int8_mean:.2f}x)")
+    logger.info("=" * 60)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
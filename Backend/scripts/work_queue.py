@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Distributed Captioning Queue
+
+Coordinate batch captioning across processes and hosts through a shared
+queue file. Workers are batch_caption processes started with --queue.
+
+Usage:
+    Enqueue a directory:
+        python -m scripts.work_queue --queue /shared/archive.queue enqueue --input videos/
+
+    Cluster-wide progress, refreshed every 30 seconds:
+        python -m scripts.work_queue --queue /shared/archive.queue progress --watch 30
+
+    Export captions (and failures) when done:
+        python -m scripts.work_queue --queue /shared/archive.queue export --output captions.jsonl
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from scene_descriptor.enums import OutputFormat
+from scene_descriptor.services import (
+    JsonlResultWriter,
+    QueueProgress,
+    WorkQueue,
+    error_log_path,
+    error_record,
+    open_result_writer,
+    result_record,
+)
+from scene_descriptor.utils.logging import setup_logging, get_logger
+from scripts.batch_caption import get_video_files
+
+logger = get_logger(__name__)
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Manage a shared batch captioning queue"
+    )
+    parser.add_argument(
+        "--queue",
+        type=Path,
+        required=True,
+        help="Queue database file (on storage every worker can reach)"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    enqueue = subparsers.add_parser("enqueue", help="Add videos to the queue")
+    enqueue.add_argument(
+        "--input", "-i",
+        required=True,
+        help="Video file or directory"
+    )
+
+    progress = subparsers.add_parser("progress", help="Show counts, throughput and ETA")
+    progress.add_argument(
+        "--watch",
+        type=float,
+        metavar="SECONDS",
+        help="Repeat every SECONDS until the queue is finished"
+    )
+    progress.add_argument(
+        "--json",
+        action="store_true",
+        help="Print progress as JSON"
+    )
+
+    export = subparsers.add_parser("export", help="Write captions and failures to files")
+    export.add_argument(
+        "--output", "-o",
+        type=Path,
+        default=Path("captions.csv"),
+        help="Output file, or directory for Parquet (default: captions.csv)"
+    )
+    export.add_argument(
+        "--format",
+        choices=[f.value for f in OutputFormat],
+        help="Output format (default: from the output extension, else csv)"
+    )
+
+    subparsers.add_parser("retry-failed", help="Move failed videos back to pending")
+
+    return parser.parse_args()
+
+
+def format_progress(progress: QueueProgress) -> str:
+    """One-line progress summary."""
+    eta = "n/a"
+    if progress.eta_seconds is not None:
+        minutes, seconds = divmod(int(progress.eta_seconds), 60)
+        hours, minutes = divmod(minutes, 60)
+        eta = f"{hours}h{minutes:02d}m{seconds:02d}s"
+
+    percent = 100 * (progress.done + progress.failed) / progress.total if progress.total else 100
+    return (
+        f"{progress.done + progress.failed}/{progress.total} ({percent:.1f}%) - "
+        f"pending {progress.pending}, leased {progress.leased}, done {progress.done}, "
+        f"failed {progress.failed} - {progress.active_workers} workers, "
+        f"{progress.rate_per_minute:.1f} videos/min, ETA {eta}"
+    )
+
+
+def show_progress(work_queue: WorkQueue, args: argparse.Namespace) -> None:
+    """Print progress once, or repeatedly with --watch."""
+    while True:
+        progress = work_queue.progress()
+        if args.json:
+            print(json.dumps(progress.to_dict()), flush=True)
+        else:
+            print(format_progress(progress), flush=True)
+            for worker, rate in sorted(progress.workers.items()):
+                print(f"  {worker}: {rate:.1f} videos/min", flush=True)
+
+        if not args.watch or progress.finished:
+            return
+        time.sleep(args.watch)
+
+
+def export_results(work_queue: WorkQueue, args: argparse.Namespace) -> None:
+    """Write captions to the output and failures to its error log."""
+    output_format = OutputFormat(args.format) if args.format else None
+
+    with open_result_writer(args.output, output_format) as writer:
+        for row in work_queue.results("done"):
+            writer.write(result_record(Path(row["path"]), row["caption"]))
+
+    failures = work_queue.results("failed")
+    with JsonlResultWriter(error_log_path(args.output)) as error_log:
+        for row in failures:
+            error_log.write(error_record(Path(row["path"]), row["error"] or "unknown"))
+
+    logger.info(f"Exported {writer.written} captions to {args.output} and {len(failures)} failures")
+
+
+def main() -> int:
+    """Main entry point."""
+    args = parse_args()
+    setup_logging(log_level="INFO", console_output=True)
+
+    if args.command != "enqueue" and not args.queue.exists():
+        logger.error(f"No queue at {args.queue}")
+        return 1
+
+    work_queue = WorkQueue(args.queue)
+    try:
+        if args.command == "enqueue":
+            videos = get_video_files(args.input)
+            if not videos:
+                logger.error("No video files found")
+                return 1
+            work_queue.enqueue(videos)
+            print(format_progress(work_queue.progress()))
+        elif args.command == "progress":
+            show_progress(work_queue, args)
+        elif args.command == "export":
+            export_results(work_queue, args)
+        elif args.command == "retry-failed":
+            logger.info(f"Requeued {work_queue.retry_failed()} failed videos")
+    finally:
+        work_queue.close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
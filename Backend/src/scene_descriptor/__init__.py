@@ -10,6 +10,10 @@ __author__ = "Bijaya Shrestha"
 
 from .config.settings import settings
 from .utils.logging import setup_logging, get_logger
+from .utils.threads import apply_thread_env
+
+# OpenMP/BLAS read their thread counts when torch loads; nothing has imported it yet
+apply_thread_env()
 
 __all__ = [
     "settings",
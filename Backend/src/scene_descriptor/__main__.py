@@ -7,16 +7,20 @@ Run with: python -m scene_descriptor [options]
 import argparse
 import asyncio
 import logging
+import signal
 import ssl
+import stat
 import sys
 from pathlib import Path
+from typing import Optional
 
 from aiohttp import web
 
 from .config import settings
-from .models import get_model_manager
+from .models import get_model_manager, shutdown_inference_pool
 from .api import setup_routes, setup_cors, get_middlewares
-from .webrtc import close_all_connections
+from .services import shutdown_job_service
+from .webrtc import close_all_connections, shutdown_frame_decode_pool
 from .utils.logging import setup_logging, get_logger
 
 
@@ -44,6 +48,12 @@ def parse_args() -> argparse.Namespace:
         "--key-file",
         help="SSL key file (for HTTPS)"
     )
+    parser.add_argument(
+        "--socket",
+        type=Path,
+        default=settings.caption_socket_path,
+        help="Also serve the API on this Unix socket (for local scripts, e.g. batch_caption --server)"
+    )
     parser.add_argument(
         "--model-dir",
         type=Path,
@@ -82,6 +92,9 @@ async def on_shutdown(app: web.Application) -> None:
     logger = get_logger(__name__)
     logger.info("Shutting down...")
     await close_all_connections()
+    shutdown_frame_decode_pool()
+    shutdown_job_service()
+    shutdown_inference_pool()
     logger.info("Shutdown complete")
 
 
@@ -102,6 +115,43 @@ def create_app() -> web.Application:
     return app
 
 
+async def serve(
+    app: web.Application,
+    host: str,
+    port: int,
+    ssl_context: Optional[ssl.SSLContext] = None,
+    socket_path: Optional[Path] = None
+) -> None:
+    """
+    Serve the app until SIGTERM or Ctrl+C.
+
+    TLS applies to the TCP listener only; the Unix socket is for local
+    clients and stays plain HTTP.
+
+    Args:
+        app: The application
+        host: Host to bind
+        port: TCP port
+        ssl_context: TLS context for the TCP listener (None for plain HTTP)
+        socket_path: Optional Unix socket to serve on as well
+    """
+    runner = web.AppRunner(app, access_log=None)  # We have our own logging middleware
+    await runner.setup()
+    try:
+        await web.TCPSite(runner, host, port, ssl_context=ssl_context).start()
+        if socket_path:
+            await web.UnixSite(runner, str(socket_path)).start()
+
+        stop = asyncio.Event()
+        try:
+            asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stop.set)
+        except NotImplementedError:
+            pass  # No signal handlers on Windows; Ctrl+C still works
+        await stop.wait()
+    finally:
+        await runner.cleanup()
+
+
 def main() -> int:
     """Main entry point."""
     args = parse_args()
@@ -128,7 +178,7 @@ def main() -> int:
     logger.info("Initializing ML models...")
     try:
         model_manager = get_model_manager()
-        model_manager.initialize(args.model_dir)
+        model_manager.initialize(args.model_dir, degradation_fallbacks=True)
         logger.info(f"Models initialized successfully on {model_manager.device}")
     except Exception as e:
         logger.critical(f"Failed to initialize models: {e}", exc_info=True)
@@ -144,20 +194,24 @@ def main() -> int:
         ssl_context.load_cert_chain(args.cert_file, args.key_file)
         logger.info("SSL enabled")
 
+    # Unix socket for local clients; a socket left by a crashed server is replaced
+    socket_path = None
+    if args.socket:
+        socket_path = Path(args.socket)
+        socket_path.parent.mkdir(parents=True, exist_ok=True)
+        if socket_path.exists() and stat.S_ISSOCK(socket_path.stat().st_mode):
+            socket_path.unlink()
+
     # Create and run application
     app = create_app()
 
     logger.info(f"Starting server on {args.host}:{args.port}")
+    if socket_path:
+        logger.info(f"Also listening on unix:{socket_path}")
     logger.info("Press Ctrl+C to stop")
 
     try:
-        web.run_app(
-            app,
-            host=args.host,
-            port=args.port,
-            ssl_context=ssl_context,
-            access_log=None  # We have our own logging middleware
-        )
+        asyncio.run(serve(app, args.host, args.port, ssl_context, socket_path))
     except KeyboardInterrupt:
         logger.info("Received interrupt signal")
     except Exception as e:
@@ -1,15 +1,31 @@
 """API module for Scene Descriptor."""
 
 from .routes import setup_routes, get_route_info
-from .handlers import offer_handler, change_model_handler, health_handler
+from .handlers import (
+    offer_handler,
+    frame_socket_handler,
+    change_model_handler,
+    caption_handler,
+    create_job_handler,
+    job_status_handler,
+    health_handler,
+    liveness_handler,
+    readiness_handler,
+)
 from .middleware import setup_cors, logging_middleware, error_middleware, get_middlewares
 
 __all__ = [
     "setup_routes",
     "get_route_info",
     "offer_handler",
+    "frame_socket_handler",
     "change_model_handler",
+    "caption_handler",
+    "create_job_handler",
+    "job_status_handler",
     "health_handler",
+    "liveness_handler",
+    "readiness_handler",
     "setup_cors",
     "logging_middleware",
     "error_middleware",
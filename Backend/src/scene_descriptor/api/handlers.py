@@ -4,30 +4,66 @@ API request handlers for Scene Descriptor.
 Contains the main endpoint handlers for WebRTC signaling and model management.
 """
 
+import asyncio
 import json
 import os
+import socket
+import tempfile
+from pathlib import Path
+from typing import Optional
 
 from aiohttp import web
 
 from ..config import settings, WEBRTC_CONST
-from ..enums import CapStatus, DataChannelStatus, PeerConnectionStatus, ModelType
-from ..models import get_model_manager
+from ..enums import (
+    CapStatus,
+    MessageFormat,
+    PeerConnectionStatus,
+    ModelStatus,
+    ModelType,
+)
+from ..models import get_model_manager, get_cpu_topology, get_inference_pool
+from ..services import (
+    check_admission,
+    get_capacity_snapshot,
+    get_degradation_controller,
+    get_job_service,
+    get_video_service,
+    is_priority_token,
+    readiness_problems,
+)
 from ..webrtc import (
+    FrameSocketSession,
     VideoCaptionTrack,
+    add_frame_socket,
+    remove_frame_socket,
     create_peer_connection,
     remove_peer_connection,
     create_media_player,
     create_media_recorder,
+    create_data_channel_manager,
+    constrain_video_answer,
+    target_constraints,
 )
 from ..utils.logging import get_logger
+from ..utils.metrics import get_metrics
 from ..utils.state import UseState
-from ..utils.exceptions import WebRTCError, SDPError, ModelNotFoundError
+from ..utils.exceptions import (
+    WebRTCError,
+    SDPError,
+    ModelNotFoundError,
+    RequestError,
+    UploadTooLargeError,
+    ValidationError,
+)
 
 logger = get_logger(__name__)
 
-# Application state
-_data_channel_state, _set_data_channel_state = UseState(DataChannelStatus.CLOSED).init()
-_caption_state, _set_caption_state = UseState(CapStatus.NO_CAP).init()
+# Read size when streaming uploaded videos to disk
+UPLOAD_CHUNK_BYTES = 256 * 1024
+
+# /caption requests in progress (bounded by settings.caption_route_max_concurrent)
+_caption_requests = 0
 
 
 async def offer_handler(request: web.Request) -> web.Response:
@@ -35,7 +71,8 @@ async def offer_handler(request: web.Request) -> web.Response:
     Handle WebRTC offer from client.
 
     Creates a peer connection, sets up media handling,
-    and returns the SDP answer.
+    and returns the SDP answer. Answers 503 with Retry-After when
+    admission control rejects the session.
 
     Args:
         request: The incoming HTTP request with SDP offer
@@ -55,25 +92,38 @@ async def offer_handler(request: web.Request) -> web.Response:
                 status=400
             )
 
+        try:
+            message_format = MessageFormat(
+                str(params.get("message_format", settings.caption_message_format)).lower()
+            )
+        except ValueError:
+            return web.json_response(
+                {"error": f"Unknown message_format: {params.get('message_format')}"},
+                status=400
+            )
+
         from aiortc import RTCSessionDescription
         offer = RTCSessionDescription(sdp=params["sdp"], type=params["type"])
 
+        # Admission control (no awaits between this check and creating the connection)
+        priority = is_priority_token(request.headers.get("X-Priority-Token"))
+        decision = check_admission(priority=priority)
+        if not decision.admitted:
+            return web.json_response(
+                {"error": "Server at capacity", "reason": decision.reason},
+                status=503,
+                headers={"Retry-After": str(decision.retry_after)}
+            )
+
         # Create peer connection
         pc, pc_id = create_peer_connection()
         logger.info(f"Created peer connection: {pc_id}")
 
-        # Create data channel for sending captions
-        channel = pc.createDataChannel(WEBRTC_CONST.DATA_CHANNEL_NAME)
+        # Data channel for captions and client commands
+        channel = create_data_channel_manager(pc, message_format=message_format)
 
-        @channel.on("open")
-        def on_channel_open():
-            logger.info("Data channel opened")
-            _set_data_channel_state(DataChannelStatus.OPEN)
-
-        @channel.on("close")
-        def on_channel_close():
-            logger.info("Data channel closed")
-            _set_data_channel_state(DataChannelStatus.CLOSED)
+        # Per-session caption state
+        caption_state, set_caption_state = UseState(CapStatus.NO_CAP).init()
 
         # Prepare media
         root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
@@ -90,6 +140,8 @@ async def offer_handler(request: web.Request) -> web.Response:
             if pc.connectionState == "failed":
                 await pc.close()
                 remove_peer_connection(pc)
+            elif pc.connectionState == "closed":
+                remove_peer_connection(pc)
 
         @pc.on("track")
         async def on_track(track):
@@ -101,24 +153,27 @@ async def offer_handler(request: web.Request) -> web.Response:
             elif track.kind == "video":
                 logger.info("Video track added, starting caption processing")
                 video_track = VideoCaptionTrack(track)
+                channel.on_command(video_track.handle_command)
 
                 while True:
                     # Check if connection should stop
                     if (pc.connectionState == PeerConnectionStatus.CONNECTED and
-                            _data_channel_state == DataChannelStatus.CLOSED):
+                            channel.is_closed):
                         logger.info("Connection closed, stopping video processing")
                         break
 
                     # Receive and process frames
-                    await video_track.receive(_set_caption_state)
+                    await video_track.receive(set_caption_state)
+
+                    # Ask the camera for less when overloaded or paused
+                    channel.send_video_constraints(video_track.video_constraints())
 
                     # Send caption if new one is available
-                    if _caption_state == CapStatus.NEW_CAP:
-                        _set_caption_state(CapStatus.NO_CAP)
+                    if caption_state == CapStatus.NEW_CAP:
+                        set_caption_state(CapStatus.NO_CAP)
                         caption = video_track.caption
                         if caption:
-                            channel.send(caption)
-                            logger.debug(f"Sent caption: {caption[:50]}...")
+                            channel.send_caption(caption, video_track.degradation)
 
             @track.on("ended")
             async def on_track_ended():
@@ -132,9 +187,14 @@ async def offer_handler(request: web.Request) -> web.Response:
         answer = await pc.createAnswer()
         await pc.setLocalDescription(answer)
 
+        sdp = pc.localDescription.sdp
+        if settings.sdp_video_constraints:
+            # Ask the client to send only what captioning needs
+            sdp = constrain_video_answer(sdp, target_constraints())
+
         logger.info("Successfully created answer")
         return web.json_response({
-            "sdp": pc.localDescription.sdp,
+            "sdp": sdp,
             "type": pc.localDescription.type
         })
 
@@ -146,6 +206,61 @@ async def offer_handler(request: web.Request) -> web.Response:
         return web.json_response({"error": str(e)}, status=500)
 
 
+async def frame_socket_handler(request: web.Request) -> web.StreamResponse:
+    """
+    Handle a WebSocket frame-ingest session.
+
+    A lighter alternative to /offer: the client sends JPEG frames and
+    commands and receives captions on the same socket (see
+    webrtc/frame_socket.py). Query parameter message_format selects text
+    or JSON messages. Answers 503 with Retry-After before upgrading when
+    admission control rejects the session.
+
+    Args:
+        request: The incoming WebSocket upgrade request
+
+    Returns:
+        The WebSocket response, once the client disconnects
+    """
+    try:
+        message_format = MessageFormat(
+            request.query.get("message_format", settings.caption_message_format).lower()
+        )
+    except ValueError:
+        return web.json_response(
+            {"error": f"Unknown message_format: {request.query.get('message_format')}"},
+            status=400
+        )
+
+    if not get_model_manager().is_ready():
+        return web.json_response({"error": "Model not ready"}, status=503)
+
+    # Admission control (no awaits between this check and tracking the socket)
+    priority = is_priority_token(request.headers.get("X-Priority-Token"))
+    decision = check_admission(priority=priority)
+    if not decision.admitted:
+        return web.json_response(
+            {"error": "Server at capacity", "reason": decision.reason},
+            status=503,
+            headers={"Retry-After": str(decision.retry_after)}
+        )
+
+    ws = web.WebSocketResponse(
+        max_msg_size=settings.frame_socket_max_frame_kb * 1024,
+        heartbeat=WEBRTC_CONST.FRAME_SOCKET_HEARTBEAT_SECONDS
+    )
+    add_frame_socket(ws)
+    try:
+        await ws.prepare(request)
+        await FrameSocketSession(ws, message_format).run()
+    except Exception as e:
+        logger.error(f"Error in frame socket session: {e}", exc_info=True)
+    finally:
+        remove_frame_socket(ws)
+
+    return ws
+
+
 async def change_model_handler(request: web.Request) -> web.Response:
     """
     Handle model switching request.
@@ -203,12 +318,303 @@ async def health_handler(request: web.Request) -> web.Response:
     """
     Health check endpoint.
 
+    Responds 503 until models are loaded and warmed up, and whenever they
+    failed to load, so load balancers don't route users to a cold or dead
+    worker.
+
     Returns:
         JSON response with health status
     """
     model_manager = get_model_manager()
+    topology = get_cpu_topology()
+    pool = get_inference_pool()
+    ready = model_manager.is_ready()
+    if ready:
+        status = "healthy"
+    elif model_manager.status in (ModelStatus.NOT_LOADED, ModelStatus.LOADING, ModelStatus.WARMING_UP):
+        status = "starting"
+    else:
+        status = "error"
     return web.json_response({
-        "status": "healthy",
+        "status": status,
+        "model_status": model_manager.status.value,
         "model_ready": model_manager.is_ready(),
-        "current_model": model_manager.current_model_type.value if model_manager.is_ready() else None
-    })
+        "warmup": model_manager.warmup_stats,
+        "current_model": model_manager.current_model_type.value if model_manager.is_ready() else None,
+        "precision": "int8" if model_manager.is_quantized() else model_manager.precision,
+        "cpu_topology": topology.to_dict() if topology else None,
+        "inference_pool": {
+            "workers": pool.num_workers,
+            "busy": pool.busy_workers,
+            "queued": pool.queue_depth,
+            "background_queued": pool.background_queue_depth,
+        },
+        "degradation": (
+            get_degradation_controller().current.to_dict() if model_manager.is_ready() else None
+        ),
+        "metrics": get_metrics().snapshot(),
+    }, status=200 if ready else 503)
+
+
+async def liveness_handler(request: web.Request) -> web.Response:
+    """
+    Liveness probe.
+
+    Answers as long as the event loop is serving requests, regardless of
+    model state or load.
+
+    Returns:
+        JSON response with liveness status
+    """
+    return web.json_response({"status": "alive"})
+
+
+async def readiness_handler(request: web.Request) -> web.Response:
+    """
+    Readiness probe reporting real capacity.
+
+    Responds 503 when models are not warmed up or when session count,
+    inference queue depth, or p95 caption latency exceed their limits, so
+    an upstream load balancer can spread new offers across replicas.
+
+    Returns:
+        JSON response with readiness and capacity details
+    """
+    snapshot = get_capacity_snapshot()
+    problems = readiness_problems(snapshot)
+
+    return web.json_response({
+        "ready": not problems,
+        "reasons": problems,
+        "capacity": snapshot.to_dict(),
+    }, status=200 if not problems else 503)
+
+
+def _is_unix_socket_request(request: web.Request) -> bool:
+    """
+    Whether the request came over the Unix socket.
+
+    Loopback TCP peers don't count: behind a reverse proxy on the same
+    host every remote client looks local.
+    """
+    sock = request.transport.get_extra_info("socket") if request.transport else None
+    return sock is not None and sock.family == socket.AF_UNIX
+
+
+def _max_length_param(value) -> Optional[int]:
+    """Parse an optional max_length request parameter."""
+    if value is None or value == "":
+        return None
+    try:
+        max_length = int(value)
+    except (TypeError, ValueError):
+        raise ValidationError(f"Invalid max_length: {value}")
+    if max_length < 1:
+        raise ValidationError(f"Invalid max_length: {value}")
+    return max_length
+
+
+async def _save_upload(request: web.Request, max_bytes: int) -> Path:
+    """
+    Stream a request body to a temporary file under settings.upload_dir.
+
+    The body is written chunk by chunk, never held in memory whole.
+
+    Args:
+        request: Request whose body is the video file
+        max_bytes: Largest accepted body
+
+    Returns:
+        Path of the temporary file (the caller deletes it)
+
+    Raises:
+        UploadTooLargeError: If the body exceeds max_bytes
+        ValidationError: If the body is empty
+    """
+    if request.content_length is not None and request.content_length > max_bytes:
+        raise UploadTooLargeError(f"Upload of {request.content_length} bytes exceeds {max_bytes}")
+
+    settings.upload_dir.mkdir(parents=True, exist_ok=True)
+    suffix = Path(request.query.get("name", "")).suffix or ".mp4"
+    fd, tmp_name = tempfile.mkstemp(suffix=suffix, dir=settings.upload_dir)
+    size = 0
+    try:
+        with os.fdopen(fd, "wb") as f:
+            async for chunk in request.content.iter_chunked(UPLOAD_CHUNK_BYTES):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLargeError(f"Upload exceeds {max_bytes} bytes")
+                f.write(chunk)
+        if size == 0:
+            raise ValidationError("Empty upload")
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+
+    return Path(tmp_name)
+
+
+def _clip_result_json(result, name: Optional[str] = None) -> dict:
+    """JSON form of a ClipResult (uploads report their client file name, not the temp path)."""
+    return {
+        "video": name or result.video_path.name,
+        "path": None if name else str(result.video_path),
+        "caption": result.caption,
+        "error": result.error,
+        "cached": result.cached,
+    }
+
+
+async def caption_handler(request: web.Request) -> web.Response:
+    """
+    Caption video files with the loaded model.
+
+    A JSON body {"paths": [...], "max_length": n} captions files on the
+    server's disk; paths are only accepted over the Unix socket. Any other
+    body is an uploaded video (original name in the "name" query
+    parameter), streamed to a temporary file. Decoding runs off the event
+    loop and inference queues on the shared pool. At most
+    settings.caption_route_max_concurrent requests run at once; more get
+    503 with Retry-After.
+
+    Args:
+        request: The incoming HTTP request
+
+    Returns:
+        JSON response with the current model and one result per video
+    """
+    global _caption_requests
+    model_manager = get_model_manager()
+    if not model_manager.is_ready():
+        return web.json_response(
+            {"error": "Models not ready"},
+            status=503,
+            headers={"Retry-After": str(settings.admission_retry_after)}
+        )
+    if _caption_requests >= settings.caption_route_max_concurrent:
+        return web.json_response(
+            {"error": "Too many caption requests in progress"},
+            status=503,
+            headers={"Retry-After": str(settings.admission_retry_after)}
+        )
+
+    loop = asyncio.get_running_loop()
+    video_service = get_video_service()
+    upload = None
+    _caption_requests += 1
+    try:
+        max_length = _max_length_param(request.query.get("max_length"))
+
+        if request.content_type == "application/json":
+            params = await request.json()
+            paths = params.get("paths") if isinstance(params, dict) else None
+            if not isinstance(paths, list) or not paths or not all(isinstance(p, str) for p in paths):
+                return web.json_response({"error": "Expected a non-empty list of paths"}, status=400)
+            if not _is_unix_socket_request(request):
+                return web.json_response({"error": "File paths are only accepted on the Unix socket"}, status=403)
+
+            max_length = _max_length_param(params.get("max_length", max_length))
+            results = await loop.run_in_executor(
+                None, video_service.caption_files, [Path(p) for p in paths], max_length
+            )
+            body = [_clip_result_json(result) for result in results]
+        else:
+            upload = await _save_upload(request, settings.caption_upload_max_mb * 1024 * 1024)
+            # Temp files would only clutter the cache's content-hash memo
+            results = await loop.run_in_executor(
+                None, video_service.caption_files, [upload], max_length, False
+            )
+            name = Path(request.query.get("name") or "upload").name
+            body = [_clip_result_json(result, name) for result in results]
+
+        return web.json_response({
+            "model": model_manager.current_model_type.value,
+            "results": body,
+        })
+
+    except json.JSONDecodeError:
+        return web.json_response({"error": "Invalid JSON"}, status=400)
+    except UploadTooLargeError as e:
+        return web.json_response({"error": str(e)}, status=413)
+    except ValidationError as e:
+        return web.json_response({"error": str(e)}, status=400)
+    except Exception as e:
+        logger.error(f"Error captioning files: {e}", exc_info=True)
+        return web.json_response({"error": str(e)}, status=500)
+    finally:
+        _caption_requests -= 1
+        if upload is not None:
+            upload.unlink(missing_ok=True)
+
+
+async def create_job_handler(request: web.Request) -> web.Response:
+    """
+    Queue an uploaded video for captioning.
+
+    The body is the video file (original name in the "name" query
+    parameter), streamed to a temporary file. Answers 202 with the job
+    id as soon as the upload is stored; poll GET /jobs/{job_id}.
+
+    Args:
+        request: The incoming HTTP request
+
+    Returns:
+        JSON response with the job id and status URL
+    """
+    job_service = get_job_service()
+    if not get_model_manager().is_ready() or not job_service.has_capacity():
+        return web.json_response(
+            {"error": "Not accepting jobs, try again later"},
+            status=503,
+            headers={"Retry-After": str(settings.admission_retry_after)}
+        )
+
+    upload = None
+    try:
+        max_length = _max_length_param(request.query.get("max_length"))
+        upload = await _save_upload(request, settings.caption_upload_max_mb * 1024 * 1024)
+        name = Path(request.query.get("name") or "upload").name
+        job = job_service.submit(upload, name, max_length)
+        upload = None
+
+        url = f"/jobs/{job.id}"
+        return web.json_response(
+            {"job_id": job.id, "status": job.status.value, "url": url},
+            status=202,
+            headers={"Location": url}
+        )
+
+    except UploadTooLargeError as e:
+        return web.json_response({"error": str(e)}, status=413)
+    except ValidationError as e:
+        return web.json_response({"error": str(e)}, status=400)
+    except RequestError as e:
+        return web.json_response(
+            {"error": str(e)},
+            status=503,
+            headers={"Retry-After": str(settings.admission_retry_after)}
+        )
+    except Exception as e:
+        logger.error(f"Error creating caption job: {e}", exc_info=True)
+        return web.json_response({"error": str(e)}, status=500)
+    finally:
+        if upload is not None:
+            upload.unlink(missing_ok=True)
+
+
+async def job_status_handler(request: web.Request) -> web.Response:
+    """
+    Report a caption job's status and, when done, its caption.
+
+    Args:
+        request: The incoming HTTP request
+
+    Returns:
+        JSON response with the job state (404 for unknown or expired jobs)
+    """
+    job_service = get_job_service()
+    job = job_service.get(request.match_info["job_id"])
+    if job is None:
+        return web.json_response({"error": "Unknown job"}, status=404)
+
+    return web.json_response(job.to_dict(position=job_service.position(job)))
@@ -6,7 +6,17 @@ Sets up all HTTP routes for the application.
 
 from aiohttp import web
 
-from .handlers import offer_handler, change_model_handler, health_handler
+from .handlers import (
+    offer_handler,
+    frame_socket_handler,
+    change_model_handler,
+    caption_handler,
+    create_job_handler,
+    job_status_handler,
+    health_handler,
+    liveness_handler,
+    readiness_handler,
+)
 from ..utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -22,11 +32,23 @@ def setup_routes(app: web.Application) -> None:
     # WebRTC signaling
     app.router.add_post("/offer", offer_handler)
 
+    # WebSocket frame ingest (JPEG frames in, captions out)
+    app.router.add_get("/frames", frame_socket_handler)
+
     # Model management
     app.router.add_post("/change_model", change_model_handler)
 
-    # Health check
+    # Captioning of recorded files with the warm model
+    app.router.add_post("/caption", caption_handler)
+
+    # Asynchronous captioning of uploaded videos
+    app.router.add_post("/jobs", create_job_handler)
+    app.router.add_get("/jobs/{job_id}", job_status_handler)
+
+    # Health checks
     app.router.add_get("/health", health_handler)
+    app.router.add_get("/health/live", liveness_handler)
+    app.router.add_get("/health/ready", readiness_handler)
 
     logger.info("API routes configured")
 
@@ -44,14 +66,44 @@ def get_route_info() -> list:
             "path": "/offer",
             "description": "WebRTC signaling - accepts SDP offer, returns answer"
         },
+        {
+            "method": "GET",
+            "path": "/frames",
+            "description": "WebSocket - send JPEG frames, receive captions"
+        },
         {
             "method": "POST",
             "path": "/change_model",
             "description": "Switch between ML models (git, pulchowk)"
         },
+        {
+            "method": "POST",
+            "path": "/caption",
+            "description": "Caption video files (local paths as JSON, or an uploaded clip)"
+        },
+        {
+            "method": "POST",
+            "path": "/jobs",
+            "description": "Upload a video for captioning, returns a job id"
+        },
+        {
+            "method": "GET",
+            "path": "/jobs/{job_id}",
+            "description": "Caption job status and result"
+        },
         {
             "method": "GET",
             "path": "/health",
             "description": "Health check endpoint"
+        },
+        {
+            "method": "GET",
+            "path": "/health/live",
+            "description": "Liveness probe - process is serving requests"
+        },
+        {
+            "method": "GET",
+            "path": "/health/ready",
+            "description": "Readiness probe - 503 when warming up or over capacity"
         }
     ]
@@ -47,6 +47,7 @@ class WebRTCConstants:
 
     DATA_CHANNEL_NAME: str = "chat"
     AUDIO_FILE: str = "demo-instruct.wav"
+    FRAME_SOCKET_HEARTBEAT_SECONDS: float = 30.0  # Ping interval on /frames
 
 
 # Singleton instances
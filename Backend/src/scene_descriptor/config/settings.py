@@ -36,15 +36,144 @@ class Settings(BaseSettings):
     default_model: str = Field(default="git", validation_alias="DEFAULT_MODEL")
     cuda_device: str = Field(default="cuda:0", validation_alias="CUDA_DEVICE")
 
+    # Inference Backend: torch, compiled (torch.compile) or onnx (see scripts/export_onnx.py)
+    inference_backend: str = Field(default="torch", validation_alias="INFERENCE_BACKEND")
+    compile_mode: str = Field(default="default", validation_alias="COMPILE_MODE")
+    compile_batch_buckets: str = Field(default="1", validation_alias="COMPILE_BATCH_BUCKETS")
+    compile_cache_dir: Path = Field(default=Path("ml-models/compile-cache"), validation_alias="COMPILE_CACHE_DIR")
+    onnx_model_dir: Path = Field(default=Path("ml-models/onnx"), validation_alias="ONNX_MODEL_DIR")
+    ort_graph_optimization_level: str = Field(default="all", validation_alias="ORT_GRAPH_OPTIMIZATION_LEVEL")
+
+    # Synthetic captions per model before reporting ready (0 disables warmup)
+    warmup_iterations: int = Field(default=2, validation_alias="WARMUP_ITERATIONS")
+
+    # Precision Configuration: fp32, bf16, or auto (bf16 when hardware supports it)
+    model_precision: str = Field(default="fp32", validation_alias="MODEL_PRECISION")
+    precision_report: bool = Field(default=False, validation_alias="PRECISION_REPORT")
+
+    # Quantization Configuration
+    # Comma-separated model types to run with dynamic int8 quantization (CPU only)
+    quantized_models: str = Field(default="", validation_alias="QUANTIZED_MODELS")
+    quantization_cache_dir: Optional[Path] = Field(
+        default=Path("ml-models/quantized"), validation_alias="QUANTIZATION_CACHE_DIR"
+    )
+
     # Processing Configuration
     frame_capture_seconds: int = Field(default=5, validation_alias="FRAME_CAPTURE_SECONDS")
+    # Size each session's window from measured inference time + queue wait
+    adaptive_capture_window: bool = Field(default=True, validation_alias="ADAPTIVE_CAPTURE_WINDOW")
+    min_capture_seconds: float = Field(default=2.0, validation_alias="MIN_CAPTURE_SECONDS")
+    max_capture_seconds: float = Field(default=10.0, validation_alias="MAX_CAPTURE_SECONDS")
+    capture_window_headroom: float = Field(default=1.2, validation_alias="CAPTURE_WINDOW_HEADROOM")
+    # Drop buffered frames lagging the camera by more than max_frame_lag seconds
+    latest_frame_mode: bool = Field(default=True, validation_alias="LATEST_FRAME_MODE")
+    max_frame_lag: float = Field(default=0.5, validation_alias="MAX_FRAME_LAG")
+    # A pts gap longer than this (seconds) ends the current window early
+    max_frame_gap: float = Field(default=1.0, validation_alias="MAX_FRAME_GAP")
     max_caption_length: int = Field(default=20, validation_alias="MAX_CAPTION_LENGTH")
     num_sample_frames: int = Field(default=6, validation_alias="NUM_SAMPLE_FRAMES")
+    # Live keyframe selection: candidates kept per window (the newest few always), scoring resolution
+    keyframe_candidates: int = Field(default=24, validation_alias="KEYFRAME_CANDIDATES")
+    keyframe_recent_frames: int = Field(default=4, validation_alias="KEYFRAME_RECENT_FRAMES")
+    keyframe_analysis_width: int = Field(default=160, validation_alias="KEYFRAME_ANALYSIS_WIDTH")
+
+    # CPU Threading Configuration (0 = derive from available cores)
+    inference_workers: int = Field(default=1, validation_alias="INFERENCE_WORKERS")
+    torch_num_threads: int = Field(default=0, validation_alias="TORCH_NUM_THREADS")
+    torch_interop_threads: int = Field(default=0, validation_alias="TORCH_INTEROP_THREADS")
+    pin_inference_workers: bool = Field(default=False, validation_alias="PIN_INFERENCE_WORKERS")
+
+    # Capacity / Readiness (readiness goes 503 above these limits)
+    max_sessions: int = Field(default=16, validation_alias="MAX_SESSIONS")
+    ready_max_queue_depth: int = Field(default=4, validation_alias="READY_MAX_QUEUE_DEPTH")
+    ready_max_p95_latency: float = Field(default=10.0, validation_alias="READY_MAX_P95_LATENCY")
+
+    # Admission Control for /offer (503 + Retry-After when exceeded)
+    admission_max_queue_depth: int = Field(default=8, validation_alias="ADMISSION_MAX_QUEUE_DEPTH")
+    admission_max_p95_latency: float = Field(default=15.0, validation_alias="ADMISSION_MAX_P95_LATENCY")
+    admission_retry_after: int = Field(default=10, validation_alias="ADMISSION_RETRY_AFTER")
+    reserved_priority_sessions: int = Field(default=2, validation_alias="RESERVED_PRIORITY_SESSIONS")
+    # Comma-separated tokens accepted in the X-Priority-Token header
+    priority_tokens: str = Field(default="", validation_alias="PRIORITY_TOKENS")
+
+    # Degradation Ladder (cheaper captions while inference is overloaded)
+    degradation_enabled: bool = Field(default=True, validation_alias="DEGRADATION_ENABLED")
+    # Seconds from window end to caption (queue wait + inference) considered on time
+    degradation_target_latency: float = Field(default=6.0, validation_alias="DEGRADATION_TARGET_LATENCY")
+    degradation_max_queue_depth: int = Field(default=1, validation_alias="DEGRADATION_MAX_QUEUE_DEPTH")
+    degradation_cooldown_seconds: float = Field(default=15.0, validation_alias="DEGRADATION_COOLDOWN_SECONDS")
+    degradation_recover_seconds: float = Field(default=30.0, validation_alias="DEGRADATION_RECOVER_SECONDS")
+    degradation_min_image_size: int = Field(default=160, validation_alias="DEGRADATION_MIN_IMAGE_SIZE")
+    degradation_quantized_fallback: bool = Field(default=False, validation_alias="DEGRADATION_QUANTIZED_FALLBACK")
+
+    # Data channel caption messages: text (plain caption) or json (caption + status)
+    caption_message_format: str = Field(default="text", validation_alias="CAPTION_MESSAGE_FORMAT")
+
+    # Client send limits (SDP answer + video_constraints messages)
+    sdp_video_constraints: bool = Field(default=True, validation_alias="SDP_VIDEO_CONSTRAINTS")
+    target_video_width: int = Field(default=320, validation_alias="TARGET_VIDEO_WIDTH")
+    target_video_height: int = Field(default=240, validation_alias="TARGET_VIDEO_HEIGHT")
+    target_video_fps: int = Field(default=10, validation_alias="TARGET_VIDEO_FPS")
+    target_video_bitrate_kbps: int = Field(default=300, validation_alias="TARGET_VIDEO_BITRATE_KBPS")
+
+    # Client-driven captioning: continuous (periodic) or on_demand (describe command only)
+    caption_mode: str = Field(default="continuous", validation_alias="CAPTION_MODE")
+    describe_default_seconds: float = Field(default=3.0, validation_alias="DESCRIBE_DEFAULT_SECONDS")
+    describe_max_seconds: float = Field(default=10.0, validation_alias="DESCRIBE_MAX_SECONDS")
+
+    # WebSocket frame ingest (/frames): JPEG frames decoded on a shared pool
+    frame_socket_decode_workers: int = Field(default=2, validation_alias="FRAME_SOCKET_DECODE_WORKERS")
+    frame_socket_max_frame_kb: int = Field(default=512, validation_alias="FRAME_SOCKET_MAX_FRAME_KB")
 
     # Paths
     log_dir: Path = Field(default=Path("logs"), validation_alias="LOG_DIR")
     data_dir: Path = Field(default=Path("data"), validation_alias="DATA_DIR")
 
+    # Offline captioning: reuse captions of unchanged files (SQLite under DATA_DIR)
+    caption_cache_enabled: bool = Field(default=True, validation_alias="CAPTION_CACHE_ENABLED")
+
+    # Warm caption route (/caption) for scripts, optionally also on a Unix socket
+    caption_socket_path: Optional[Path] = Field(default=None, validation_alias="CAPTION_SOCKET_PATH")
+    caption_upload_max_mb: int = Field(default=200, validation_alias="CAPTION_UPLOAD_MAX_MB")
+    caption_route_batch_size: int = Field(default=4, validation_alias="CAPTION_ROUTE_BATCH_SIZE")
+    caption_route_decode_workers: int = Field(default=1, validation_alias="CAPTION_ROUTE_DECODE_WORKERS")
+    caption_route_max_concurrent: int = Field(default=2, validation_alias="CAPTION_ROUTE_MAX_CONCURRENT")
+
+    # Asynchronous caption jobs (POST /jobs), run behind live sessions
+    job_workers: int = Field(default=1, validation_alias="JOB_WORKERS")
+    job_max_pending: int = Field(default=32, validation_alias="JOB_MAX_PENDING")
+    job_retention_seconds: float = Field(default=3600.0, validation_alias="JOB_RETENTION_SECONDS")
+
+    @property
+    def quantized_model_types(self) -> set[str]:
+        """Model type names selected for int8 quantization."""
+        return {
+            name.strip().lower()
+            for name in self.quantized_models.split(",")
+            if name.strip()
+        }
+
+    @property
+    def priority_token_list(self) -> list[str]:
+        """Tokens that grant priority admission."""
+        return [token.strip() for token in self.priority_tokens.split(",") if token.strip()]
+
+    @property
+    def regular_session_limit(self) -> int:
+        """Sessions open to clients without a priority token (slots are reserved only when tokens exist)."""
+        reserved = self.reserved_priority_sessions if self.priority_token_list else 0
+        return max(0, self.max_sessions - reserved)
+
+    @property
+    def caption_cache_path(self) -> Path:
+        """SQLite database of the offline caption cache."""
+        return self.data_dir / "caption_cache.sqlite3"
+
+    @property
+    def upload_dir(self) -> Path:
+        """Temporary files for uploaded videos."""
+        return self.data_dir / "uploads"
+
     @property
     def git_model_path(self) -> Path:
         """Path to the GIT model directory."""
@@ -6,6 +6,10 @@ from .status import (
     PeerConnectionStatus,
     ModelStatus,
     ModelType,
+    MessageFormat,
+    ClientCommand,
+    OutputFormat,
+    JobStatus,
 )
 
 __all__ = [
@@ -14,4 +18,8 @@ __all__ = [
     "PeerConnectionStatus",
     "ModelStatus",
     "ModelType",
+    "MessageFormat",
+    "ClientCommand",
+    "OutputFormat",
+    "JobStatus",
 ]
@@ -41,13 +41,47 @@ class ModelStatus(str, enum.Enum):
 
     NOT_LOADED = "NOT_LOADED"
     LOADING = "LOADING"
+    WARMING_UP = "WARMING_UP"  # Loaded, running synthetic warmup captions
     READY = "READY"
     PROCESSING = "PROCESSING"
     ERROR = "ERROR"
 
 
+class MessageFormat(str, enum.Enum):
+    """Format of caption messages sent over the data channel."""
+
+    TEXT = "text"            # Plain caption text (spoken as-is by the app)
+    JSON = "json"            # JSON object with caption and server status
+
+
+class ClientCommand(str, enum.Enum):
+    """Commands clients can send over the data channel."""
+
+    DESCRIBE = "describe"    # Caption the last few seconds now
+    PAUSE = "pause"          # Stop captioning
+    RESUME = "resume"        # Resume captioning
+    CADENCE = "cadence"      # Set how often captions are generated
+
+
 class ModelType(str, enum.Enum):
     """Available ML model types."""
 
     GIT = "git"              # Microsoft GIT-base-vatex model
     PULCHOWK = "pulchowk"    # Custom fine-tuned model
+
+
+class OutputFormat(str, enum.Enum):
+    """File format of batch captioning results."""
+
+    CSV = "csv"
+    JSONL = "jsonl"
+    PARQUET = "parquet"      # Directory of part files (needs pyarrow)
+
+
+class JobStatus(str, enum.Enum):
+    """State of an asynchronous caption job (POST /jobs)."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
@@ -1,12 +1,32 @@
 """Models module for Scene Descriptor."""
 
 from .model_manager import ModelManager, get_model_manager
+from .cpu_topology import CpuTopology, configure_cpu_topology, get_cpu_topology
+from .quantization import quantize_int8, load_or_quantize_int8, model_fingerprint
+from .precision import bf16_supported, resolve_precision
+from .inference_pool import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_LIVE,
+    InferencePool,
+    get_inference_pool,
+    shutdown_inference_pool,
+)
+from .keyframes import KeyframeSelector
+from .segments import (
+    VideoSegment,
+    fixed_segments,
+    read_segment_frames,
+    scene_segments,
+    video_duration,
+)
 from .processor import (
     sample_frame_indices,
     sample_frames,
     convert_frames_to_av,
     read_video_frames,
     read_video_opencv,
+    read_sampled_frames,
+    read_sampled_frames_opencv,
     resize_frame,
     normalize_frames,
 )
@@ -14,11 +34,32 @@ from .processor import (
 __all__ = [
     "ModelManager",
     "get_model_manager",
+    "CpuTopology",
+    "configure_cpu_topology",
+    "get_cpu_topology",
+    "quantize_int8",
+    "load_or_quantize_int8",
+    "model_fingerprint",
+    "bf16_supported",
+    "resolve_precision",
+    "PRIORITY_BACKGROUND",
+    "PRIORITY_LIVE",
+    "InferencePool",
+    "get_inference_pool",
+    "shutdown_inference_pool",
+    "KeyframeSelector",
+    "VideoSegment",
+    "fixed_segments",
+    "read_segment_frames",
+    "scene_segments",
+    "video_duration",
     "sample_frame_indices",
     "sample_frames",
     "convert_frames_to_av",
     "read_video_frames",
     "read_video_opencv",
+    "read_sampled_frames",
+    "read_sampled_frames_opencv",
     "resize_frame",
     "normalize_frames",
 ]
@@ -0,0 +1,190 @@
+"""
+torch.compile execution path with a persistent compile-artifact cache.
+
+Compiles GIT's vision encoder and text decoder, and keeps inductor's
+compiled artifacts on disk keyed by model fingerprint, torch version and
+input shapes, so a restart reuses them instead of recompiling.
+"""
+
+import hashlib
+import os
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+import torch
+from torch import nn
+
+from ..utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+ARTIFACTS_FILE = "artifacts.bin"
+
+
+def parse_buckets(buckets: str) -> List[int]:
+    """
+    Parse a comma-separated list of batch-size buckets.
+
+    Args:
+        buckets: e.g. "1,2,4"
+
+    Returns:
+        Sorted unique bucket sizes (at least [1])
+    """
+    sizes = sorted({int(b) for b in buckets.split(",") if b.strip() and int(b) > 0})
+    return sizes or [1]
+
+
+def bucket_for(batch_size: int, buckets: List[int]) -> int:
+    """
+    Get the smallest bucket that fits a batch.
+
+    Args:
+        batch_size: Actual batch size
+        buckets: Sorted bucket sizes
+
+    Returns:
+        Bucket size to pad to (the batch size itself if larger than all buckets)
+    """
+    for bucket in buckets:
+        if batch_size <= bucket:
+            return bucket
+    return batch_size
+
+
+def compile_cache_key(
+    fingerprint: str,
+    shapes: Iterable[tuple],
+    dtype: torch.dtype,
+    mode: str
+) -> str:
+    """
+    Key compiled artifacts by model, torch version, shapes and settings.
+
+    Args:
+        fingerprint: Model weights fingerprint
+        shapes: Input shapes that will be compiled
+        dtype: Model dtype
+        mode: torch.compile mode
+
+    Returns:
+        Hex digest
+    """
+    digest = hashlib.sha256()
+    digest.update(fingerprint.encode())
+    digest.update(torch.__version__.encode())
+    digest.update(repr(sorted(shapes)).encode())
+    digest.update(f"{dtype}:{mode}".encode())
+    return digest.hexdigest()[:16]
+
+
+def enable_compile_cache(cache_dir: Path, key: str) -> Path:
+    """
+    Point inductor's on-disk caches at a keyed directory and load saved artifacts.
+
+    Must run before the first compilation.
+
+    Args:
+        cache_dir: Root directory for compile caches
+        key: Cache key from compile_cache_key
+
+    Returns:
+        The keyed cache directory
+    """
+    keyed_dir = Path(cache_dir) / key
+    keyed_dir.mkdir(parents=True, exist_ok=True)
+
+    os.environ["TORCHINDUCTOR_CACHE_DIR"] = str(keyed_dir / "inductor")
+    os.environ["TORCHINDUCTOR_FX_GRAPH_CACHE"] = "1"
+    os.environ["TORCHINDUCTOR_AUTOGRAD_CACHE"] = "1"
+
+    artifacts = keyed_dir / ARTIFACTS_FILE
+    load_artifacts = getattr(torch.compiler, "load_cache_artifacts", None)
+    if artifacts.exists() and load_artifacts is not None:
+        try:
+            load_artifacts(artifacts.read_bytes())
+            logger.info(f"Loaded compile artifacts from {artifacts}")
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable compile artifacts {artifacts}: {e}")
+
+    return keyed_dir
+
+
+def save_compile_artifacts(keyed_dir: Path) -> Optional[Path]:
+    """
+    Persist compiled artifacts after warmup (torch >= 2.7).
+
+    Older torch versions rely on the inductor cache directory alone.
+
+    Args:
+        keyed_dir: Directory returned by enable_compile_cache
+
+    Returns:
+        Path of the saved artifacts, or None if unsupported
+    """
+    save_artifacts = getattr(torch.compiler, "save_cache_artifacts", None)
+    if save_artifacts is None:
+        return None
+
+    try:
+        result = save_artifacts()
+        if result is None:
+            return None
+        artifact_bytes, _ = result
+        path = Path(keyed_dir) / ARTIFACTS_FILE
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_bytes(artifact_bytes)
+        tmp_path.replace(path)
+        logger.info(f"Saved compile artifacts to {path}")
+        return path
+    except Exception as e:
+        logger.warning(f"Failed to save compile artifacts: {e}")
+        return None
+
+
+def compile_available() -> bool:
+    """Whether torch.compile can run on this platform and torch build."""
+    if not hasattr(torch, "compile"):
+        return False
+    try:
+        import torch._dynamo as dynamo
+    except ImportError:
+        return False
+    is_supported = getattr(dynamo, "is_dynamo_supported", None)
+    return is_supported is None or bool(is_supported())
+
+
+def compile_git_model(model: nn.Module, mode: str = "default") -> nn.Module:
+    """
+    Compile the vision encoder and text decoder of a GIT model in place.
+
+    The vision encoder sees fixed shapes per batch bucket and compiles
+    statically; the decoder's sequence grows each step, so it is left to
+    torch's automatic dynamic-shape handling.
+
+    Args:
+        model: GitForCausalLM
+        mode: torch.compile mode
+
+    Returns:
+        The same model with compiled submodules
+    """
+    model.git.image_encoder = torch.compile(model.git.image_encoder, mode=mode, dynamic=False)
+    model.git.encoder = torch.compile(model.git.encoder, mode=mode)
+    return model
+
+
+def uncompile_git_model(model: nn.Module) -> nn.Module:
+    """
+    Undo compile_git_model, restoring the eager submodules in place.
+
+    Args:
+        model: GitForCausalLM, compiled or not
+
+    Returns:
+        The same model with eager submodules
+    """
+    for name in ("image_encoder", "encoder"):
+        module = getattr(model.git, name)
+        setattr(model.git, name, getattr(module, "_orig_mod", module))
+    return model
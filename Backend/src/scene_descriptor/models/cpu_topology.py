@@ -0,0 +1,154 @@
+"""
+CPU thread topology for model inference.
+
+Sizes torch's intra-op and inter-op thread pools so that concurrent
+inference workers share the host's cores instead of each one spawning a
+thread per core. The matching OpenMP/MKL environment has to be set before
+torch loads, so utils/threads.py does that at package import.
+"""
+
+import os
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional
+
+import torch
+
+from ..config import settings
+from ..utils.logging import get_logger
+from ..utils.threads import get_available_cores, get_thread_env
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class CpuTopology:
+    """Resolved CPU thread layout for this process."""
+
+    available_cores: List[int]
+    inference_workers: int
+    intra_op_threads: int
+    inter_op_threads: int
+    pinned: bool
+    worker_core_sets: List[List[int]] = field(default_factory=list)
+    env: Dict[str, str] = field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        """Convert to a JSON-serializable dictionary."""
+        return asdict(self)
+
+
+_topology: Optional[CpuTopology] = None
+
+
+def partition_cores(cores: List[int], num_workers: int) -> List[List[int]]:
+    """
+    Split cores into contiguous, non-overlapping slices, one per worker.
+
+    When there are fewer cores than workers, workers share cores round-robin.
+
+    Args:
+        cores: Core ids to distribute
+        num_workers: Number of inference workers
+
+    Returns:
+        List of core id lists, one per worker
+    """
+    num_workers = max(1, num_workers)
+
+    if len(cores) < num_workers:
+        return [[cores[i % len(cores)]] for i in range(num_workers)]
+
+    per_worker, remainder = divmod(len(cores), num_workers)
+    core_sets = []
+    start = 0
+    for i in range(num_workers):
+        size = per_worker + (1 if i < remainder else 0)
+        core_sets.append(cores[start:start + size])
+        start += size
+    return core_sets
+
+
+def configure_cpu_topology(
+    num_workers: Optional[int] = None,
+    intra_op_threads: Optional[int] = None,
+    inter_op_threads: Optional[int] = None,
+    pin_workers: Optional[bool] = None
+) -> CpuTopology:
+    """
+    Apply thread settings to torch.
+
+    Should run once at startup, before the first inference. Values of 0
+    (or None) fall back to settings, then to available cores / workers.
+
+    Args:
+        num_workers: Number of concurrent inference workers
+        intra_op_threads: Threads used inside a single op
+        inter_op_threads: Threads used to run independent ops concurrently
+        pin_workers: Whether inference workers pin themselves to a core set
+
+    Returns:
+        The resolved CpuTopology
+    """
+    global _topology
+
+    cores = get_available_cores()
+    num_workers = max(1, num_workers or settings.inference_workers)
+    pin_workers = settings.pin_inference_workers if pin_workers is None else pin_workers
+
+    per_worker = max(1, len(cores) // num_workers)
+    intra_op_threads = intra_op_threads or settings.torch_num_threads or per_worker
+    inter_op_threads = inter_op_threads or settings.torch_interop_threads or 1
+
+    torch.set_num_threads(intra_op_threads)
+    try:
+        torch.set_num_interop_threads(inter_op_threads)
+    except RuntimeError as e:
+        # Can only be set once, before any inter-op parallel work has started
+        logger.warning(f"Could not set inter-op threads: {e}")
+        inter_op_threads = torch.get_num_interop_threads()
+
+    worker_core_sets = partition_cores(cores, num_workers) if pin_workers else []
+
+    _topology = CpuTopology(
+        available_cores=cores,
+        inference_workers=num_workers,
+        intra_op_threads=torch.get_num_threads(),
+        inter_op_threads=inter_op_threads,
+        pinned=pin_workers,
+        worker_core_sets=worker_core_sets,
+        env=get_thread_env(),
+    )
+
+    logger.info(
+        f"CPU topology: {len(cores)} cores, {num_workers} inference worker(s), "
+        f"intra-op={_topology.intra_op_threads}, inter-op={inter_op_threads}, "
+        f"pinned={pin_workers}"
+    )
+    for i, core_set in enumerate(worker_core_sets):
+        logger.info(f"Inference worker {i} -> cores {core_set}")
+
+    return _topology
+
+
+def pin_current_thread(cores: List[int]) -> bool:
+    """
+    Restrict the calling thread (and threads it spawns) to a set of cores.
+
+    Args:
+        cores: Core ids to pin to
+
+    Returns:
+        True if pinning was applied, False if unsupported
+    """
+    try:
+        # pid 0 targets the calling thread on Linux
+        os.sched_setaffinity(0, cores)
+        return True
+    except (AttributeError, OSError) as e:
+        logger.warning(f"Could not pin thread to cores {cores}: {e}")
+        return False
+
+
+def get_cpu_topology() -> Optional[CpuTopology]:
+    """Get the topology applied by configure_cpu_topology, if any."""
+    return _topology
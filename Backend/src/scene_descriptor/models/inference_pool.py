@@ -0,0 +1,228 @@
+"""
+Inference worker pool.
+
+Runs caption generation on a fixed number of worker threads so that
+concurrent sessions queue for inference instead of each starting its
+own thread and competing for every core. Background work (uploaded
+files, caption jobs) shares the workers at a lower priority.
+"""
+
+import itertools
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional
+
+import torch
+
+from .cpu_topology import configure_cpu_topology, get_cpu_topology, pin_current_thread
+from ..utils.logging import get_logger
+from ..utils.metrics import get_metrics
+
+logger = get_logger(__name__)
+
+# Job priorities (lower runs first): background jobs wait behind all live captions
+PRIORITY_LIVE = 0
+PRIORITY_BACKGROUND = 10
+
+# Shutdown sentinels sort after every job
+_SHUTDOWN_PRIORITY = sys.maxsize
+
+
+class InferencePool:
+    """
+    Fixed-size pool of inference worker threads.
+
+    Each worker optionally pins itself to its own core set on start-up,
+    so torch's per-thread OpenMP team stays on those cores.
+
+    Jobs run in priority order, FIFO within a priority. A running job is
+    never preempted. queue_depth and the inference_queue_wait metric
+    cover live jobs only, as does caption_latency when callers pass
+    their priority to ModelManager.generate_captions, so background work
+    does not trip readiness, admission or degradation.
+    """
+
+    def __init__(
+        self,
+        num_workers: int,
+        core_sets: Optional[List[List[int]]] = None,
+        intra_op_threads: Optional[int] = None
+    ):
+        """
+        Initialize the pool.
+
+        Args:
+            num_workers: Number of worker threads
+            core_sets: Optional core set per worker to pin to
+            intra_op_threads: Torch intra-op threads for each worker
+        """
+        self._num_workers = max(1, num_workers)
+        self._core_sets = core_sets or []
+        self._intra_op_threads = intra_op_threads
+        self._queue: "queue.PriorityQueue" = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._pending: Dict[int, int] = {}
+        self._workers: List[threading.Thread] = []
+        self._busy = 0
+        self._lock = threading.Lock()
+        self._started = False
+
+    @property
+    def num_workers(self) -> int:
+        """Number of worker threads."""
+        return self._num_workers
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of submitted live jobs not yet picked up by a worker."""
+        return self._pending.get(PRIORITY_LIVE, 0)
+
+    @property
+    def background_queue_depth(self) -> int:
+        """Number of submitted background jobs not yet picked up by a worker."""
+        with self._lock:
+            return sum(count for priority, count in self._pending.items() if priority != PRIORITY_LIVE)
+
+    @property
+    def busy_workers(self) -> int:
+        """Number of workers currently running a job."""
+        return self._busy
+
+    def start(self) -> None:
+        """Start the worker threads."""
+        if self._started:
+            return
+
+        for i in range(self._num_workers):
+            worker = threading.Thread(
+                target=self._worker_loop,
+                args=(i,),
+                name=f"inference-worker-{i}",
+                daemon=True
+            )
+            worker.start()
+            self._workers.append(worker)
+
+        self._started = True
+        logger.info(f"Inference pool started with {self._num_workers} worker(s)")
+
+    def submit(self, fn: Callable, *args: Any, **kwargs: Any) -> Future:
+        """
+        Queue a live job for the next free worker.
+
+        Args:
+            fn: Callable to run
+            *args: Positional arguments for fn
+            **kwargs: Keyword arguments for fn
+
+        Returns:
+            Future resolved with fn's result
+        """
+        return self.submit_with_priority(PRIORITY_LIVE, fn, *args, **kwargs)
+
+    def submit_with_priority(self, priority: int, fn: Callable, *args: Any, **kwargs: Any) -> Future:
+        """
+        Queue a job at a priority (PRIORITY_LIVE or PRIORITY_BACKGROUND).
+
+        Args:
+            priority: Lower values run first
+            fn: Callable to run
+            *args: Positional arguments for fn
+            **kwargs: Keyword arguments for fn
+
+        Returns:
+            Future resolved with fn's result
+        """
+        if not self._started:
+            self.start()
+
+        future: Future = Future()
+        with self._lock:
+            self._pending[priority] = self._pending.get(priority, 0) + 1
+        self._queue.put((priority, next(self._sequence), (fn, args, kwargs, future, time.monotonic())))
+        get_metrics().set_gauge("inference_queue_depth", self.queue_depth)
+        return future
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stop all workers after the queued jobs finish.
+
+        Args:
+            wait: Block until workers have exited
+        """
+        if not self._started:
+            return
+
+        for _ in self._workers:
+            self._queue.put((_SHUTDOWN_PRIORITY, next(self._sequence), None))
+
+        if wait:
+            for worker in self._workers:
+                worker.join()
+
+        self._workers = []
+        self._started = False
+        logger.info("Inference pool stopped")
+
+    def _worker_loop(self, index: int) -> None:
+        """Pin the worker, then run jobs until a shutdown sentinel arrives."""
+        if index < len(self._core_sets):
+            if pin_current_thread(self._core_sets[index]):
+                logger.debug(f"Worker {index} pinned to cores {self._core_sets[index]}")
+
+        if self._intra_op_threads:
+            torch.set_num_threads(self._intra_op_threads)
+
+        while True:
+            priority, _, item = self._queue.get()
+            if item is None:
+                break
+
+            fn, args, kwargs, future, submitted_at = item
+            with self._lock:
+                self._pending[priority] -= 1
+            if not future.set_running_or_notify_cancel():
+                continue
+
+            metrics = get_metrics()
+            wait_metric = "inference_queue_wait" if priority == PRIORITY_LIVE else "background_queue_wait"
+            metrics.observe(wait_metric, time.monotonic() - submitted_at)
+            metrics.set_gauge("inference_queue_depth", self.queue_depth)
+
+            with self._lock:
+                self._busy += 1
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+            finally:
+                with self._lock:
+                    self._busy -= 1
+
+
+# Singleton instance
+_inference_pool: Optional[InferencePool] = None
+
+
+def get_inference_pool() -> InferencePool:
+    """Get the inference pool singleton, sized from the CPU topology."""
+    global _inference_pool
+    if _inference_pool is None:
+        topology = get_cpu_topology() or configure_cpu_topology()
+        _inference_pool = InferencePool(
+            num_workers=topology.inference_workers,
+            core_sets=topology.worker_core_sets,
+            intra_op_threads=topology.intra_op_threads,
+        )
+    return _inference_pool
+
+
+def shutdown_inference_pool() -> None:
+    """Stop the inference pool singleton if it was started."""
+    global _inference_pool
+    if _inference_pool is not None:
+        _inference_pool.shutdown()
+        _inference_pool = None
@@ -0,0 +1,256 @@
+"""
+Quality-aware keyframe selection for caption windows.
+
+Scores frames as they arrive from a small luma image (sharpness,
+exposure, and difference from frames already kept), keeps the best
+candidates plus the newest few, and picks a clip that is both sharp and
+spread over the window. Only kept candidates are converted to full RGB.
+"""
+
+from typing import Callable, List, Tuple
+
+import numpy as np
+
+from ..utils.exceptions import FrameSamplingError
+
+# Score weights
+SHARPNESS_WEIGHT = 0.5
+EXPOSURE_WEIGHT = 0.2
+DIVERSITY_WEIGHT = 0.3
+
+# Luma below/above these levels counts as clipped
+DARK_LEVEL = 0.02
+BRIGHT_LEVEL = 0.98
+
+# Mean absolute thumbnail difference treated as fully distinct
+DIVERSITY_SCALE = 0.1
+
+# Thumbnail grid used for the diversity term (width, height)
+THUMBNAIL_SIZE = (16, 12)
+
+# Score lost per bin width of distance when filling a bin with no candidate
+SPREAD_PENALTY = 0.5
+
+# Smoothing of the running sharpness reference
+SHARPNESS_SMOOTHING = 0.1
+
+
+def laplacian_variance(luma: np.ndarray) -> float:
+    """
+    Variance of the 4-neighbour Laplacian, a standard blur measure.
+
+    Args:
+        luma: 2D float array
+
+    Returns:
+        Laplacian variance (higher is sharper)
+    """
+    lap = (
+        luma[:-2, 1:-1] + luma[2:, 1:-1] + luma[1:-1, :-2] + luma[1:-1, 2:]
+        - 4.0 * luma[1:-1, 1:-1]
+    )
+    return float(lap.var())
+
+
+def exposure_score(luma: np.ndarray) -> float:
+    """
+    Score exposure in [0, 1]: mid-grey mean and few clipped pixels score high.
+
+    Args:
+        luma: 2D float array in [0, 1]
+
+    Returns:
+        Exposure score
+    """
+    clipped = np.count_nonzero((luma < DARK_LEVEL) | (luma > BRIGHT_LEVEL)) / luma.size
+    return float((1.0 - 2.0 * abs(float(luma.mean()) - 0.5)) * (1.0 - clipped))
+
+
+def thumbnail(luma: np.ndarray) -> np.ndarray:
+    """
+    Block-average a luma image down to THUMBNAIL_SIZE.
+
+    Args:
+        luma: 2D float array at least THUMBNAIL_SIZE large
+
+    Returns:
+        Flattened thumbnail
+    """
+    width, height = THUMBNAIL_SIZE
+    bh, bw = luma.shape[0] // height, luma.shape[1] // width
+    blocks = luma[:bh * height, :bw * width].reshape(height, bh, width, bw)
+    return blocks.mean(axis=(1, 3)).ravel()
+
+
+class KeyframeSelector:
+    """
+    Keeps the top-K frames of a window by quality score.
+
+    The newest `recent` frames are kept whatever their score, so a request
+    for the last few seconds (describe) always finds frames from that span.
+
+    Call add() for each frame with its downscaled luma plane; call
+    select() at the end of the window for a clip of frames ordered by
+    time, then reset() for the next window.
+    """
+
+    def __init__(self, capacity: int, recent: int = 0):
+        """
+        Initialize the selector.
+
+        Args:
+            capacity: Number of candidate frames kept (K)
+            recent: Newest frames always kept, counted within capacity
+        """
+        if capacity <= 0:
+            raise FrameSamplingError(f"Invalid keyframe capacity: {capacity}")
+        if not 0 <= recent < capacity:
+            raise FrameSamplingError(f"Invalid recent keyframe count {recent} for capacity {capacity}")
+
+        self._capacity = capacity
+        self._recent = recent
+        self._sharpness_ref: float = 0.0
+        self.reset()
+
+    def __len__(self) -> int:
+        """Number of candidate frames kept."""
+        return len(self._frames)
+
+    def reset(self) -> None:
+        """Drop all candidates (the sharpness reference carries over)."""
+        self._frames: List[np.ndarray] = []
+        self._times = np.empty(self._capacity, dtype=np.float64)
+        self._scores = np.empty(self._capacity, dtype=np.float64)
+        self._thumbs = np.empty((self._capacity, THUMBNAIL_SIZE[0] * THUMBNAIL_SIZE[1]), dtype=np.float32)
+
+    def score(self, luma: np.ndarray) -> Tuple[float, np.ndarray]:
+        """
+        Score a frame against the current candidates.
+
+        Args:
+            luma: 2D uint8 luma plane (downscaled)
+
+        Returns:
+            (score, thumbnail)
+        """
+        luma = luma.astype(np.float32) * (1.0 / 255.0)
+
+        sharpness = laplacian_variance(luma)
+        if self._sharpness_ref <= 0:
+            self._sharpness_ref = sharpness
+        else:
+            self._sharpness_ref += SHARPNESS_SMOOTHING * (sharpness - self._sharpness_ref)
+        sharp = sharpness / (sharpness + self._sharpness_ref) if sharpness > 0 else 0.0
+
+        thumb = thumbnail(luma)
+        count = len(self._frames)
+        if count:
+            distance = np.abs(self._thumbs[:count] - thumb).mean(axis=1).min()
+            diversity = min(1.0, float(distance) / DIVERSITY_SCALE)
+        else:
+            diversity = 1.0
+
+        score = (
+            SHARPNESS_WEIGHT * sharp
+            + EXPOSURE_WEIGHT * exposure_score(luma)
+            + DIVERSITY_WEIGHT * diversity
+        )
+        return score, thumb
+
+    def add(
+        self,
+        luma: np.ndarray,
+        timestamp: float,
+        load_frame: Callable[[], np.ndarray]
+    ) -> bool:
+        """
+        Score a frame and keep it if it is among the top K (or recent).
+
+        Args:
+            luma: 2D uint8 luma plane (downscaled)
+            timestamp: Media time of the frame in seconds
+            load_frame: Returns the full RGB frame; only called if it is kept
+
+        Returns:
+            True if the frame was kept
+        """
+        score, thumb = self.score(luma)
+        count = len(self._frames)
+
+        if count < self._capacity:
+            slot = count
+            self._frames.append(load_frame())
+        elif self._recent:
+            # The new frame is kept; the lowest scorer outside the newest goes
+            scores = self._scores.copy()
+            scores[np.argsort(self._times)[count - self._recent + 1:]] = np.inf
+            slot = int(scores.argmin())
+            self._frames[slot] = load_frame()
+        else:
+            slot = int(self._scores.argmin())
+            if score <= self._scores[slot]:
+                return False
+            self._frames[slot] = load_frame()
+
+        self._times[slot] = timestamp
+        self._scores[slot] = score
+        self._thumbs[slot] = thumb
+        return True
+
+    def evict_before(self, timestamp: float) -> None:
+        """
+        Drop candidates older than a media time (for rolling windows).
+
+        Args:
+            timestamp: Media time in seconds; earlier candidates are removed
+        """
+        count = len(self._frames)
+        keep = np.flatnonzero(self._times[:count] >= timestamp)
+        if len(keep) == count:
+            return
+
+        kept = len(keep)
+        self._frames = [self._frames[i] for i in keep]
+        self._times[:kept] = self._times[keep]
+        self._scores[:kept] = self._scores[keep]
+        self._thumbs[:kept] = self._thumbs[keep]
+
+    def select(self, clip_len: int, start: float, end: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Pick clip_len frames that are sharp and spread over [start, end].
+
+        The window is split into clip_len equal bins; each bin takes its
+        best-scoring candidate. Bins with no candidate take the candidate
+        with the best score after a penalty for distance to the bin centre.
+
+        Args:
+            clip_len: Number of frames to return
+            start: Media time of the window's first frame
+            end: Media time of the window's last frame
+
+        Returns:
+            (frames, timestamps) ordered by time
+        """
+        count = len(self._frames)
+        if count == 0:
+            raise FrameSamplingError("No keyframe candidates to select from")
+
+        times = self._times[:count]
+        scores = self._scores[:count]
+
+        edges = np.linspace(start, end, clip_len + 1)
+        centres = (edges[:-1] + edges[1:]) / 2
+        bin_width = max(end - start, 1e-6) / clip_len
+
+        bins = np.clip(np.searchsorted(edges, times, side="right") - 1, 0, clip_len - 1)
+        in_bin = bins[None, :] == np.arange(clip_len)[:, None]
+        binned = np.where(in_bin, scores[None, :], -np.inf)
+        best = binned.argmax(axis=1)
+
+        distance = np.abs(times[None, :] - centres[:, None]) / bin_width
+        nearest = (scores[None, :] - SPREAD_PENALTY * distance).argmax(axis=1)
+
+        chosen = np.where(in_bin.any(axis=1), best, nearest)
+        chosen = chosen[np.argsort(times[chosen], kind="stable")]
+
+        return np.stack([self._frames[i] for i in chosen]), times[chosen]
@@ -6,17 +6,41 @@ Uses singleton pattern to ensure only one instance exists.
 """
 
 import copy
+import hashlib
+import inspect
 import time
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 import numpy as np
 import torch
 from transformers import AutoModelForCausalLM, AutoProcessor
 
+from .cpu_topology import configure_cpu_topology, get_cpu_topology
+from .inference_pool import PRIORITY_LIVE
+from .onnx_backend import OnnxCaptionModel, onnx_model_exists
+from .compilation import (
+    bucket_for,
+    compile_available,
+    compile_cache_key,
+    compile_git_model,
+    enable_compile_cache,
+    parse_buckets,
+    save_compile_artifacts,
+    uncompile_git_model,
+)
+from .quantization import load_or_quantize_int8, model_fingerprint, parameter_bytes
+from .precision import (
+    PRECISION_DTYPES,
+    bf16_supported,
+    benchmark_captions_per_second,
+    precision_report,
+    resolve_precision,
+)
 from ..config import settings, MODEL_CONST, HP
 from ..enums import ModelType, ModelStatus
 from ..utils.logging import get_logger
+from ..utils.metrics import get_metrics
 from ..utils.exceptions import (
     ModelLoadError,
     ModelInferenceError,
@@ -33,6 +57,7 @@ class ModelManager:
 
     Handles:
     - Loading models from HuggingFace or local storage
+    - Running on PyTorch (eager or torch.compile) or on exported ONNX graphs
     - Switching between different models (GIT, Pulchowk)
     - Running inference for caption generation
     """
@@ -57,6 +82,15 @@ class ModelManager:
         self._pulchowk_model: Optional[AutoModelForCausalLM] = None
         self._device: Optional[torch.device] = None
         self._current_model_type: ModelType = ModelType.GIT
+        self._backend: str = settings.inference_backend.lower()
+        self._quantized_types: set = set()
+        self._precision: str = "fp32"
+        self._model_dtypes: dict = {}
+        self._batch_buckets: list = [1]
+        self._warmup_stats: dict = {}
+        self._fallback_models: dict = {}
+        self._supports_interpolation: bool = False
+        self._model_fingerprints: dict = {}
         self._status: ModelStatus = ModelStatus.NOT_LOADED
 
         self._initialized = True
@@ -84,6 +118,16 @@ class ModelManager:
         """Get the type of currently active model."""
         return self._current_model_type
 
+    @property
+    def backend(self) -> str:
+        """Get the inference backend (torch, compiled or onnx)."""
+        return self._backend
+
+    @property
+    def precision(self) -> str:
+        """Get the execution precision of non-quantized models (fp32 or bf16)."""
+        return self._precision
+
     @property
     def device(self) -> torch.device:
         """Get the device models are running on."""
@@ -105,12 +149,15 @@ class ModelManager:
             raise ModelNotInitializedError("Models not initialized. Call initialize() first.")
         return self._current_model
 
-    def initialize(self, model_dir: Optional[Path] = None) -> None:
+    def initialize(self, model_dir: Optional[Path] = None, degradation_fallbacks: bool = False) -> None:
         """
         Initialize and load ML models.
 
         Args:
             model_dir: Directory containing model files. Uses settings.model_dir if None.
+            degradation_fallbacks: Also prepare int8 fallback models for the
+                degradation ladder (live server only, when
+                settings.degradation_quantized_fallback is on)
 
         Raises:
             ModelLoadError: If models cannot be loaded
@@ -122,29 +169,60 @@ class ModelManager:
         try:
             # Set up device
             self._setup_device()
+            self._backend = settings.inference_backend.lower()
+
+            if self._backend == "onnx":
+                # Exported graphs replace the PyTorch models entirely
+                self._load_onnx_models()
+            else:
+                # Load GIT model (required)
+                self._load_git_model(model_dir)
+
+                # Load Pulchowk model (optional)
+                self._load_pulchowk_model(model_dir)
+
+                # Swap in int8 models where requested (after Pulchowk copies fp32 GIT)
+                self._apply_quantization(model_dir)
 
-            # Load GIT model (required)
-            self._load_git_model(model_dir)
+                # Keep int8 copies of the rest for the degradation ladder
+                if degradation_fallbacks:
+                    self._build_fallback_models(model_dir)
 
-            # Load Pulchowk model (optional)
-            self._load_pulchowk_model(model_dir)
+                # Cast remaining models to the configured precision
+                self._apply_precision()
+
+                if self._backend == "compiled":
+                    # Compile and warm up every shape bucket before reporting READY
+                    self._compile_models(model_dir)
+
+            self._model_fingerprints = {
+                model_type: model_fingerprint(paths)
+                for model_type, paths in self._model_sources(model_dir).items()
+            }
 
             # Set default model
             self._current_model = self._git_model
             self._current_model_type = ModelType.GIT
 
+            # Pay one-time costs before the first real caption
+            self._status = ModelStatus.WARMING_UP
+            self.warmup()
+
             # Set random seed for reproducibility
             np.random.seed(HP.RANDOM_SEED)
 
             self._status = ModelStatus.READY
-            logger.info(f"ModelManager ready with {self._current_model_type.value} model on {self._device}")
+            logger.info(
+                f"ModelManager ready with {self._current_model_type.value} model "
+                f"on {self._device} ({self._backend} backend)"
+            )
 
         except Exception as e:
             self._status = ModelStatus.ERROR
             raise ModelLoadError(f"Failed to initialize models: {e}", cause=e)
 
     def _setup_device(self) -> None:
-        """Set up the compute device (CUDA or CPU)."""
+        """Set up the compute device (CUDA or CPU) and CPU thread topology."""
         if torch.cuda.is_available():
             self._device = torch.device(settings.cuda_device)
             logger.info(f"Using CUDA device: {settings.cuda_device}")
@@ -152,6 +230,9 @@ class ModelManager:
             self._device = torch.device("cpu")
             logger.warning("CUDA not available, using CPU")
 
+        # Size torch/OpenMP thread pools before the first inference
+        configure_cpu_topology()
+
     def _load_git_model(self, model_dir: Path) -> None:
         """Load the GIT-base-vatex model."""
         git_path = model_dir / "git-base-vatex"
@@ -186,6 +267,11 @@ class ModelManager:
         # Move model to device
         self._git_model.to(self._device)
 
+        # Lower input resolutions need position-embedding interpolation
+        self._supports_interpolation = (
+            "interpolate_pos_encoding" in inspect.signature(self._git_model.forward).parameters
+        )
+
     def _load_pulchowk_model(self, model_dir: Path) -> None:
         """Load the Pulchowk fine-tuned model if available."""
         pulchowk_path = model_dir / "pulchowk-model"
@@ -211,6 +297,233 @@ class ModelManager:
             logger.info("Pulchowk model not found, skipping")
             self._pulchowk_model = None
 
+    def _load_onnx_models(self) -> None:
+        """Load exported ONNX graphs and the processor saved alongside them."""
+        onnx_dir = Path(settings.onnx_model_dir)
+        topology = get_cpu_topology()
+        threads = topology.intra_op_threads if topology else 0
+
+        logger.info(f"Loading ONNX models from {onnx_dir}...")
+        git_dir = onnx_dir / ModelType.GIT.value
+        self._git_model = OnnxCaptionModel(
+            git_dir,
+            graph_optimization_level=settings.ort_graph_optimization_level,
+            intra_op_threads=threads,
+        )
+        try:
+            self._processor = AutoProcessor.from_pretrained(git_dir / MODEL_CONST.PROCESSOR_SUBDIR)
+        except Exception as e:
+            raise ModelLoadError(f"Failed to load processor for ONNX model: {e}", cause=e)
+
+        pulchowk_dir = onnx_dir / ModelType.PULCHOWK.value
+        if onnx_model_exists(pulchowk_dir):
+            self._pulchowk_model = OnnxCaptionModel(
+                pulchowk_dir,
+                graph_optimization_level=settings.ort_graph_optimization_level,
+                intra_op_threads=threads,
+            )
+        else:
+            logger.info("Pulchowk ONNX model not found, skipping")
+            self._pulchowk_model = None
+
+    def _apply_quantization(self, model_dir: Path) -> None:
+        """Replace models listed in settings.quantized_models with int8 versions."""
+        selected = settings.quantized_model_types
+        if not selected:
+            return
+
+        if self._device.type != "cpu":
+            logger.warning("int8 quantization is CPU-only, ignoring QUANTIZED_MODELS")
+            return
+
+        for model_type, source_paths in self._model_sources(model_dir).items():
+            if model_type.value not in selected:
+                continue
+
+            attr = f"_{model_type.value}_model"
+            model = getattr(self, attr)
+            if model is None:
+                continue
+
+            try:
+                fp32_bytes = parameter_bytes(model)
+                quantized = load_or_quantize_int8(
+                    model,
+                    name=model_type.value,
+                    fingerprint=model_fingerprint(source_paths),
+                    cache_dir=settings.quantization_cache_dir,
+                )
+                setattr(self, attr, quantized)
+                self._quantized_types.add(model_type)
+                logger.info(
+                    f"{model_type.value} model running int8: "
+                    f"{fp32_bytes / 2**20:.0f} MB -> {parameter_bytes(quantized) / 2**20:.0f} MB"
+                )
+            except Exception as e:
+                logger.warning(f"int8 quantization failed for {model_type.value}, using fp32: {e}")
+
+    def _model_sources(self, model_dir: Path) -> dict:
+        """Files each model's weights come from, for cache fingerprints."""
+        if self._backend == "onnx":
+            onnx_dir = Path(settings.onnx_model_dir)
+            return {model_type: [onnx_dir / model_type.value] for model_type in ModelType}
+
+        git_path = model_dir / "git-base-vatex"
+        pulchowk_file = model_dir / "pulchowk-model" / MODEL_CONST.PULCHOWK_MODEL_FILE
+        return {
+            ModelType.GIT: [git_path],
+            ModelType.PULCHOWK: [git_path, pulchowk_file],
+        }
+
+    def _build_fallback_models(self, model_dir: Path) -> None:
+        """Prepare int8 copies of fp32 models for use under inference overload."""
+        if not (settings.degradation_enabled and settings.degradation_quantized_fallback):
+            return
+        if self._device.type != "cpu":
+            return
+
+        for model_type, source_paths in self._model_sources(model_dir).items():
+            model = getattr(self, f"_{model_type.value}_model")
+            if model is None or model_type in self._quantized_types:
+                continue
+
+            try:
+                self._fallback_models[model_type] = load_or_quantize_int8(
+                    model,
+                    name=model_type.value,
+                    fingerprint=model_fingerprint(source_paths),
+                    cache_dir=settings.quantization_cache_dir,
+                )
+                logger.info(f"Prepared int8 fallback for {model_type.value} model")
+            except Exception as e:
+                logger.warning(f"Could not prepare int8 fallback for {model_type.value}: {e}")
+
+    def _apply_precision(self) -> None:
+        """Cast non-quantized models to settings.model_precision."""
+        self._precision = resolve_precision(settings.model_precision, self._device)
+        dtype = PRECISION_DTYPES[self._precision]
+
+        for model_type in (ModelType.GIT, ModelType.PULCHOWK):
+            attr = f"_{model_type.value}_model"
+            model = getattr(self, attr)
+            if model is None:
+                continue
+
+            if model_type in self._quantized_types:
+                # Dynamic int8 linears take fp32 activations
+                self._model_dtypes[model_type] = torch.float32
+                continue
+
+            setattr(self, attr, model.to(dtype))
+            self._model_dtypes[model_type] = dtype
+
+        logger.info(f"Running non-quantized models in {self._precision}")
+
+        if settings.precision_report:
+            self._log_precision_report()
+
+    def _log_precision_report(self) -> None:
+        """Log captions/s and weight memory of the GIT model per precision."""
+        pixel_values = self._synthetic_pixel_values()
+        max_length = settings.max_caption_length
+
+        try:
+            if ModelType.GIT in self._quantized_types:
+                rate = benchmark_captions_per_second(self._git_model, pixel_values, max_length)
+                logger.info(
+                    f"Precision int8: {rate:.3f} captions/s, "
+                    f"{parameter_bytes(self._git_model) / 2**20:.1f} MB weights"
+                )
+                return
+
+            precisions = ["fp32"]
+            if self._precision == "bf16" or bf16_supported(self._device):
+                precisions.append("bf16")
+            precision_report(self._git_model, pixel_values, max_length, precisions)
+        except Exception as e:
+            logger.warning(f"Precision report failed: {e}")
+
+    def _compile_models(self, model_dir: Path) -> None:
+        """Compile models with torch.compile using a persistent artifact cache."""
+        self._batch_buckets = parse_buckets(settings.compile_batch_buckets)
+        dtype = PRECISION_DTYPES[self._precision]
+
+        crop_size = self._processor.image_processor.crop_size
+        shapes = [
+            (bucket, HP.CLIP_LENGTH, 3, crop_size["height"], crop_size["width"])
+            for bucket in self._batch_buckets
+        ]
+        fingerprint = model_fingerprint(self._model_sources(model_dir)[ModelType.PULCHOWK])
+        key = compile_cache_key(fingerprint, shapes, dtype, settings.compile_mode)
+
+        if not compile_available():
+            logger.warning("torch.compile is not available here; using the eager torch backend")
+            self._backend = "torch"
+            return
+
+        keyed_dir = enable_compile_cache(settings.compile_cache_dir, key)
+
+        compiled = []
+        start_time = time.time()
+        try:
+            for model_type in (ModelType.GIT, ModelType.PULCHOWK):
+                model = getattr(self, f"_{model_type.value}_model")
+                if model is None:
+                    continue
+                if model_type in self._quantized_types:
+                    logger.warning(f"Skipping torch.compile for int8 {model_type.value} model")
+                    continue
+                compile_git_model(model, mode=settings.compile_mode)
+                compiled.append(model)
+
+            for model in compiled:
+                for bucket in self._batch_buckets:
+                    pixel_values = self._synthetic_pixel_values(bucket).to(dtype)
+                    with torch.no_grad():
+                        # min_length forces every decode length to be compiled now
+                        model.generate(
+                            pixel_values=pixel_values,
+                            max_length=settings.max_caption_length,
+                            min_length=settings.max_caption_length,
+                        )
+        except Exception as e:
+            # Compilation fails lazily (e.g. no C compiler for inductor)
+            logger.warning(f"torch.compile failed, using the eager torch backend: {e}")
+            for model in compiled:
+                uncompile_git_model(model)
+            self._backend = "torch"
+            self._batch_buckets = [1]
+            return
+
+        logger.info(
+            f"Compiled and warmed {len(compiled)} model(s) for batch buckets "
+            f"{self._batch_buckets} in {time.time() - start_time:.1f}s (cache key {key})"
+        )
+
+        save_compile_artifacts(keyed_dir)
+
+    def _pad_to_bucket(self, pixel_values: torch.Tensor) -> torch.Tensor:
+        """Zero-pad a batch up to the nearest compiled batch bucket."""
+        batch_size = pixel_values.shape[0]
+        bucket = bucket_for(batch_size, self._batch_buckets)
+        if bucket == batch_size:
+            return pixel_values
+
+        padding = pixel_values.new_zeros((bucket - batch_size, *pixel_values.shape[1:]))
+        return torch.cat([pixel_values, padding], dim=0)
+
+    def _synthetic_pixel_values(self, batch_size: int = 1) -> torch.Tensor:
+        """Random clip shaped like preprocessed frames, for benchmarks and warmup."""
+        crop_size = self._processor.image_processor.crop_size
+        return torch.rand(
+            batch_size,
+            HP.CLIP_LENGTH,
+            3,
+            crop_size["height"],
+            crop_size["width"],
+            device=self._device,
+        )
+
     def switch_model(self, model_type: ModelType) -> str:
         """
         Switch to a different model.
@@ -244,7 +557,8 @@ class ModelManager:
     def generate_caption(
         self,
         pixel_values: torch.Tensor,
-        max_length: Optional[int] = None
+        max_length: Optional[int] = None,
+        quantized: bool = False
     ) -> str:
         """
         Generate a caption from processed frames.
@@ -252,10 +566,39 @@ class ModelManager:
         Args:
             pixel_values: Preprocessed frames tensor
             max_length: Maximum caption length (uses settings default if None)
+            quantized: Use the int8 fallback of the current model if one exists
 
         Returns:
             Generated caption string
 
+        Raises:
+            ModelInferenceError: If caption generation fails
+        """
+        return self.generate_captions(pixel_values, max_length, quantized)[0]
+
+    def generate_captions(
+        self,
+        pixel_values: torch.Tensor,
+        max_length: Optional[int] = None,
+        quantized: bool = False,
+        priority: int = PRIORITY_LIVE
+    ) -> List[str]:
+        """
+        Generate one caption per clip for a batch of processed clips.
+
+        Only live captions feed caption_latency, which drives readiness,
+        admission and degradation; other work is recorded as
+        background_caption_latency.
+
+        Args:
+            pixel_values: Preprocessed clips (batch, frames, 3, H, W), e.g. from stack_clips()
+            max_length: Maximum caption length (uses settings default if None)
+            quantized: Use the int8 fallback of the current model if one exists
+            priority: InferencePool priority the work runs at
+
+        Returns:
+            Generated captions in batch order
+
         Raises:
             ModelInferenceError: If caption generation fails
         """
@@ -264,60 +607,279 @@ class ModelManager:
 
         self._status = ModelStatus.PROCESSING
         max_length = max_length or settings.max_caption_length
+        batch_size = pixel_values.shape[0]
 
         try:
             start_time = time.time()
-            logger.debug(f"Generating caption with max_length={max_length}")
-
-            with torch.no_grad():
-                generated_ids = self._current_model.generate(
-                    pixel_values=pixel_values,
-                    max_length=max_length
-                )
-
-            caption = self._processor.batch_decode(
-                generated_ids,
+            logger.debug(f"Generating {batch_size} caption(s) with max_length={max_length}")
+
+            model = self._current_model
+            dtype = None
+            if quantized and self._current_model_type in self._fallback_models:
+                model = self._fallback_models[self._current_model_type]
+                dtype = torch.float32
+
+            generated_ids = self._generate_ids(
+                model,
+                self._current_model_type,
+                pixel_values,
+                max_length,
+                dtype=dtype
+            )
+
+            # Drop rows added to pad the batch to a compiled bucket
+            captions = self._processor.batch_decode(
+                generated_ids[:batch_size],
                 skip_special_tokens=True
-            )[0]
+            )
 
             duration = time.time() - start_time
-            logger.info(f"Caption generated in {duration:.2f}s: {caption[:50]}...")
+            latency_metric = "caption_latency" if priority == PRIORITY_LIVE else "background_caption_latency"
+            get_metrics().observe(latency_metric, duration)
+            logger.info(f"{batch_size} caption(s) generated in {duration:.2f}s: {captions[0][:50]}...")
 
             self._status = ModelStatus.READY
-            return caption
+            return captions
 
         except Exception as e:
-            self._status = ModelStatus.ERROR
+            # The caller gets the error; ERROR status is kept for load failures,
+            # since it takes the node out of readiness and admission
+            self._status = ModelStatus.READY
+            get_metrics().increment("inference_failures")
             raise ModelInferenceError(f"Caption generation failed: {e}", cause=e)
 
-    def preprocess_frames(self, frames: np.ndarray) -> torch.Tensor:
+    def stack_clips(self, clips: List):
+        """
+        Join preprocessed clips into one batch for generate_captions().
+
+        Args:
+            clips: Outputs of preprocess_frames(), each with batch size 1
+
+        Returns:
+            Batched pixel values (numpy array on the onnx backend)
+        """
+        if self._backend == "onnx":
+            return np.concatenate(clips, axis=0)
+        return torch.cat(clips, dim=0)
+
+    def _generate_ids(
+        self,
+        model,
+        model_type: ModelType,
+        pixel_values,
+        max_length: int,
+        dtype: Optional[torch.dtype] = None
+    ):
+        """Run generation on the active backend and return token ids."""
+        if self._backend == "onnx":
+            return model.generate(pixel_values=pixel_values, max_length=max_length)
+
+        # Match the model's precision (no-op when already cast)
+        dtype = dtype or self._model_dtypes.get(model_type, torch.float32)
+        pixel_values = pixel_values.to(dtype=dtype)
+
+        if self._backend == "compiled":
+            # Reuse a warmed shape instead of triggering a recompile
+            pixel_values = self._pad_to_bucket(pixel_values)
+
+        kwargs = {}
+        if pixel_values.shape[-1] != self._processor.image_processor.crop_size["width"]:
+            kwargs["interpolate_pos_encoding"] = True
+
+        with torch.no_grad():
+            return model.generate(pixel_values=pixel_values, max_length=max_length, **kwargs)
+
+    def warmup(self, iterations: Optional[int] = None) -> dict:
+        """
+        Run synthetic clips through preprocessing and generation for each loaded model.
+
+        The first run pays one-time costs (allocator growth, lazy kernel
+        selection, tokenizer set-up); later runs show steady-state latency.
+
+        Args:
+            iterations: Runs per model (uses settings.warmup_iterations if None)
+
+        Returns:
+            Per-model cold/warm latency in seconds
+        """
+        iterations = settings.warmup_iterations if iterations is None else iterations
+        stats = {}
+
+        if iterations > 0:
+            frames = np.random.randint(0, 256, (HP.CLIP_LENGTH, 480, 640, 3), dtype=np.uint8)
+
+            targets = []
+            for model_type in (ModelType.GIT, ModelType.PULCHOWK):
+                model = getattr(self, f"_{model_type.value}_model")
+                if model is not None:
+                    targets.append((model_type.value, model_type, model, None))
+                if model_type in self._fallback_models:
+                    targets.append((
+                        f"{model_type.value}_int8", model_type,
+                        self._fallback_models[model_type], torch.float32
+                    ))
+
+            for name, model_type, model, dtype in targets:
+                latencies = []
+                for _ in range(iterations):
+                    start_time = time.perf_counter()
+                    pixel_values = self.preprocess_frames(frames)
+                    generated_ids = self._generate_ids(
+                        model, model_type, pixel_values, settings.max_caption_length, dtype=dtype
+                    )
+                    self._processor.batch_decode(generated_ids, skip_special_tokens=True)
+                    latencies.append(time.perf_counter() - start_time)
+
+                warm = latencies[1:]
+                stats[name] = {
+                    "iterations": iterations,
+                    "cold_seconds": round(latencies[0], 3),
+                    "warm_seconds": round(sum(warm) / len(warm), 3) if warm else None,
+                }
+                logger.info(
+                    f"Warmup {name} ({self._backend}): "
+                    f"cold {stats[name]['cold_seconds']}s, "
+                    f"warm {stats[name]['warm_seconds']}s"
+                )
+
+        self._warmup_stats = stats
+        return stats
+
+    @property
+    def warmup_stats(self) -> dict:
+        """Get cold/warm latency recorded by the last warmup."""
+        return self._warmup_stats
+
+    def load_processor(self, model_dir: Optional[Path] = None) -> None:
+        """
+        Load only the frame processor, for preprocessing without the models.
+
+        GIT and Pulchowk share the GIT processor, so clips preprocessed
+        once can be captioned by either model.
+
+        Args:
+            model_dir: Directory containing model files. Uses settings.model_dir if None.
+
+        Raises:
+            ModelLoadError: If the processor cannot be loaded
+        """
+        if self._processor is not None:
+            return
+
+        processor_path = Path(model_dir or settings.model_dir) / "git-base-vatex" / MODEL_CONST.PROCESSOR_SUBDIR
+        source = processor_path if processor_path.exists() else MODEL_CONST.GIT_MODEL_NAME
+        try:
+            self._processor = AutoProcessor.from_pretrained(source)
+        except Exception as e:
+            raise ModelLoadError(f"Failed to load processor: {e}", cause=e)
+
+    @property
+    def processor_identity(self) -> str:
+        """Fingerprint of the processor configuration (what preprocess_frames outputs)."""
+        if self._processor is None:
+            raise ModelNotInitializedError("Processor not initialized")
+        config = self._processor.image_processor.to_json_string()
+        return hashlib.sha256(config.encode()).hexdigest()[:16]
+
+    def preprocess_frames(
+        self,
+        frames: np.ndarray,
+        image_size: Optional[int] = None,
+        return_numpy: bool = False
+    ):
         """
         Preprocess frames for model input.
 
         Args:
             frames: Array of video frames (N, H, W, C)
+            image_size: Square input resolution (uses the processor default if None)
+            return_numpy: Return a float32 numpy array on the CPU (for storage)
 
         Returns:
-            Preprocessed tensor ready for model input
+            Preprocessed tensor ready for model input (numpy array on the onnx backend)
         """
         if self._processor is None:
             raise ModelNotInitializedError("Processor not initialized")
 
+        kwargs = {}
+        if image_size:
+            kwargs["size"] = {"shortest_edge": image_size}
+            kwargs["crop_size"] = {"height": image_size, "width": image_size}
+
+        if self._backend == "onnx" or return_numpy:
+            return self._processor(images=list(frames), return_tensors="np", **kwargs).pixel_values
+
         pixel_values = self._processor(
             images=list(frames),
-            return_tensors="pt"
+            return_tensors="pt",
+            **kwargs
         ).pixel_values
 
-        return pixel_values.to(self._device)
+        dtype = self._model_dtypes.get(self._current_model_type, torch.float32)
+        return pixel_values.to(self._device, dtype=dtype)
+
+    def to_model_input(self, pixel_values: np.ndarray):
+        """
+        Convert stored preprocessed clips to model input.
+
+        Args:
+            pixel_values: Array (batch, frames, 3, H, W) from preprocess_frames(return_numpy=True)
+
+        Returns:
+            Tensor on the model's device and precision (float32 numpy array on the onnx backend)
+        """
+        pixel_values = np.ascontiguousarray(pixel_values, dtype=np.float32)
+        if self._backend == "onnx":
+            return pixel_values
+
+        dtype = self._model_dtypes.get(self._current_model_type, torch.float32)
+        return torch.from_numpy(pixel_values).to(self._device, dtype=dtype)
 
     def is_ready(self) -> bool:
-        """Check if the model manager is ready for inference."""
-        return self._status == ModelStatus.READY
+        """Check if models are loaded, warmed up, and accepting inference."""
+        return self._status in (ModelStatus.READY, ModelStatus.PROCESSING)
 
     def has_pulchowk_model(self) -> bool:
         """Check if Pulchowk model is available."""
         return self._pulchowk_model is not None
 
+    @property
+    def model_identity(self) -> str:
+        """
+        Identify the current model build and numerics, for caption caches.
+
+        Changes when the model type, its weight files, the backend,
+        precision or quantization changes.
+        """
+        model_type = self._current_model_type
+        return ":".join([
+            model_type.value,
+            self._backend,
+            self._precision,
+            "int8" if self.is_quantized(model_type) else "float",
+            self._model_fingerprints.get(model_type, "unknown"),
+        ])
+
+    def is_quantized(self, model_type: Optional[ModelType] = None) -> bool:
+        """Check if a model (default: the current one) runs int8 quantized."""
+        return (model_type or self._current_model_type) in self._quantized_types
+
+    def has_quantized_fallback(self) -> bool:
+        """Check if any model has an int8 fallback for overload."""
+        return bool(self._fallback_models)
+
+    @property
+    def supports_frame_scaling(self) -> bool:
+        """Whether clips with fewer than HP.CLIP_LENGTH frames can be captioned."""
+        # Exported ONNX graphs have a fixed clip length
+        return self._backend != "onnx"
+
+    @property
+    def supports_resolution_scaling(self) -> bool:
+        """Whether inputs below the processor crop size can be captioned."""
+        # Compiled image encoders are specialized to one input shape
+        return self._backend == "torch" and self._supports_interpolation
+
 
 # Convenience function for getting the singleton instance
 def get_model_manager() -> ModelManager:
@@ -0,0 +1,144 @@
+"""
+ONNX Runtime inference backend for GIT caption models.
+
+Runs graphs produced by models.onnx_export with a greedy decode loop.
+Only needs numpy and onnxruntime at inference time, not torch.
+"""
+
+import json
+from pathlib import Path
+from typing import Dict
+
+import numpy as np
+
+from ..utils.logging import get_logger
+from ..utils.exceptions import ModelLoadError
+
+logger = get_logger(__name__)
+
+PREFILL_FILE = "prefill.onnx"
+DECODER_FILE = "decoder.onnx"
+METADATA_FILE = "config.json"
+
+GRAPH_OPTIMIZATION_LEVELS = {
+    "disable": "ORT_DISABLE_ALL",
+    "basic": "ORT_ENABLE_BASIC",
+    "extended": "ORT_ENABLE_EXTENDED",
+    "all": "ORT_ENABLE_ALL",
+}
+
+
+def onnx_model_exists(model_dir: Path) -> bool:
+    """Check whether an exported model is present in a directory."""
+    model_dir = Path(model_dir)
+    return all((model_dir / name).exists() for name in (PREFILL_FILE, DECODER_FILE, METADATA_FILE))
+
+
+class OnnxCaptionModel:
+    """
+    GIT caption model running on ONNX Runtime.
+
+    Exposes generate(pixel_values=..., max_length=...) returning token ids,
+    so ModelManager can use it in place of the PyTorch model.
+    """
+
+    def __init__(
+        self,
+        model_dir: Path,
+        graph_optimization_level: str = "all",
+        intra_op_threads: int = 0,
+        inter_op_threads: int = 0
+    ):
+        """
+        Load the prefill and decoder sessions.
+
+        Args:
+            model_dir: Directory produced by export_git_onnx
+            graph_optimization_level: disable, basic, extended or all
+            intra_op_threads: ORT intra-op threads (0 = ORT default)
+            inter_op_threads: ORT inter-op threads (0 = ORT default)
+
+        Raises:
+            ModelLoadError: If onnxruntime is missing or the graphs can't be loaded
+        """
+        try:
+            import onnxruntime as ort
+        except ImportError as e:
+            raise ModelLoadError(
+                "onnxruntime is required for INFERENCE_BACKEND=onnx "
+                "(pip install scene-descriptor[onnx])",
+                cause=e
+            )
+
+        model_dir = Path(model_dir)
+        if not onnx_model_exists(model_dir):
+            raise ModelLoadError(
+                f"No exported ONNX model in {model_dir}; "
+                "run python -m scripts.export_onnx first"
+            )
+
+        level = GRAPH_OPTIMIZATION_LEVELS.get(graph_optimization_level.lower())
+        if level is None:
+            raise ModelLoadError(f"Unknown graph optimization level: {graph_optimization_level}")
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = getattr(ort.GraphOptimizationLevel, level)
+        if intra_op_threads:
+            options.intra_op_num_threads = intra_op_threads
+        if inter_op_threads:
+            options.inter_op_num_threads = inter_op_threads
+
+        providers = ["CPUExecutionProvider"]
+        self._prefill = ort.InferenceSession(str(model_dir / PREFILL_FILE), options, providers=providers)
+        self._decoder = ort.InferenceSession(str(model_dir / DECODER_FILE), options, providers=providers)
+
+        self._metadata: Dict = json.loads((model_dir / METADATA_FILE).read_text())
+        self._past_names = [
+            f"past_{kind}_{i}"
+            for i in range(self._metadata["num_layers"])
+            for kind in ("key", "value")
+        ]
+
+        logger.info(f"Loaded ONNX model from {model_dir} (optimization: {graph_optimization_level})")
+
+    @property
+    def clip_length(self) -> int:
+        """Number of frames per clip the prefill graph was exported with."""
+        return self._metadata["clip_length"]
+
+    def generate(self, pixel_values: np.ndarray, max_length: int) -> np.ndarray:
+        """
+        Greedy-decode captions for a batch of clips.
+
+        Args:
+            pixel_values: Preprocessed clips (batch, frames, 3, H, W)
+            max_length: Maximum number of tokens, including the BOS token
+
+        Returns:
+            Token ids (batch, length), padded after EOS
+        """
+        meta = self._metadata
+        pixel_values = np.asarray(pixel_values, dtype=np.float32)
+        batch_size = pixel_values.shape[0]
+
+        # The prefill runs BOS; later steps feed back the newest token
+        outputs = self._prefill.run(None, {"pixel_values": pixel_values})
+
+        token_ids = np.full((batch_size, 1), meta["bos_token_id"], dtype=np.int64)
+        finished = np.zeros(batch_size, dtype=bool)
+
+        while token_ids.shape[1] < max_length:
+            next_tokens = outputs[0].argmax(axis=-1).astype(np.int64)
+            next_tokens = np.where(finished, meta["pad_token_id"], next_tokens)
+            token_ids = np.concatenate([token_ids, next_tokens[:, None]], axis=1)
+
+            finished |= next_tokens == meta["eos_token_id"]
+            if finished.all() or token_ids.shape[1] >= max_length:
+                break
+
+            outputs = self._decoder.run(None, {
+                "input_ids": next_tokens[:, None],
+                **dict(zip(self._past_names, outputs[1:])),
+            })
+
+        return token_ids
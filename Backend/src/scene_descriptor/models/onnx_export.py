@@ -0,0 +1,234 @@
+"""
+ONNX export for GIT caption models.
+
+Produces two graphs consumed by the ONNX Runtime backend:
+- prefill.onnx: video clip -> first-token logits and the key/value cache
+  (image tokens and BOS)
+- decoder.onnx: one greedy decode step from the newest token and the cache
+
+Both wrap the public GitForCausalLM.forward (input_ids with pixel_values
+or past_key_values), so they do not depend on GIT's private helpers.
+Whether the cache holds the image tokens has changed between transformers
+versions, so the export checks the wrappers against model.generate first.
+"""
+
+import inspect
+import json
+from pathlib import Path
+from typing import List, Tuple
+
+import torch
+import transformers
+from torch import nn
+from transformers import DynamicCache
+
+from .onnx_backend import DECODER_FILE, METADATA_FILE, PREFILL_FILE
+from ..utils.exceptions import ModelError
+from ..utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+def _flatten_cache(cache) -> List[torch.Tensor]:
+    """Cache contents as (key_0, value_0, key_1, ...)."""
+    if hasattr(cache, "layers"):
+        return [tensor for layer in cache.layers for tensor in (layer.keys, layer.values)]
+    if hasattr(cache, "to_legacy_cache"):
+        cache = cache.to_legacy_cache()
+    return [tensor for layer in cache for tensor in layer]
+
+
+class PrefillWrapper(nn.Module):
+    """Encode a (batch, frames, 3, H, W) clip and run the BOS token."""
+
+    def __init__(self, model: nn.Module):
+        super().__init__()
+        self.model = model
+        self.bos_token_id = model.config.bos_token_id
+
+    def forward(self, pixel_values: torch.Tensor) -> Tuple[torch.Tensor, ...]:
+        input_ids = torch.full(
+            (pixel_values.shape[0], 1), self.bos_token_id, dtype=torch.long, device=pixel_values.device
+        )
+        outputs = self.model(input_ids=input_ids, pixel_values=pixel_values, use_cache=True, return_dict=True)
+        return (outputs.logits[:, -1, :], *_flatten_cache(outputs.past_key_values))
+
+
+class DecoderStepWrapper(nn.Module):
+    """
+    Run one decode step: the newest token plus the cached keys/values.
+
+    Past keys/values are passed flat as (key_0, value_0, key_1, ...) and
+    start with the image tokens, which do not count as text positions.
+    """
+
+    def __init__(self, model: nn.Module, num_image_tokens: int):
+        super().__init__()
+        self.model = model
+        self.num_layers = model.config.num_hidden_layers
+        self.num_image_tokens = num_image_tokens
+
+    def forward(self, input_ids: torch.Tensor, *past: torch.Tensor) -> Tuple[torch.Tensor, ...]:
+        cache = DynamicCache()
+        for i in range(self.num_layers):
+            cache.update(past[2 * i], past[2 * i + 1], i)
+
+        text_length = past[0].shape[2] - self.num_image_tokens
+        position_ids = torch.arange(
+            text_length, text_length + input_ids.shape[1], device=input_ids.device
+        ).unsqueeze(0).expand(input_ids.shape[0], -1)
+
+        outputs = self.model(
+            input_ids=input_ids,
+            past_key_values=cache,
+            position_ids=position_ids,
+            use_cache=True,
+            return_dict=True,
+        )
+        return (outputs.logits[:, -1, :], *_flatten_cache(outputs.past_key_values))
+
+
+def greedy_decode(
+    prefill: PrefillWrapper,
+    decoder: DecoderStepWrapper,
+    pixel_values: torch.Tensor,
+    max_length: int
+) -> torch.Tensor:
+    """
+    Greedy-decode with the export wrappers, as the ONNX backend does.
+
+    Args:
+        prefill: Prefill wrapper
+        decoder: Decoder step wrapper
+        pixel_values: Clips (batch, frames, 3, H, W)
+        max_length: Maximum number of tokens, including the BOS token
+
+    Returns:
+        Token ids (batch, length), without padding after EOS
+    """
+    outputs = prefill(pixel_values)
+    token_ids = torch.full((pixel_values.shape[0], 1), prefill.bos_token_id, dtype=torch.long)
+    while True:
+        next_tokens = outputs[0].argmax(dim=-1)
+        token_ids = torch.cat([token_ids, next_tokens[:, None]], dim=1)
+        if token_ids.shape[1] >= max_length:
+            return token_ids
+        outputs = decoder(next_tokens[:, None], *outputs[1:])
+
+
+def _check_decode_parity(
+    model: nn.Module,
+    prefill: PrefillWrapper,
+    decoder: DecoderStepWrapper,
+    pixel_values: torch.Tensor,
+    max_length: int = 12
+) -> None:
+    """Fail unless the wrappers decode exactly like model.generate."""
+    expected = model.generate(pixel_values=pixel_values, max_length=max_length, do_sample=False, num_beams=1)
+    actual = greedy_decode(prefill, decoder, pixel_values, expected.shape[1])
+
+    # generate pads finished rows; compare up to each row's EOS
+    eos = model.config.eos_token_id
+    for row_expected, row_actual in zip(expected.tolist(), actual.tolist()):
+        length = row_expected.index(eos) + 1 if eos in row_expected else len(row_expected)
+        if row_expected[:length] != row_actual[:length]:
+            raise ModelError(
+                f"ONNX export is not supported with transformers {transformers.__version__}: "
+                "cached decoding through GitForCausalLM.forward does not match model.generate "
+                "(this GIT implementation does not keep image tokens in the cache)"
+            )
+
+
+def export_git_onnx(
+    model: nn.Module,
+    output_dir: Path,
+    clip_length: int,
+    image_size: int,
+    opset: int = 17
+) -> Path:
+    """
+    Export a GIT model's prefill and decoder step to ONNX.
+
+    Args:
+        model: fp32 GitForCausalLM on CPU
+        output_dir: Directory to write the graphs and metadata to
+        clip_length: Number of frames per clip (fixed in the prefill graph)
+        image_size: Input height/width of each frame
+        opset: ONNX opset version
+
+    Returns:
+        The output directory
+
+    Raises:
+        ModelError: If the installed transformers cannot be exported this way
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    model = model.to("cpu", dtype=torch.float32).eval()
+    config = model.config
+    num_layers = config.num_hidden_layers
+
+    # The TorchScript exporter takes dynamic_axes; newer torch defaults to dynamo
+    export_kwargs = {"dynamo": False} if "dynamo" in inspect.signature(torch.onnx.export).parameters else {}
+
+    pixel_values = torch.rand(2, clip_length, 3, image_size, image_size)
+
+    with torch.no_grad():
+        prefill = PrefillWrapper(model).eval()
+        past = prefill(pixel_values)[1:]
+        num_image_tokens = past[0].shape[2] - 1
+        decoder = DecoderStepWrapper(model, num_image_tokens).eval()
+
+        _check_decode_parity(model, prefill, decoder, pixel_values)
+
+        past_names, present_names = [], []
+        for i in range(num_layers):
+            for kind in ("key", "value"):
+                past_names.append(f"past_{kind}_{i}")
+                present_names.append(f"present_{kind}_{i}")
+        present_axes = {name: {0: "batch", 2: "sequence"} for name in present_names}
+
+        logger.info("Exporting prefill...")
+        torch.onnx.export(
+            prefill,
+            (pixel_values,),
+            str(output_dir / PREFILL_FILE),
+            input_names=["pixel_values"],
+            output_names=["logits", *present_names],
+            dynamic_axes={"pixel_values": {0: "batch"}, "logits": {0: "batch"}, **present_axes},
+            opset_version=opset,
+            **export_kwargs,
+        )
+
+        input_ids = torch.full((2, 1), config.bos_token_id, dtype=torch.long)
+        logger.info("Exporting decoder step...")
+        torch.onnx.export(
+            decoder,
+            (input_ids, *past),
+            str(output_dir / DECODER_FILE),
+            input_names=["input_ids", *past_names],
+            output_names=["logits", *present_names],
+            dynamic_axes={
+                "input_ids": {0: "batch"},
+                "logits": {0: "batch"},
+                **{name: {0: "batch", 2: "past_sequence"} for name in past_names},
+                **present_axes,
+            },
+            opset_version=opset,
+            **export_kwargs,
+        )
+
+    metadata = {
+        "num_layers": num_layers,
+        "num_image_tokens": num_image_tokens,
+        "clip_length": clip_length,
+        "image_size": image_size,
+        "bos_token_id": config.bos_token_id,
+        "eos_token_id": config.eos_token_id,
+        "pad_token_id": config.pad_token_id if config.pad_token_id is not None else 0,
+    }
+    (output_dir / METADATA_FILE).write_text(json.dumps(metadata, indent=2))
+
+    logger.info(f"ONNX model exported to {output_dir}")
+    return output_dir
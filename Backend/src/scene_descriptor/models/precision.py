@@ -0,0 +1,169 @@
+"""
+Model execution precision (fp32 / bf16).
+
+Detects bfloat16 support on the host and reports captions per second and
+weight memory for each precision at start-up.
+"""
+
+import copy
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import torch
+from torch import nn
+
+from .quantization import parameter_bytes
+from ..utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+PRECISION_DTYPES: Dict[str, torch.dtype] = {
+    "fp32": torch.float32,
+    "bf16": torch.bfloat16,
+}
+
+# /proc/cpuinfo flags indicating native bf16 matmul support
+BF16_CPU_FLAGS = {"avx512_bf16", "amx_bf16"}
+
+
+def _cpu_flags() -> set:
+    """Read CPU feature flags from /proc/cpuinfo (empty if unavailable)."""
+    try:
+        for line in Path("/proc/cpuinfo").read_text().splitlines():
+            if line.startswith("flags"):
+                return set(line.split(":", 1)[1].split())
+    except OSError:
+        pass
+    return set()
+
+
+def bf16_supported(device: torch.device) -> bool:
+    """
+    Check whether the device runs bfloat16 natively.
+
+    Args:
+        device: Target compute device
+
+    Returns:
+        True if bf16 matmuls are hardware-accelerated
+    """
+    if device.type == "cuda":
+        return torch.cuda.is_bf16_supported()
+
+    if BF16_CPU_FLAGS & _cpu_flags():
+        return True
+
+    try:
+        return bool(torch.ops.mkldnn._is_mkldnn_bf16_supported())
+    except (AttributeError, RuntimeError):
+        return False
+
+
+def resolve_precision(requested: str, device: torch.device) -> str:
+    """
+    Turn a precision setting into the precision that will actually run.
+
+    Args:
+        requested: "fp32", "bf16" or "auto"
+        device: Target compute device
+
+    Returns:
+        "fp32" or "bf16"
+    """
+    requested = requested.lower()
+    supported = bf16_supported(device)
+
+    if requested == "auto":
+        precision = "bf16" if supported else "fp32"
+        logger.info(f"Precision auto-detected: {precision} (bf16 hardware support: {supported})")
+        return precision
+
+    if requested not in PRECISION_DTYPES:
+        logger.warning(f"Unknown precision '{requested}', using fp32")
+        return "fp32"
+
+    if requested == "bf16" and not supported:
+        logger.warning("bf16 requested but not hardware-accelerated on this host; it will be emulated")
+
+    return requested
+
+
+def benchmark_captions_per_second(
+    model: nn.Module,
+    pixel_values: torch.Tensor,
+    max_length: int,
+    runs: int = 2
+) -> float:
+    """
+    Measure caption throughput on a synthetic clip.
+
+    Args:
+        model: Model to benchmark
+        pixel_values: Input tensor in the model's dtype and device
+        max_length: Caption length to generate
+        runs: Timed runs after one untimed warmup run
+
+    Returns:
+        Captions per second
+    """
+    with torch.no_grad():
+        model.generate(pixel_values=pixel_values, max_length=max_length)
+
+        start_time = time.perf_counter()
+        for _ in range(runs):
+            model.generate(pixel_values=pixel_values, max_length=max_length)
+        duration = time.perf_counter() - start_time
+
+    return runs / duration if duration > 0 else 0.0
+
+
+def precision_report(
+    model: nn.Module,
+    pixel_values: torch.Tensor,
+    max_length: int,
+    precisions: Iterable[str]
+) -> List[dict]:
+    """
+    Benchmark a model in each precision and log captions/s and memory.
+
+    Precisions other than the model's current dtype run on a temporary
+    copy, which is freed after measuring.
+
+    Args:
+        model: Loaded model
+        pixel_values: Synthetic input clip
+        max_length: Caption length to generate
+        precisions: Precisions to report on
+
+    Returns:
+        List of {"precision", "captions_per_second", "weights_mb"} dicts
+    """
+    current_dtype = next(model.parameters()).dtype
+    results = []
+
+    for precision in precisions:
+        dtype = PRECISION_DTYPES[precision]
+        candidate: Optional[nn.Module] = model
+        try:
+            if dtype != current_dtype:
+                candidate = copy.deepcopy(model).to(dtype)
+
+            rate = benchmark_captions_per_second(candidate, pixel_values.to(dtype), max_length)
+            result = {
+                "precision": precision,
+                "captions_per_second": round(rate, 3),
+                "weights_mb": round(parameter_bytes(candidate) / 2**20, 1),
+            }
+            results.append(result)
+            logger.info(
+                f"Precision {precision}: {result['captions_per_second']} captions/s, "
+                f"{result['weights_mb']} MB weights"
+            )
+        except Exception as e:
+            logger.warning(f"Could not benchmark {precision}: {e}")
+        finally:
+            if candidate is not model:
+                del candidate
+
+    return results
@@ -4,6 +4,7 @@ Frame processing utilities for video captioning.
 Provides functions for sampling and processing video frames.
 """
 
+from fractions import Fraction
 from typing import List, Optional
 
 import av
@@ -145,6 +146,209 @@ def read_video_frames(
         raise VideoReadError(f"Failed to read video {video_path}: {e}", cause=e)
 
 
+# Decode forward instead of seeking when the next target is this close (seconds)
+SEEK_THRESHOLD_SECONDS = 2.0
+
+
+def _stream_frame_count(container, stream) -> int:
+    """Count frames by demuxing packets (no decoding), for streams without metadata."""
+    count = sum(1 for packet in container.demux(stream) if packet.pts is not None)
+    container.seek(0)
+    return count
+
+
+def _read_frames_at_indices(container, stream, indices: np.ndarray) -> List[np.ndarray]:
+    """Decode sequentially, converting only the frames at the given indices."""
+    wanted = {}
+    for position, index in enumerate(indices):
+        wanted.setdefault(int(index), []).append(position)
+
+    frames: List[Optional[np.ndarray]] = [None] * len(indices)
+    last = int(indices.max())
+    for i, frame in enumerate(container.decode(stream)):
+        if i in wanted:
+            image = frame.to_ndarray(format="rgb24")
+            for position in wanted[i]:
+                frames[position] = image
+        if i >= last:
+            break
+
+    return [frame for frame in frames if frame is not None]
+
+
+def _read_frames_at_times(container, stream, targets: np.ndarray) -> List[np.ndarray]:
+    """
+    Seek to the keyframe before each target time and decode forward to it.
+
+    Consecutive targets closer than SEEK_THRESHOLD_SECONDS are reached by
+    decoding forward without a new seek.
+    """
+    time_base = stream.time_base
+    frames: List[np.ndarray] = []
+    decoder = None
+    position: Optional[float] = None
+    previous = None
+
+    for target in targets:
+        if decoder is None or position is None or not (
+            position <= target < position + SEEK_THRESHOLD_SECONDS
+        ):
+            container.seek(int(target / time_base), stream=stream, backward=True, any_frame=False)
+            decoder = container.decode(stream)
+            previous = None
+
+        chosen = None
+        for frame in decoder:
+            position = float(frame.pts * time_base) if frame.pts is not None else position
+            if position is not None and position >= target:
+                # Take whichever of this frame and the previous one is closer
+                if previous is not None and target - previous[0] < position - target:
+                    chosen = previous[1]
+                else:
+                    chosen = frame
+                previous = (position, frame)
+                break
+            previous = (position, frame)
+        else:
+            # Ran off the end: use the last frame decoded
+            chosen = previous[1] if previous else None
+            decoder = None
+
+        if chosen is not None:
+            frames.append(chosen.to_ndarray(format="rgb24"))
+
+    return frames
+
+
+def read_sampled_frames(
+    video_path: str,
+    num_samples: int = HP.CLIP_LENGTH,
+    threads: Optional[int] = None
+) -> np.ndarray:
+    """
+    Read only the frames sample_frame_indices would pick, without decoding the whole file.
+
+    Uses the stream's frame count and duration to compute target
+    timestamps, seeks to the keyframe before each one, and decodes forward
+    only as far as the target. Streams without usable metadata fall back
+    to counting packets and decoding sequentially, still converting only
+    the sampled frames. Either way memory is bounded by num_samples frames.
+
+    Args:
+        video_path: Path to the video file
+        num_samples: Number of frames to sample
+        threads: Codec threads (0 lets the codec choose; None keeps the default)
+
+    Returns:
+        Array of sampled frames (num_samples, H, W, C) in RGB
+
+    Raises:
+        VideoReadError: If video cannot be read
+    """
+    try:
+        container = av.open(video_path)
+    except Exception as e:
+        raise VideoReadError(f"Failed to open video {video_path}: {e}", cause=e)
+
+    try:
+        stream = container.streams.video[0]
+        if threads is not None:
+            # Frame and slice threading; ffmpeg flushes the threads on seek
+            stream.thread_type = "AUTO"
+            stream.codec_context.thread_count = threads
+        time_base = stream.time_base
+        rate = stream.average_rate or stream.guessed_rate
+        start = float(stream.start_time * time_base) if stream.start_time is not None else 0.0
+
+        duration = None
+        if stream.duration and time_base:
+            duration = float(stream.duration * time_base)
+        elif container.duration:
+            duration = container.duration / av.time_base
+
+        frame_count = stream.frames or (int(round(duration * rate)) if duration and rate else 0)
+
+        frames: List[np.ndarray] = []
+        if frame_count > 0 and rate and time_base:
+            indices = sample_frame_indices(num_samples, frame_count)
+            targets = start + indices / float(Fraction(rate))
+            frames = _read_frames_at_times(container, stream, targets)
+
+        if len(frames) < num_samples:
+            logger.debug(f"Seek sampling incomplete for {video_path}, counting packets")
+            container.seek(0)
+            frame_count = _stream_frame_count(container, stream)
+            if frame_count == 0:
+                raise VideoReadError(f"No video frames in {video_path}")
+            indices = sample_frame_indices(num_samples, frame_count)
+            frames = _read_frames_at_indices(container, stream, indices)
+
+        if not frames:
+            raise VideoReadError(f"No frames decoded from {video_path}")
+
+        # Pad with the last frame if the stream ended early
+        frames.extend([frames[-1]] * (num_samples - len(frames)))
+
+        logger.debug(f"Read {len(frames)} sampled frames from {video_path}")
+        return np.stack(frames)
+
+    except VideoReadError:
+        raise
+    except Exception as e:
+        raise VideoReadError(f"Failed to read video {video_path}: {e}", cause=e)
+    finally:
+        container.close()
+
+
+def read_sampled_frames_opencv(
+    video_path: str,
+    num_samples: int = HP.CLIP_LENGTH
+) -> np.ndarray:
+    """
+    Read only the sampled frames of a video using OpenCV frame seeking.
+
+    Args:
+        video_path: Path to the video file
+        num_samples: Number of frames to sample
+
+    Returns:
+        Array of sampled frames (num_samples, H, W, C) in RGB
+
+    Raises:
+        VideoReadError: If video cannot be read
+    """
+    cap = cv2.VideoCapture(video_path)
+    try:
+        if not cap.isOpened():
+            raise VideoReadError(f"Cannot open video: {video_path}")
+
+        frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        if frame_count <= 0:
+            # No reliable count: fall back to a full read
+            return sample_frames(read_video_opencv(video_path), num_samples)
+
+        frames = []
+        for index in sample_frame_indices(num_samples, frame_count):
+            cap.set(cv2.CAP_PROP_POS_FRAMES, int(index))
+            ret, frame = cap.read()
+            if not ret:
+                break
+            frames.append(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+
+        if not frames:
+            raise VideoReadError(f"No frames decoded from {video_path}")
+
+        frames.extend([frames[-1]] * (num_samples - len(frames)))
+        return np.stack(frames)
+
+    except VideoReadError:
+        raise
+    except Exception as e:
+        raise VideoReadError(f"Failed to read video {video_path}: {e}", cause=e)
+    finally:
+        cap.release()
+
+
 def read_video_opencv(
     video_path: str,
     max_frames: Optional[int] = None
@@ -0,0 +1,144 @@
+"""
+Dynamic int8 quantization for CPU inference.
+
+Quantizes the linear layers of GIT's vision encoder and text decoder,
+which dominate CPU inference time, and caches the quantized module on
+disk so restarts skip the conversion.
+"""
+
+import hashlib
+from pathlib import Path
+from typing import Iterable, Optional
+
+import torch
+from torch import nn
+
+from ..utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# GIT submodules whose nn.Linear layers are quantized
+INT8_SUBMODULES = (
+    "git.image_encoder",    # CLIP vision encoder
+    "git.visual_projection",
+    "git.encoder",          # Text decoder transformer
+    "output",               # LM head
+)
+
+
+def quantize_int8(model: nn.Module) -> nn.Module:
+    """
+    Apply dynamic int8 quantization to the encoder/decoder linear layers.
+
+    Weights are stored as int8; activations are quantized on the fly.
+    Only supported on CPU.
+
+    Args:
+        model: fp32 GIT model on CPU
+
+    Returns:
+        New quantized model (the input model is left untouched)
+    """
+    from torch.ao.quantization import default_dynamic_qconfig, quantize_dynamic
+
+    qconfig_spec = {name: default_dynamic_qconfig for name in INT8_SUBMODULES}
+    quantized = quantize_dynamic(model, qconfig_spec=qconfig_spec, dtype=torch.qint8)
+    quantized.eval()
+    return quantized
+
+
+def model_fingerprint(paths: Iterable[Path]) -> str:
+    """
+    Build a short fingerprint of model source files and the torch version.
+
+    Uses file size and modification time rather than contents, so it is
+    cheap enough to compute on every start-up.
+
+    Args:
+        paths: Files or directories the model was loaded from
+
+    Returns:
+        Hex digest identifying this model build
+    """
+    digest = hashlib.sha256(torch.__version__.encode())
+
+    for path in sorted(Path(p) for p in paths):
+        files = sorted(path.rglob("*")) if path.is_dir() else [path]
+        for file in files:
+            if file.is_file():
+                stat = file.stat()
+                digest.update(f"{file.name}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+
+    return digest.hexdigest()[:16]
+
+
+def load_or_quantize_int8(
+    model: nn.Module,
+    name: str,
+    fingerprint: str,
+    cache_dir: Optional[Path] = None
+) -> nn.Module:
+    """
+    Return an int8 version of a model, using the on-disk cache when possible.
+
+    Args:
+        model: fp32 model to quantize on a cache miss
+        name: Model name used in the cache file name
+        fingerprint: Fingerprint of the fp32 weights (see model_fingerprint)
+        cache_dir: Directory for cached artifacts (None disables caching)
+
+    Returns:
+        Quantized model
+    """
+    cache_file = None
+    if cache_dir is not None:
+        cache_file = Path(cache_dir) / f"{name}-int8-{fingerprint}.pt"
+
+        if cache_file.exists():
+            try:
+                quantized = torch.load(cache_file, map_location="cpu", weights_only=False)
+                quantized.eval()
+                logger.info(f"Loaded cached int8 {name} model from {cache_file}")
+                return quantized
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable quantization cache {cache_file}: {e}")
+
+    logger.info(f"Quantizing {name} model to int8...")
+    quantized = quantize_int8(model)
+
+    if cache_file is not None:
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = cache_file.with_suffix(".tmp")
+            torch.save(quantized, tmp_file)
+            tmp_file.replace(cache_file)
+            logger.info(f"Cached int8 {name} model at {cache_file}")
+        except Exception as e:
+            logger.warning(f"Failed to cache int8 {name} model: {e}")
+
+    return quantized
+
+
+def parameter_bytes(model: nn.Module) -> int:
+    """
+    Get the in-memory size of a model's weights, including packed int8 weights.
+
+    Args:
+        model: Model to measure
+
+    Returns:
+        Size in bytes
+    """
+    state = model.state_dict()
+    total = 0
+    for value in state.values():
+        if isinstance(value, torch.Tensor):
+            total += value.numel() * value.element_size()
+        elif isinstance(value, tuple):
+            # Packed dynamic-quantized linear params: (weight, bias)
+            total += sum(
+                v.numel() * v.element_size()
+                for v in value
+                if isinstance(v, torch.Tensor)
+            )
+    return total
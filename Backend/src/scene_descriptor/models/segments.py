@@ -0,0 +1,261 @@
+"""
+Segmenting long videos for dense timeline captioning.
+
+Splits a video into fixed-length or scene-detected segments and reads
+the sampled frames of one segment at a time, so memory is bounded by one
+clip per segment in flight regardless of video length.
+"""
+
+from dataclasses import dataclass
+from fractions import Fraction
+from pathlib import Path
+from typing import Iterator, Optional
+
+import av
+import numpy as np
+
+from ..config import HP
+from ..utils.exceptions import FrameSamplingError, VideoReadError
+from ..utils.logging import get_logger
+from .keyframes import thumbnail
+from .processor import _read_frames_at_times
+
+logger = get_logger(__name__)
+
+# Mean absolute thumbnail difference (luma in [0, 1]) that counts as a cut
+SCENE_THRESHOLD = 0.12
+
+# Size of the grey frames analysed for scene cuts (width, height)
+SCENE_ANALYSIS_SIZE = (64, 48)
+
+
+@dataclass(frozen=True)
+class VideoSegment:
+    """
+    A time range of a video captioned as one clip.
+
+    start and end are seconds from the start of the video, as players
+    show them; offset is the media time (pts) of that start.
+    """
+
+    video_path: Path
+    index: int
+    start: float
+    end: float
+    offset: float = 0.0
+
+    @property
+    def duration(self) -> float:
+        """Segment length in seconds."""
+        return self.end - self.start
+
+
+def _stream_start(stream) -> float:
+    """Media time of a stream's first frame in seconds."""
+    if stream.start_time is None or stream.time_base is None:
+        return 0.0
+    return float(stream.start_time * stream.time_base)
+
+
+def _configure_threads(stream, threads: Optional[int]) -> None:
+    """Enable codec frame/slice threading (None keeps the default)."""
+    if threads is not None:
+        stream.thread_type = "AUTO"
+        stream.codec_context.thread_count = threads
+
+
+def video_duration(video_path: str) -> float:
+    """
+    Get a video's duration in seconds.
+
+    Uses stream or container metadata, falling back to the end of the
+    last packet for files without it.
+
+    Args:
+        video_path: Path to the video file
+
+    Returns:
+        Duration in seconds
+
+    Raises:
+        VideoReadError: If the video cannot be read or is empty
+    """
+    try:
+        with av.open(str(video_path)) as container:
+            stream = container.streams.video[0]
+            if stream.duration and stream.time_base:
+                return float(stream.duration * stream.time_base)
+            if container.duration:
+                return container.duration / av.time_base
+
+            start = _stream_start(stream)
+            end = 0.0
+            for packet in container.demux(stream):
+                if packet.pts is not None:
+                    end = max(end, float((packet.pts + (packet.duration or 0)) * stream.time_base))
+    except Exception as e:
+        raise VideoReadError(f"Failed to read duration of {video_path}: {e}", cause=e)
+
+    if end <= start:
+        raise VideoReadError(f"No video frames in {video_path}")
+    return end - start
+
+
+def fixed_segments(video_path: Path, segment_seconds: float) -> Iterator[VideoSegment]:
+    """
+    Split a video into equal segments (the last one may be shorter).
+
+    Args:
+        video_path: Path to the video file
+        segment_seconds: Segment length
+
+    Yields:
+        Segments in time order
+    """
+    if segment_seconds <= 0:
+        raise FrameSamplingError(f"Invalid segment length: {segment_seconds}")
+
+    duration = video_duration(str(video_path))
+    try:
+        with av.open(str(video_path)) as container:
+            offset = _stream_start(container.streams.video[0])
+    except Exception as e:
+        raise VideoReadError(f"Failed to open video {video_path}: {e}", cause=e)
+
+    count = max(1, int(np.ceil(duration / segment_seconds - 1e-6)))
+    for index in range(count):
+        yield VideoSegment(
+            video_path=Path(video_path),
+            index=index,
+            start=index * segment_seconds,
+            end=min(duration, (index + 1) * segment_seconds),
+            offset=offset,
+        )
+
+
+def scene_segments(
+    video_path: Path,
+    min_seconds: float = 2.0,
+    max_seconds: float = 30.0,
+    threshold: float = SCENE_THRESHOLD,
+    threads: Optional[int] = 0
+) -> Iterator[VideoSegment]:
+    """
+    Split a video at scene cuts, yielding each segment as soon as it ends.
+
+    Decodes the video once, comparing small grey thumbnails of consecutive
+    frames. A cut is a difference above threshold at least min_seconds
+    after the segment started; segments are also cut at max_seconds so
+    long static shots still get several captions.
+
+    Args:
+        video_path: Path to the video file
+        min_seconds: Shortest segment
+        max_seconds: Longest segment
+        threshold: Thumbnail difference that counts as a cut
+        threads: Codec threads (0 lets the codec choose; None keeps the default)
+
+    Yields:
+        Segments in time order
+
+    Raises:
+        VideoReadError: If the video cannot be read
+    """
+    width, height = SCENE_ANALYSIS_SIZE
+    index = 0
+    offset: Optional[float] = None
+    start = 0.0
+    previous: Optional[np.ndarray] = None
+    position = 0.0
+    frame_duration = 0.0
+
+    try:
+        container = av.open(str(video_path))
+    except Exception as e:
+        raise VideoReadError(f"Failed to open video {video_path}: {e}", cause=e)
+
+    try:
+        stream = container.streams.video[0]
+        _configure_threads(stream, threads)
+        rate = stream.average_rate or stream.guessed_rate
+        frame_duration = float(1 / Fraction(rate)) if rate else 0.0
+
+        for frame in container.decode(stream):
+            if frame.pts is None:
+                continue
+            if offset is None:
+                offset = min(_stream_start(stream), float(frame.pts * stream.time_base))
+            position = float(frame.pts * stream.time_base) - offset
+
+            luma = frame.reformat(width=width, height=height, format="gray").to_ndarray()
+            thumb = thumbnail(luma.astype(np.float32) * (1.0 / 255.0))
+
+            length = position - start
+            cut = (
+                previous is not None
+                and length >= min_seconds
+                and float(np.abs(thumb - previous).mean()) > threshold
+            )
+            if cut or length >= max_seconds:
+                yield VideoSegment(Path(video_path), index, start, position, offset)
+                index += 1
+                start = position
+            previous = thumb
+
+    except Exception as e:
+        raise VideoReadError(f"Failed to scan {video_path} for scenes: {e}", cause=e)
+    finally:
+        container.close()
+
+    if offset is None:
+        raise VideoReadError(f"No frames decoded from {video_path}")
+    yield VideoSegment(Path(video_path), index, start, position + frame_duration, offset)
+
+
+def read_segment_frames(
+    segment: VideoSegment,
+    num_samples: int = HP.CLIP_LENGTH,
+    threads: Optional[int] = None
+) -> np.ndarray:
+    """
+    Read num_samples frames spread evenly over one segment.
+
+    Seeks to the keyframe before the segment and decodes forward only
+    within it, so segments can be read in parallel and out of order.
+
+    Args:
+        segment: Segment to read
+        num_samples: Frames to sample (taken at the centres of equal bins)
+        threads: Codec threads (0 lets the codec choose; None keeps the default)
+
+    Returns:
+        Array of sampled frames (num_samples, H, W, C) in RGB
+
+    Raises:
+        VideoReadError: If the segment cannot be read
+    """
+    step = max(segment.duration, 1e-3) / num_samples
+    targets = segment.offset + segment.start + step * (np.arange(num_samples) + 0.5)
+
+    try:
+        container = av.open(str(segment.video_path))
+    except Exception as e:
+        raise VideoReadError(f"Failed to open video {segment.video_path}: {e}", cause=e)
+
+    try:
+        stream = container.streams.video[0]
+        _configure_threads(stream, threads)
+        frames = _read_frames_at_times(container, stream, targets)
+    except Exception as e:
+        raise VideoReadError(
+            f"Failed to read segment {segment.index} of {segment.video_path}: {e}", cause=e
+        )
+    finally:
+        container.close()
+
+    if not frames:
+        raise VideoReadError(f"No frames decoded for segment {segment.index} of {segment.video_path}")
+
+    # Pad with the last frame if the stream ended early
+    frames.extend([frames[-1]] * (num_samples - len(frames)))
+    return np.stack(frames)
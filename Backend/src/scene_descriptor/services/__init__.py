@@ -2,10 +2,92 @@
 
 from .caption_service import CaptionService, get_caption_service
 from .video_service import VideoService, get_video_service
+from .job_service import CaptionJob, JobService, get_job_service, shutdown_job_service
+from .capacity_service import CapacitySnapshot, get_capacity_snapshot, readiness_problems
+from .admission_service import AdmissionDecision, check_admission, is_priority_token
+from .degradation_service import (
+    DegradationController,
+    DegradationLevel,
+    build_ladder,
+    get_degradation_controller,
+)
+from .cache_service import CacheStats, CaptionCache
+from .batch_service import BatchCaptionPipeline, ClipResult, StageTimings
+from .caption_client_service import CaptionServerClient
+from .clip_store_service import ClipStore, caption_clip_store, prepare_clip_store
+from .timeline_service import (
+    TimelineCue,
+    build_cues,
+    caption_timeline,
+    render_srt,
+    render_webvtt,
+    write_timeline,
+)
+from .work_queue_service import (
+    LeaseHeartbeat,
+    QueueProgress,
+    WorkItem,
+    WorkQueue,
+    default_worker_id,
+)
+from .output_service import (
+    ResultWriter,
+    CsvResultWriter,
+    JsonlResultWriter,
+    ParquetResultWriter,
+    error_log_path,
+    error_record,
+    infer_output_format,
+    open_result_writer,
+    result_record,
+)
 
 __all__ = [
     "CaptionService",
     "get_caption_service",
     "VideoService",
     "get_video_service",
+    "CaptionJob",
+    "JobService",
+    "get_job_service",
+    "shutdown_job_service",
+    "CapacitySnapshot",
+    "get_capacity_snapshot",
+    "readiness_problems",
+    "AdmissionDecision",
+    "check_admission",
+    "is_priority_token",
+    "DegradationController",
+    "DegradationLevel",
+    "build_ladder",
+    "get_degradation_controller",
+    "CacheStats",
+    "CaptionCache",
+    "BatchCaptionPipeline",
+    "ClipResult",
+    "StageTimings",
+    "CaptionServerClient",
+    "ClipStore",
+    "caption_clip_store",
+    "prepare_clip_store",
+    "TimelineCue",
+    "build_cues",
+    "caption_timeline",
+    "render_srt",
+    "render_webvtt",
+    "write_timeline",
+    "LeaseHeartbeat",
+    "QueueProgress",
+    "WorkItem",
+    "WorkQueue",
+    "default_worker_id",
+    "ResultWriter",
+    "CsvResultWriter",
+    "JsonlResultWriter",
+    "ParquetResultWriter",
+    "error_log_path",
+    "error_record",
+    "infer_output_format",
+    "open_result_writer",
+    "result_record",
 ]
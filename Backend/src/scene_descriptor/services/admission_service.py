@@ -0,0 +1,97 @@
+"""
+Admission control for new WebRTC sessions.
+
+Decides whether a new offer can be accepted without pushing existing
+sessions past their latency budget, keeping some session slots reserved
+for priority users.
+"""
+
+import hmac
+import math
+from dataclasses import dataclass
+from typing import Optional
+
+from .capacity_service import CapacitySnapshot, get_capacity_snapshot
+from ..config import settings
+from ..utils.logging import get_logger
+from ..utils.metrics import get_metrics
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class AdmissionDecision:
+    """Result of an admission check."""
+
+    admitted: bool
+    reason: Optional[str] = None
+    retry_after: int = 0
+
+
+def is_priority_token(token: Optional[str]) -> bool:
+    """
+    Check a client-supplied token against settings.priority_tokens.
+
+    Args:
+        token: Token from the request (may be None)
+
+    Returns:
+        True if the token grants priority admission
+    """
+    if not token:
+        return False
+    return any(
+        # Compare bytes: compare_digest rejects non-ASCII str
+        hmac.compare_digest(token.encode("utf-8"), candidate.encode("utf-8"))
+        for candidate in settings.priority_token_list
+    )
+
+
+def _retry_after(snapshot: CapacitySnapshot) -> int:
+    """Suggest a Retry-After delay: at least the configured value, or one p95 caption."""
+    latency = snapshot.p95_caption_latency or 0
+    return max(settings.admission_retry_after, math.ceil(latency))
+
+
+def check_admission(priority: bool = False) -> AdmissionDecision:
+    """
+    Decide whether a new session may start.
+
+    Regular sessions are limited to settings.regular_session_limit
+    (max_sessions minus the reserved priority slots) and are shed when the inference backlog or recent
+    latency is over budget. Priority sessions may use the reserved slots
+    and are not shed on backlog or latency.
+
+    Args:
+        priority: Whether the request carries a valid priority token
+
+    Returns:
+        AdmissionDecision
+    """
+    snapshot = get_capacity_snapshot()
+    metrics = get_metrics()
+    reason = None
+
+    if not snapshot.model_ready:
+        reason = "models not ready"
+    elif priority:
+        if snapshot.active_sessions >= settings.max_sessions:
+            reason = f"session limit reached ({snapshot.active_sessions}/{settings.max_sessions})"
+    else:
+        regular_limit = settings.regular_session_limit
+        latency = snapshot.p95_caption_latency
+
+        if snapshot.active_sessions >= regular_limit:
+            reason = f"session limit reached ({snapshot.active_sessions}/{regular_limit})"
+        elif snapshot.queue_depth > settings.admission_max_queue_depth:
+            reason = f"inference backlog {snapshot.queue_depth} > {settings.admission_max_queue_depth}"
+        elif latency is not None and latency > settings.admission_max_p95_latency:
+            reason = f"p95 caption latency {latency:.2f}s > {settings.admission_max_p95_latency:.2f}s"
+
+    if reason:
+        metrics.increment("offers_rejected")
+        logger.warning(f"Rejecting offer (priority={priority}): {reason}")
+        return AdmissionDecision(admitted=False, reason=reason, retry_after=_retry_after(snapshot))
+
+    metrics.increment("offers_admitted")
+    return AdmissionDecision(admitted=True)
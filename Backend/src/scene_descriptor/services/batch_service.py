@@ -0,0 +1,452 @@
+"""
+Pipelined captioning for batches of video files.
+
+Decoder workers read and preprocess clips in parallel with codec
+threading enabled, a bounded prefetch queue hands ready clips to the
+inference loop, and clips from several videos share one generate call.
+Decoding the next clips overlaps with inference on the current batch.
+"""
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from ..config import HP, settings
+from ..models import (
+    PRIORITY_BACKGROUND,
+    VideoSegment,
+    convert_frames_to_av,
+    read_sampled_frames,
+    read_segment_frames,
+)
+from ..utils.logging import get_logger
+from .cache_service import CaptionCache, sampling_config
+
+logger = get_logger(__name__)
+
+# Pipeline stages reported by StageTimings
+STAGES = ("decode", "preprocess", "queue_wait", "inference")
+
+# Marks the end of the decoded clip stream
+_DONE = object()
+
+# A whole video file (sampled across its length) or one segment of a video
+ClipSource = Union[Path, VideoSegment]
+
+
+def default_decode_workers() -> int:
+    """Decoder workers to use when none are configured (half the cores, 1-4)."""
+    return max(1, min(4, (os.cpu_count() or 2) // 2))
+
+
+@dataclass
+class ClipResult:
+    """Outcome of captioning one video (or one segment of it)."""
+
+    video_path: Path
+    caption: Optional[str] = None
+    error: Optional[str] = None
+    cached: bool = False
+    segment: Optional[VideoSegment] = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether a caption was produced."""
+        return self.caption is not None
+
+
+@dataclass
+class _ReadyClip:
+    """A preprocessed clip waiting for inference."""
+
+    source: ClipSource
+    pixel_values: Any
+    ready_at: float
+    cache_key: Optional[str] = None
+    model_id: str = ""
+
+
+def _result(source: ClipSource, **fields) -> ClipResult:
+    """Build the ClipResult for a file or segment."""
+    if isinstance(source, VideoSegment):
+        return ClipResult(source.video_path, segment=source, **fields)
+    return ClipResult(source, **fields)
+
+
+class StageTimings:
+    """Thread-safe totals of time spent in each pipeline stage."""
+
+    def __init__(self):
+        """Initialize empty totals."""
+        self._totals: Dict[str, float] = {stage: 0.0 for stage in STAGES}
+        self._counts: Dict[str, int] = {stage: 0 for stage in STAGES}
+        self._lock = threading.Lock()
+
+    def add(self, stage: str, seconds: float, count: int = 1) -> None:
+        """
+        Record time spent in a stage.
+
+        Args:
+            stage: One of STAGES
+            seconds: Time spent
+            count: Number of clips (or batches) the time covers
+        """
+        with self._lock:
+            self._totals[stage] += seconds
+            self._counts[stage] += count
+
+    def to_dict(self) -> dict:
+        """Get total and mean seconds per stage."""
+        with self._lock:
+            return {
+                stage: {
+                    "total": self._totals[stage],
+                    "count": self._counts[stage],
+                    "mean": self._totals[stage] / self._counts[stage] if self._counts[stage] else 0.0,
+                }
+                for stage in STAGES
+            }
+
+    def summary(self, wall_seconds: float, videos: int) -> List[str]:
+        """
+        Format a per-stage timing report.
+
+        Stage totals are summed over workers, so decode and preprocess
+        can exceed wall time when they run in parallel.
+
+        Args:
+            wall_seconds: Elapsed time of the whole run
+            videos: Number of videos processed
+
+        Returns:
+            Report lines
+        """
+        lines = []
+        for stage, stats in self.to_dict().items():
+            lines.append(
+                f"{stage:<11} total {stats['total']:8.2f}s  "
+                f"mean {stats['mean']:.3f}s over {stats['count']}"
+            )
+        rate = videos / wall_seconds if wall_seconds > 0 else 0.0
+        lines.append(f"{'wall':<11} total {wall_seconds:8.2f}s  ({rate:.2f} videos/s)")
+        return lines
+
+
+class BatchCaptionPipeline:
+    """
+    Captions video files with decoding overlapped with batched inference.
+
+    A feeder thread submits videos to a pool of decoder workers. At most
+    `prefetch` clips are decoded or waiting at any time, so memory stays
+    bounded however long the input list is. The calling thread takes
+    whatever clips are ready, up to batch_size, and captions them together;
+    it never waits to fill a batch while clips are still decoding.
+
+    Sources are video files, sampled across their whole length, or
+    VideoSegments, sampled within the segment; segments of one video are
+    decoded in parallel like separate files.
+
+    With a CaptionCache, decoder workers look each source up first; hits
+    skip decoding and inference and new captions are stored.
+
+    preprocess() runs the decode stage alone, for writing clip stores.
+
+    Inside the server, pass the shared InferencePool so batches queue
+    behind live sessions instead of competing with them for the cores.
+    """
+
+    def __init__(
+        self,
+        model_manager,
+        batch_size: int = 4,
+        decode_workers: Optional[int] = None,
+        prefetch: int = 8,
+        codec_threads: int = 0,
+        max_length: Optional[int] = None,
+        frame_hook: Optional[Callable[[Path, np.ndarray], None]] = None,
+        cache: Optional[CaptionCache] = None,
+        inference_pool=None,
+        inference_priority: int = PRIORITY_BACKGROUND
+    ):
+        """
+        Initialize the pipeline.
+
+        Args:
+            model_manager: Initialized ModelManager
+            batch_size: Most clips captioned in one generate call
+            decode_workers: Parallel decoder workers (default: half the cores, 1-4)
+            prefetch: Most clips decoded ahead of inference
+            codec_threads: Threads per decoder (0 lets the codec choose)
+            max_length: Maximum caption length (uses settings default if None)
+            frame_hook: Called from the decoder worker with each whole file's sampled frames
+            cache: Caption cache to read and fill (None disables caching)
+            inference_pool: Run generate calls on this InferencePool (None runs them inline)
+            inference_priority: Pool priority of the generate calls
+        """
+        self._model_manager = model_manager
+        self._batch_size = max(1, batch_size)
+        self._decode_workers = decode_workers or default_decode_workers()
+        self._prefetch = max(self._batch_size, prefetch)
+        self._codec_threads = codec_threads
+        self._max_length = max_length
+        self._frame_hook = frame_hook
+        self._cache = cache
+        self._inference_pool = inference_pool
+        self._inference_priority = inference_priority
+
+        self.timings = StageTimings()
+
+    @property
+    def cache(self) -> Optional[CaptionCache]:
+        """Caption cache in use, if any."""
+        return self._cache
+
+    def _cache_key(self, source: ClipSource, model_id: str) -> Optional[str]:
+        """Cache key for a file or segment, or None if there is no usable cache."""
+        if self._cache is None:
+            return None
+
+        video_path = source.video_path if isinstance(source, VideoSegment) else source
+        sampling = sampling_config()
+        if isinstance(source, VideoSegment):
+            sampling += f":segment:{source.start:.3f}-{source.end:.3f}"
+
+        try:
+            return self._cache.key_for(
+                video_path,
+                model_id,
+                self._max_length or settings.max_caption_length,
+                sampling
+            )
+        except Exception as e:
+            logger.warning(f"Caption cache unavailable for {video_path}: {e}")
+            return None
+
+    def _decode(
+        self,
+        source: ClipSource,
+        cache_key: Optional[str] = None,
+        model_id: str = "",
+        return_numpy: bool = False
+    ) -> _ReadyClip:
+        """Read, sample and preprocess one file or segment (runs in a decoder worker)."""
+        start_time = time.perf_counter()
+        if isinstance(source, VideoSegment):
+            frames = read_segment_frames(source, HP.CLIP_LENGTH, threads=self._codec_threads)
+        else:
+            frames = read_sampled_frames(str(source), HP.CLIP_LENGTH, threads=self._codec_threads)
+        decoded_at = time.perf_counter()
+        self.timings.add("decode", decoded_at - start_time)
+
+        if self._frame_hook is not None and not isinstance(source, VideoSegment):
+            self._frame_hook(source, frames)
+
+        preprocess_start = time.perf_counter()
+        pixel_values = self._model_manager.preprocess_frames(
+            convert_frames_to_av(frames), return_numpy=return_numpy
+        )
+        ready_at = time.perf_counter()
+        self.timings.add("preprocess", ready_at - preprocess_start)
+
+        return _ReadyClip(source, pixel_values, ready_at, cache_key, model_id)
+
+    def _feed(
+        self,
+        sources: Iterable[ClipSource],
+        ready: queue.Queue,
+        slots: threading.Semaphore,
+        stop: threading.Event,
+        preprocess_only: bool = False
+    ) -> None:
+        """Submit sources to the decoder pool as prefetch slots free up."""
+
+        def decode_into_queue(source: ClipSource) -> None:
+            try:
+                # Read per clip: /change_model may swap the model mid-run
+                model_id = self._model_manager.model_identity if self._cache is not None else ""
+                cache_key = None if preprocess_only else self._cache_key(source, model_id)
+                if cache_key is not None:
+                    caption = self._cache.get(cache_key)
+                    if caption is not None:
+                        ready.put(_result(source, caption=caption, cached=True))
+                        return
+                ready.put(self._decode(source, cache_key, model_id, return_numpy=preprocess_only))
+            except Exception as e:
+                logger.error(f"Failed to decode {source}: {e}")
+                ready.put(_result(source, error=str(e)))
+
+        with ThreadPoolExecutor(
+            max_workers=self._decode_workers,
+            thread_name_prefix="batch-decode"
+        ) as executor:
+            try:
+                for source in sources:
+                    while not slots.acquire(timeout=0.1):
+                        if stop.is_set():
+                            break
+                    if stop.is_set():
+                        executor.shutdown(wait=False, cancel_futures=True)
+                        break
+                    if not isinstance(source, VideoSegment):
+                        source = Path(source)
+                    executor.submit(decode_into_queue, source)
+            except Exception as e:
+                # A failing source iterator (e.g. scene detection) is raised in run()
+                ready.put(e)
+
+        ready.put(_DONE)
+
+    def _caption(self, batch: List[_ReadyClip]) -> List[ClipResult]:
+        """Caption a batch of ready clips in one generate call."""
+        start_time = time.perf_counter()
+        for clip in batch:
+            self.timings.add("queue_wait", start_time - clip.ready_at)
+
+        model_id = self._model_manager.model_identity if self._cache is not None else ""
+        try:
+            pixel_values = self._model_manager.stack_clips([clip.pixel_values for clip in batch])
+            if self._inference_pool is not None:
+                captions = self._inference_pool.submit_with_priority(
+                    self._inference_priority,
+                    self._model_manager.generate_captions,
+                    pixel_values,
+                    self._max_length,
+                    priority=self._inference_priority
+                ).result()
+            else:
+                captions = self._model_manager.generate_captions(
+                    pixel_values, self._max_length, priority=self._inference_priority
+                )
+        except Exception as e:
+            logger.error(f"Failed to caption batch of {len(batch)}: {e}")
+            return [_result(clip.source, error=str(e)) for clip in batch]
+        finally:
+            self.timings.add("inference", time.perf_counter() - start_time, len(batch))
+
+        if self._cache is not None and self._model_manager.model_identity != model_id:
+            # The model changed during generate; the captions could be from either
+            logger.warning(f"Model changed while captioning a batch of {len(batch)}; not caching it")
+            return [_result(clip.source, caption=caption) for clip, caption in zip(batch, captions)]
+
+        for clip, caption in zip(batch, captions):
+            if clip.cache_key is None:
+                continue
+            # The clip was looked up under the model it was decoded for
+            cache_key = clip.cache_key if clip.model_id == model_id else self._cache_key(clip.source, model_id)
+            if cache_key is None:
+                continue
+            try:
+                self._cache.put(cache_key, caption, model_id)
+            except Exception as e:
+                logger.warning(f"Failed to cache caption for {clip.source}: {e}")
+
+        return [_result(clip.source, caption=caption) for clip, caption in zip(batch, captions)]
+
+    def _ready_groups(
+        self,
+        sources: Iterable[ClipSource],
+        preprocess_only: bool = False
+    ) -> Iterator[List[Union[_ReadyClip, ClipResult]]]:
+        """
+        Decode sources in the background, yielding up to batch_size ready items at a time.
+
+        Blocks for one item, then takes whatever else is already decoded;
+        never waits to fill a group while clips are still decoding.
+        """
+        ready: queue.Queue = queue.Queue()
+        slots = threading.Semaphore(self._prefetch)
+        stop = threading.Event()
+        feeder = threading.Thread(
+            target=self._feed,
+            args=(sources, ready, slots, stop, preprocess_only),
+            name="batch-feed",
+            daemon=True
+        )
+        feeder.start()
+
+        logger.info(
+            f"Batch pipeline: {self._decode_workers} decoder(s), batch size {self._batch_size}, "
+            f"prefetch {self._prefetch}"
+        )
+
+        try:
+            done = False
+            while not done:
+                items = [ready.get()]
+                while len(items) < self._batch_size:
+                    try:
+                        items.append(ready.get_nowait())
+                    except queue.Empty:
+                        break
+
+                group: List[Union[_ReadyClip, ClipResult]] = []
+                for item in items:
+                    if item is _DONE:
+                        done = True
+                        continue
+                    if isinstance(item, Exception):
+                        raise item
+                    slots.release()
+                    group.append(item)
+
+                if group:
+                    yield group
+        finally:
+            stop.set()
+
+    def run(self, videos: Iterable[ClipSource]) -> Iterator[ClipResult]:
+        """
+        Caption videos or segments, yielding results as batches finish.
+
+        Results arrive in completion order, not input order. Sources that
+        fail to decode or caption yield a ClipResult with an error; an
+        exception raised by the videos iterator itself is re-raised here.
+
+        Args:
+            videos: Video file paths or VideoSegments
+
+        Yields:
+            One ClipResult per source
+        """
+        for group in self._ready_groups(videos):
+            batch: List[_ReadyClip] = []
+            for item in group:
+                if isinstance(item, ClipResult):
+                    yield item
+                else:
+                    batch.append(item)
+
+            if batch:
+                yield from self._caption(batch)
+
+    def preprocess(
+        self,
+        videos: Iterable[ClipSource]
+    ) -> Iterator[Tuple[ClipSource, Optional[np.ndarray], Optional[str]]]:
+        """
+        Decode and preprocess videos or segments without captioning them.
+
+        Uses the same decoder pool and prefetch bound as run(); the cache
+        is not consulted. Only the processor needs to be loaded.
+
+        Args:
+            videos: Video file paths or VideoSegments
+
+        Yields:
+            (source, pixel_values, error) in completion order; pixel_values is a
+            float32 array (1, frames, 3, H, W), or None with the error if decoding failed
+        """
+        for group in self._ready_groups(videos, preprocess_only=True):
+            for item in group:
+                if isinstance(item, ClipResult):
+                    source = item.segment or item.video_path
+                    yield source, None, item.error
+                else:
+                    yield item.source, item.pixel_values, None
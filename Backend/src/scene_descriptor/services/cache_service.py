@@ -0,0 +1,275 @@
+"""
+Content-addressed caption cache for offline captioning.
+
+Captions are stored in SQLite under settings.data_dir, keyed by a hash
+of the video's bytes plus everything that changes the caption: model
+identity, frame sampling and max_length. Renamed or duplicate files hit
+the same entry; unchanged files are not even re-hashed, because content
+hashes are memoized by path, size and modification time.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Optional
+
+from ..config import HP, settings
+from ..utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Bump when frame sampling changes in a way that changes captions
+SAMPLING_VERSION = "linspace-v1"
+
+# Read size for content hashing
+HASH_CHUNK_BYTES = 1 << 20
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS captions (
+    key TEXT PRIMARY KEY,
+    model_id TEXT NOT NULL,
+    caption TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS captions_last_used ON captions (last_used);
+CREATE TABLE IF NOT EXISTS file_hashes (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    content_hash TEXT NOT NULL
+);
+"""
+
+
+def sampling_config(num_samples: int = HP.CLIP_LENGTH) -> str:
+    """Describe how frames are sampled, as part of the cache key."""
+    return f"{SAMPLING_VERSION}:{num_samples}"
+
+
+def hash_file(path: Path) -> str:
+    """
+    Hash a file's contents (BLAKE2b, 128-bit).
+
+    Args:
+        path: File to hash
+
+    Returns:
+        Hex digest
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        while chunk := f.read(HASH_CHUNK_BYTES):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@dataclass
+class CacheStats:
+    """Size and usage of the caption cache."""
+
+    path: str
+    entries: int
+    models: Dict[str, int]
+    lifetime_hits: int
+    file_bytes: int
+    session_hits: int
+    session_misses: int
+
+    def to_dict(self) -> dict:
+        """Convert to a JSON-serializable dictionary."""
+        return asdict(self)
+
+
+class CaptionCache:
+    """
+    SQLite store of captions keyed by content and caption settings.
+
+    Safe to share between threads; all access goes through one
+    connection under a lock.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            path: Database file (default: <DATA_DIR>/caption_cache.sqlite3)
+        """
+        self.path = Path(path or settings.caption_cache_path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def content_hash(self, video_path: Path) -> str:
+        """
+        Get a file's content hash, reusing the stored one if the file is unchanged.
+
+        Args:
+            video_path: Video file
+
+        Returns:
+            Hex digest of the file's contents
+        """
+        path = str(Path(video_path).resolve())
+        stat = os.stat(path)
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT size, mtime_ns, content_hash FROM file_hashes WHERE path = ?", (path,)
+            ).fetchone()
+        if row and row[0] == stat.st_size and row[1] == stat.st_mtime_ns:
+            return row[2]
+
+        content_hash = hash_file(Path(path))
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO file_hashes (path, size, mtime_ns, content_hash) VALUES (?, ?, ?, ?)",
+                (path, stat.st_size, stat.st_mtime_ns, content_hash)
+            )
+        return content_hash
+
+    def key_for(
+        self,
+        video_path: Path,
+        model_id: str,
+        max_length: int,
+        sampling: Optional[str] = None
+    ) -> str:
+        """
+        Build the cache key for captioning a file with given settings.
+
+        Args:
+            video_path: Video file
+            model_id: ModelManager.model_identity
+            max_length: Maximum caption length
+            sampling: Frame sampling description (default: sampling_config())
+
+        Returns:
+            Cache key
+        """
+        parts = [self.content_hash(video_path), model_id, sampling or sampling_config(), str(max_length)]
+        return hashlib.sha256("|".join(parts).encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a caption and mark it used.
+
+        Args:
+            key: Key from key_for()
+
+        Returns:
+            Cached caption, or None on a miss
+        """
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT caption FROM captions WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE captions SET last_used = ?, hits = hits + 1 WHERE key = ?",
+                (time.time(), key)
+            )
+            self.hits += 1
+            return row[0]
+
+    def put(self, key: str, caption: str, model_id: str = "") -> None:
+        """
+        Store a caption.
+
+        Args:
+            key: Key from key_for()
+            caption: Generated caption
+            model_id: Model identity, kept for stats and pruning
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO captions (key, model_id, caption, created_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, model_id, caption, now, now)
+            )
+
+    def stats(self) -> CacheStats:
+        """Get cache size and hit counts."""
+        with self._lock:
+            entries, hits = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(hits), 0) FROM captions"
+            ).fetchone()
+            models = dict(self._conn.execute(
+                "SELECT model_id, COUNT(*) FROM captions GROUP BY model_id"
+            ).fetchall())
+
+        file_bytes = sum(
+            p.stat().st_size for p in self.path.parent.glob(self.path.name + "*") if p.is_file()
+        )
+        return CacheStats(
+            path=str(self.path),
+            entries=entries,
+            models=models,
+            lifetime_hits=hits,
+            file_bytes=file_bytes,
+            session_hits=self.hits,
+            session_misses=self.misses,
+        )
+
+    def prune(
+        self,
+        older_than_days: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        keep_model: Optional[str] = None
+    ) -> int:
+        """
+        Remove cache entries and forget hashes of files that no longer exist.
+
+        Args:
+            older_than_days: Drop entries not used for this many days
+            max_entries: Keep at most this many entries, dropping least recently used
+            keep_model: Drop entries from every other model identity
+
+        Returns:
+            Number of caption entries removed
+        """
+        removed = 0
+        with self._lock, self._conn:
+            if older_than_days is not None:
+                cutoff = time.time() - older_than_days * 86400
+                removed += self._conn.execute(
+                    "DELETE FROM captions WHERE last_used < ?", (cutoff,)
+                ).rowcount
+            if keep_model is not None:
+                removed += self._conn.execute(
+                    "DELETE FROM captions WHERE model_id != ?", (keep_model,)
+                ).rowcount
+            if max_entries is not None:
+                removed += self._conn.execute(
+                    "DELETE FROM captions WHERE key NOT IN "
+                    "(SELECT key FROM captions ORDER BY last_used DESC LIMIT ?)",
+                    (max_entries,)
+                ).rowcount
+
+            paths = [row[0] for row in self._conn.execute("SELECT path FROM file_hashes")]
+            missing = [(path,) for path in paths if not os.path.exists(path)]
+            self._conn.executemany("DELETE FROM file_hashes WHERE path = ?", missing)
+
+        with self._lock:
+            self._conn.execute("VACUUM")
+
+        logger.info(f"Pruned {removed} cached captions and {len(missing)} stale file hashes")
+        return removed
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            self._conn.close()
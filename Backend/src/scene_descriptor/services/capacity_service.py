@@ -0,0 +1,91 @@
+"""
+Capacity reporting service.
+
+Summarizes current load (sessions, inference backlog, recent latency)
+so readiness checks and load control make decisions from the same data.
+"""
+
+from dataclasses import asdict, dataclass
+from typing import List, Optional
+
+from ..config import settings
+from ..models import get_inference_pool, get_model_manager
+from ..utils.metrics import get_metrics
+
+
+@dataclass
+class CapacitySnapshot:
+    """Point-in-time view of server load."""
+
+    model_ready: bool
+    active_sessions: int
+    max_sessions: int
+    free_sessions: int
+    inference_workers: int
+    busy_workers: int
+    queue_depth: int
+    p95_caption_latency: Optional[float]
+    p95_queue_wait: Optional[float]
+
+    def to_dict(self) -> dict:
+        """Convert to a JSON-serializable dictionary."""
+        return asdict(self)
+
+
+def get_capacity_snapshot() -> CapacitySnapshot:
+    """
+    Collect the current capacity snapshot.
+
+    Returns:
+        CapacitySnapshot with live values
+    """
+    metrics = get_metrics()
+    pool = get_inference_pool()
+    active_sessions = int(metrics.gauge("active_sessions"))
+
+    return CapacitySnapshot(
+        model_ready=get_model_manager().is_ready(),
+        active_sessions=active_sessions,
+        max_sessions=settings.max_sessions,
+        # Slots a regular client can still take, the limit check_admission applies
+        free_sessions=max(0, settings.regular_session_limit - active_sessions),
+        inference_workers=pool.num_workers,
+        busy_workers=pool.busy_workers,
+        queue_depth=pool.queue_depth,
+        p95_caption_latency=metrics.latency("caption_latency").percentile(95),
+        p95_queue_wait=metrics.latency("inference_queue_wait").percentile(95),
+    )
+
+
+def readiness_problems(snapshot: CapacitySnapshot) -> List[str]:
+    """
+    List the reasons this node should not receive new sessions.
+
+    Args:
+        snapshot: Current capacity snapshot
+
+    Returns:
+        Human-readable reasons (empty when ready)
+    """
+    problems = []
+
+    if not snapshot.model_ready:
+        problems.append("models not ready")
+
+    if snapshot.free_sessions <= 0:
+        problems.append(
+            f"session limit reached ({snapshot.active_sessions}/{settings.regular_session_limit})"
+        )
+
+    if snapshot.queue_depth > settings.ready_max_queue_depth:
+        problems.append(
+            f"inference queue depth {snapshot.queue_depth} > {settings.ready_max_queue_depth}"
+        )
+
+    latency = snapshot.p95_caption_latency
+    if latency is not None and latency > settings.ready_max_p95_latency:
+        problems.append(
+            f"p95 caption latency {latency:.2f}s > {settings.ready_max_p95_latency:.2f}s"
+        )
+
+    return problems
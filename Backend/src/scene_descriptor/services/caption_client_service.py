@@ -0,0 +1,168 @@
+"""
+Client for the caption route of a running server.
+
+Scripts use it to caption files with the server's already loaded and
+warmed model instead of loading their own. Standard library only; talks
+HTTP(S) or HTTP over the server's Unix socket.
+"""
+
+import http.client
+import json
+import socket
+import ssl
+from pathlib import Path
+from typing import Iterable, List, Optional
+from urllib.parse import urlencode, urlsplit
+
+from ..utils.exceptions import RequestError
+from ..utils.logging import get_logger
+from .batch_service import ClipResult
+
+logger = get_logger(__name__)
+
+# Seconds to wait for a response (captioning a chunk of files can take a while)
+DEFAULT_CLIENT_TIMEOUT = 600.0
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTP connection over a Unix domain socket."""
+
+    def __init__(self, socket_path: str, timeout: float):
+        super().__init__("localhost", timeout=timeout)
+        self._socket_path = socket_path
+
+    def connect(self) -> None:
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self._socket_path)
+
+
+class CaptionServerClient:
+    """Captions files through a running server's /caption route."""
+
+    def __init__(self, server: str, timeout: float = DEFAULT_CLIENT_TIMEOUT):
+        """
+        Initialize the client.
+
+        Args:
+            server: http://host:port, https://host:port (optionally with a path
+                prefix) or unix:/path/to/socket
+            timeout: Seconds to wait for each response
+        """
+        parsed = urlsplit(server)
+        if parsed.scheme not in ("http", "https", "unix"):
+            raise ValueError(f"Unsupported caption server URL: {server}")
+        if parsed.scheme == "unix" and not parsed.path:
+            raise ValueError(f"Missing socket path in caption server URL: {server}")
+
+        self._server = server
+        self._parsed = parsed
+        self._prefix = "" if parsed.scheme == "unix" else parsed.path.rstrip("/")
+        self._timeout = timeout
+
+    def _connection(self) -> http.client.HTTPConnection:
+        """Open a connection to the server."""
+        if self._parsed.scheme == "unix":
+            return _UnixHTTPConnection(self._parsed.path, self._timeout)
+        if self._parsed.scheme == "https":
+            return http.client.HTTPSConnection(
+                self._parsed.hostname, self._parsed.port, timeout=self._timeout,
+                context=ssl.create_default_context()
+            )
+        return http.client.HTTPConnection(self._parsed.hostname, self._parsed.port, timeout=self._timeout)
+
+    def _request(self, method: str, route: str, body=None, headers: Optional[dict] = None) -> dict:
+        """
+        Send one request and decode its JSON response.
+
+        Raises:
+            RequestError: If the server is unreachable or answers with an error
+        """
+        connection = self._connection()
+        try:
+            connection.request(method, self._prefix + route, body=body, headers=headers or {})
+            response = connection.getresponse()
+            payload = response.read()
+        except OSError as e:
+            raise RequestError(f"Caption server {self._server} unreachable: {e}", cause=e)
+        finally:
+            connection.close()
+
+        try:
+            data = json.loads(payload) if payload else {}
+        except json.JSONDecodeError:
+            data = {"error": payload[:200].decode("utf-8", "replace")}
+        if response.status >= 400:
+            raise RequestError(
+                f"Caption server answered {response.status}: {data.get('error', response.reason)}"
+            )
+        return data
+
+    def health(self) -> dict:
+        """Get the server's /health report (raises RequestError while it is warming up)."""
+        return self._request("GET", "/health")
+
+    def caption_paths(self, paths: Iterable[Path], max_length: Optional[int] = None) -> List[ClipResult]:
+        """
+        Caption files the server can read at the same paths.
+
+        Args:
+            paths: Video files (sent as absolute paths)
+            max_length: Maximum caption length (server default if None)
+
+        Returns:
+            ClipResult per file, in completion order
+        """
+        body = {"paths": [str(Path(path).resolve()) for path in paths]}
+        if max_length:
+            body["max_length"] = max_length
+        data = self._request(
+            "POST", "/caption",
+            body=json.dumps(body).encode("utf-8"),
+            headers={"Content-Type": "application/json"}
+        )
+        return [
+            ClipResult(
+                Path(record["path"]),
+                caption=record.get("caption"),
+                error=record.get("error"),
+                cached=bool(record.get("cached")),
+            )
+            for record in data.get("results", [])
+        ]
+
+    def caption_upload(self, path: Path, max_length: Optional[int] = None) -> ClipResult:
+        """
+        Upload a file and caption it (for servers on other hosts).
+
+        The file is streamed from disk, not read into memory.
+
+        Args:
+            path: Video file
+            max_length: Maximum caption length (server default if None)
+
+        Returns:
+            ClipResult for the file
+        """
+        path = Path(path)
+        query = {"name": path.name}
+        if max_length:
+            query["max_length"] = max_length
+
+        with open(path, "rb") as f:
+            data = self._request(
+                "POST", f"/caption?{urlencode(query)}",
+                body=f,
+                headers={
+                    "Content-Type": "application/octet-stream",
+                    "Content-Length": str(path.stat().st_size),
+                }
+            )
+
+        results = data.get("results") or [{"error": "Empty response"}]
+        return ClipResult(
+            path,
+            caption=results[0].get("caption"),
+            error=results[0].get("error"),
+            cached=bool(results[0].get("cached")),
+        )
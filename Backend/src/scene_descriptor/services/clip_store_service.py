@@ -0,0 +1,295 @@
+"""
+Persisted store of preprocessed clips for re-captioning.
+
+The prepare stage decodes, samples and preprocesses a corpus once and
+writes every clip's pixel_values into one memory-mapped array next to an
+index of the source videos. The caption stage streams batches from that
+array straight into the model, so captioning a corpus with another model
+or caption length skips decoding and preprocessing entirely.
+
+Store layout (a directory):
+    pixel_values.npy  (capacity, frames, 3, H, W) array, one row per clip
+    index.jsonl       one line per written row: row, video, path
+    errors.jsonl      videos that failed to decode
+    meta.json         shape, dtype and processor fingerprint; written last,
+                      so a store without it is incomplete
+"""
+
+import json
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from ..config import HP
+from ..models import PRIORITY_BACKGROUND
+from ..utils.logging import get_logger
+from .batch_service import BatchCaptionPipeline, ClipResult
+from .cache_service import sampling_config
+from .output_service import JsonlResultWriter, error_record
+
+logger = get_logger(__name__)
+
+STORE_ARRAY = "pixel_values.npy"
+STORE_INDEX = "index.jsonl"
+STORE_ERRORS = "errors.jsonl"
+STORE_META = "meta.json"
+
+# Layout version written to meta.json
+STORE_VERSION = 1
+
+# Element types a store can hold (float16 halves the disk footprint)
+STORE_DTYPES = ("float16", "float32")
+
+# Batches read ahead of inference by ClipStore.iter_batches()
+DEFAULT_READ_AHEAD = 2
+
+
+def prepare_clip_store(
+    directory: Path,
+    videos: Sequence[Path],
+    pipeline: BatchCaptionPipeline,
+    processor_identity: str,
+    dtype: str = "float16"
+) -> "ClipStore":
+    """
+    Decode and preprocess videos into a new clip store.
+
+    The array is sized for every video up front and filled in completion
+    order; rows of videos that fail stay unused. The array is flushed and
+    meta.json written only once all videos are done.
+
+    Args:
+        directory: Store directory (must not already hold a store)
+        videos: Video files to prepare
+        pipeline: Pipeline whose preprocess() stage produces the clips
+        processor_identity: Fingerprint of the processor producing the clips
+        dtype: Element type of the stored array (one of STORE_DTYPES)
+
+    Returns:
+        The finished store, opened for reading
+
+    Raises:
+        FileExistsError: If the directory already holds a store
+        ValueError: If dtype is unsupported
+    """
+    directory = Path(directory)
+    if dtype not in STORE_DTYPES:
+        raise ValueError(f"Unsupported clip store dtype: {dtype}")
+    if (directory / STORE_META).exists() or (directory / STORE_ARRAY).exists():
+        raise FileExistsError(f"Clip store already exists at {directory}")
+    directory.mkdir(parents=True, exist_ok=True)
+
+    array: Optional[np.memmap] = None
+    rows = 0
+    failed = 0
+    with JsonlResultWriter(directory / STORE_INDEX) as index, \
+            JsonlResultWriter(directory / STORE_ERRORS) as errors:
+        for source, pixel_values, error in pipeline.preprocess(videos):
+            if pixel_values is None:
+                errors.write(error_record(source, error or "unknown"))
+                failed += 1
+                continue
+
+            clip = pixel_values[0]
+            if array is None:
+                # Shape is known once the first clip is preprocessed
+                array = np.lib.format.open_memmap(
+                    directory / STORE_ARRAY,
+                    mode="w+",
+                    dtype=np.dtype(dtype),
+                    shape=(len(videos),) + clip.shape,
+                )
+            elif clip.shape != array.shape[1:]:
+                errors.write(error_record(source, f"Unexpected clip shape {clip.shape}"))
+                failed += 1
+                continue
+
+            array[rows] = clip
+            index.write({"row": rows, "video": source.name, "path": str(Path(source).resolve())})
+            rows += 1
+
+    if array is None:
+        raise ValueError(f"No clips could be prepared for {directory} ({failed} failures)")
+    array.flush()
+    del array
+
+    meta = {
+        "version": STORE_VERSION,
+        "rows": rows,
+        "capacity": len(videos),
+        "clip_shape": list(clip.shape),
+        "dtype": dtype,
+        "clip_length": HP.CLIP_LENGTH,
+        "sampling": sampling_config(),
+        "processor": processor_identity,
+        "created_at": time.time(),
+    }
+    tmp_path = directory / f".{STORE_META}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, directory / STORE_META)
+
+    logger.info(f"Prepared {rows} clips in {directory} ({failed} failures)")
+    return ClipStore(directory)
+
+
+class ClipStore:
+    """Read access to a prepared clip store."""
+
+    def __init__(self, directory: Path):
+        """
+        Open a prepared store.
+
+        Args:
+            directory: Store directory
+
+        Raises:
+            FileNotFoundError: If the store is missing or was never finished
+        """
+        self._directory = Path(directory)
+        meta_path = self._directory / STORE_META
+        if not meta_path.exists():
+            raise FileNotFoundError(f"No finished clip store at {self._directory}")
+
+        with open(meta_path, encoding="utf-8") as f:
+            self._meta = json.load(f)
+        self._array = np.load(self._directory / STORE_ARRAY, mmap_mode="r")
+        with open(self._directory / STORE_INDEX, encoding="utf-8") as f:
+            self._entries = [json.loads(line) for line in f if line.strip()][:len(self)]
+
+    def __len__(self) -> int:
+        """Number of stored clips."""
+        return int(self._meta["rows"])
+
+    @property
+    def directory(self) -> Path:
+        """Store directory."""
+        return self._directory
+
+    @property
+    def meta(self) -> dict:
+        """Store metadata."""
+        return dict(self._meta)
+
+    @property
+    def processor_identity(self) -> str:
+        """Fingerprint of the processor that produced the clips."""
+        return self._meta["processor"]
+
+    @property
+    def entries(self) -> List[Dict[str, str]]:
+        """Index records (row, video, path) in row order."""
+        return list(self._entries)
+
+    def iter_batches(
+        self,
+        batch_size: int,
+        skip: Optional[Set[str]] = None,
+        read_ahead: int = DEFAULT_READ_AHEAD
+    ) -> Iterator[Tuple[List[Dict[str, str]], np.ndarray]]:
+        """
+        Stream batches of clips in row order.
+
+        A reader thread copies the next batches out of the memory map
+        while the caller runs inference on the current one.
+
+        Args:
+            batch_size: Clips per batch
+            skip: Paths or file names to leave out (e.g. already captioned)
+            read_ahead: Batches read ahead of the caller
+
+        Yields:
+            (index records, array of shape (batch, frames, 3, H, W))
+        """
+        entries = [
+            entry for entry in self._entries
+            if not skip or (entry["path"] not in skip and entry["video"] not in skip)
+        ]
+        batch_size = max(1, batch_size)
+        batches: queue.Queue = queue.Queue(maxsize=max(1, read_ahead))
+        stop = threading.Event()
+
+        def read() -> None:
+            try:
+                for offset in range(0, len(entries), batch_size):
+                    chunk = entries[offset:offset + batch_size]
+                    rows = [int(entry["row"]) for entry in chunk]
+                    if rows[-1] - rows[0] == len(rows) - 1:
+                        array = np.array(self._array[rows[0]:rows[-1] + 1])
+                    else:
+                        array = self._array[rows]
+                    while not stop.is_set():
+                        try:
+                            batches.put((chunk, array), timeout=0.1)
+                            break
+                        except queue.Full:
+                            continue
+                    if stop.is_set():
+                        return
+                batches.put(None)
+            except Exception as e:
+                batches.put(e)
+
+        reader = threading.Thread(target=read, name="clip-store-read", daemon=True)
+        reader.start()
+        try:
+            while True:
+                item = batches.get()
+                if item is None:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            stop.set()
+
+
+def caption_clip_store(
+    store: ClipStore,
+    model_manager,
+    batch_size: int = 8,
+    max_length: Optional[int] = None,
+    skip: Optional[Set[str]] = None
+) -> Iterator[ClipResult]:
+    """
+    Caption every clip in a store with the current model.
+
+    Args:
+        store: Prepared clip store
+        model_manager: Initialized ModelManager
+        batch_size: Clips captioned per generate call
+        max_length: Maximum caption length (uses settings default if None)
+        skip: Paths or file names to leave out (e.g. already captioned)
+
+    Yields:
+        One ClipResult per clip, in row order
+
+    Raises:
+        ValueError: If the store was prepared with a different processor
+    """
+    if store.processor_identity != model_manager.processor_identity:
+        raise ValueError(
+            f"Clip store {store.directory} was prepared with processor "
+            f"{store.processor_identity}, the loaded model uses {model_manager.processor_identity}"
+        )
+
+    for entries, array in store.iter_batches(batch_size, skip):
+        paths = [Path(entry["path"]) for entry in entries]
+        try:
+            pixel_values = model_manager.to_model_input(array)
+            captions = model_manager.generate_captions(pixel_values, max_length, priority=PRIORITY_BACKGROUND)
+        except Exception as e:
+            logger.error(f"Failed to caption batch of {len(entries)}: {e}")
+            for path in paths:
+                yield ClipResult(path, error=str(e))
+            continue
+
+        for path, caption in zip(paths, captions):
+            yield ClipResult(path, caption=caption)
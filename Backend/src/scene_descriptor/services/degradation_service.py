@@ -0,0 +1,214 @@
+"""
+Graceful degradation under inference overload.
+
+Steps every session down a ladder of cheaper caption configurations while
+the inference backlog or caption latency is over budget, and back up once
+load has stayed low for a while.
+"""
+
+import threading
+import time
+from dataclasses import asdict, dataclass, replace
+from typing import List, Optional
+
+from ..config import HP, settings
+from ..models import get_inference_pool, get_model_manager
+from ..utils.logging import get_logger
+from ..utils.metrics import get_metrics
+
+logger = get_logger(__name__)
+
+# Ladder step sizes
+WINDOW_SCALE = 1.6
+FRAME_SCALE = 0.5
+CAPTION_LENGTH_SCALE = 0.6
+
+# Step up only when latency is below this fraction of the target
+RECOVER_RATIO = 0.5
+
+# Latency samples needed since the last change before latency is trusted
+MIN_SAMPLES = 2
+
+
+@dataclass(frozen=True)
+class DegradationLevel:
+    """One caption configuration on the degradation ladder."""
+
+    level: int
+    name: str
+    capture_scale: float
+    clip_length: int
+    max_caption_length: int
+    image_size: Optional[int] = None
+    quantized: bool = False
+
+    def to_dict(self) -> dict:
+        """Convert to a JSON-serializable dictionary."""
+        return asdict(self)
+
+
+def build_ladder(
+    frame_scaling: bool = True,
+    resolution_scaling: bool = True,
+    quantized_fallback: bool = True
+) -> List[DegradationLevel]:
+    """
+    Build the degradation ladder from the current settings.
+
+    Each level keeps the reductions of the levels above it. Steps the
+    backend cannot apply are left out.
+
+    Args:
+        frame_scaling: Whether fewer frames per clip are supported
+        resolution_scaling: Whether lower input resolutions are supported
+        quantized_fallback: Whether an int8 fallback model is available
+
+    Returns:
+        Levels from full quality (index 0) to cheapest
+    """
+    full = DegradationLevel(
+        level=0,
+        name="full",
+        capture_scale=1.0,
+        clip_length=HP.CLIP_LENGTH,
+        max_caption_length=settings.max_caption_length,
+    )
+    ladder = [full]
+
+    def step(name: str, **changes) -> None:
+        ladder.append(replace(ladder[-1], level=len(ladder), name=name, **changes))
+
+    step("longer_window", capture_scale=WINDOW_SCALE)
+    if frame_scaling:
+        step("fewer_frames", clip_length=max(2, int(full.clip_length * FRAME_SCALE)))
+    step(
+        "shorter_captions",
+        max_caption_length=max(8, int(full.max_caption_length * CAPTION_LENGTH_SCALE))
+    )
+    if resolution_scaling:
+        step("lower_resolution", image_size=settings.degradation_min_image_size)
+    if quantized_fallback:
+        step("quantized", quantized=True)
+
+    return ladder
+
+
+class DegradationController:
+    """
+    Chooses the current degradation level from inference load.
+
+    Steps down when the queue is deeper than allowed or queue wait plus
+    caption latency exceeds the target, at most once per cooldown. Steps
+    up one level after load has stayed well below the target for the
+    recover period. Only samples recorded since the last change are used,
+    so each level is judged on its own latency.
+    """
+
+    def __init__(self, ladder: List[DegradationLevel]):
+        """
+        Initialize the controller at full quality.
+
+        Args:
+            ladder: Levels from full quality to cheapest
+        """
+        self._ladder = ladder
+        self._index = 0
+        self._changed_at = time.monotonic()
+        self._healthy_since: Optional[float] = None
+        self._lock = threading.Lock()
+
+        get_metrics().set_gauge("degradation_level", 0)
+        logger.info(f"Degradation ladder: {[level.name for level in ladder]}")
+
+    @property
+    def current(self) -> DegradationLevel:
+        """Get the current level."""
+        return self._ladder[self._index]
+
+    @property
+    def ladder(self) -> List[DegradationLevel]:
+        """Get all levels."""
+        return list(self._ladder)
+
+    def _recent_latency(self) -> Optional[float]:
+        """p95 queue wait + p95 caption latency since the last level change."""
+        metrics = get_metrics()
+        caption = metrics.latency("caption_latency").values(since=self._changed_at)
+        if len(caption) < MIN_SAMPLES:
+            return None
+
+        caption_p95 = metrics.latency("caption_latency").percentile(95, since=self._changed_at)
+        wait_p95 = metrics.latency("inference_queue_wait").percentile(95, since=self._changed_at)
+        return caption_p95 + (wait_p95 or 0)
+
+    def evaluate(self) -> DegradationLevel:
+        """
+        Re-check load and move at most one level.
+
+        Returns:
+            The level to use for the next caption
+        """
+        if not settings.degradation_enabled:
+            return self._ladder[0]
+
+        with self._lock:
+            now = time.monotonic()
+            queue_depth = get_inference_pool().queue_depth
+            latency = self._recent_latency()
+            target = settings.degradation_target_latency
+
+            overloaded = (
+                queue_depth > settings.degradation_max_queue_depth
+                or (latency is not None and latency > target)
+            )
+            idle = queue_depth == 0 and (latency is None or latency < target * RECOVER_RATIO)
+
+            if overloaded:
+                self._healthy_since = None
+                if (self._index < len(self._ladder) - 1
+                        and now - self._changed_at >= settings.degradation_cooldown_seconds):
+                    self._move(self._index + 1, queue_depth, latency)
+            elif idle:
+                if self._healthy_since is None:
+                    self._healthy_since = now
+                if (self._index > 0
+                        and now - self._healthy_since >= settings.degradation_recover_seconds):
+                    self._move(self._index - 1, queue_depth, latency)
+                    self._healthy_since = now
+            else:
+                self._healthy_since = None
+
+            return self._ladder[self._index]
+
+    def _move(self, index: int, queue_depth: int, latency: Optional[float]) -> None:
+        """Switch level and record the change."""
+        previous = self._ladder[self._index]
+        self._index = index
+        self._changed_at = time.monotonic()
+
+        metrics = get_metrics()
+        metrics.set_gauge("degradation_level", index)
+        metrics.increment("degradation_steps_down" if index > previous.level else "degradation_steps_up")
+
+        latency_text = f"{latency:.2f}s" if latency is not None else "n/a"
+        logger.warning(
+            f"Degradation {previous.name} -> {self.current.name} "
+            f"(queue depth {queue_depth}, latency {latency_text})"
+        )
+
+
+# Singleton instance
+_degradation_controller: Optional[DegradationController] = None
+
+
+def get_degradation_controller() -> DegradationController:
+    """Get the degradation controller singleton, with a ladder for the loaded models."""
+    global _degradation_controller
+    if _degradation_controller is None:
+        model_manager = get_model_manager()
+        _degradation_controller = DegradationController(build_ladder(
+            frame_scaling=model_manager.supports_frame_scaling,
+            resolution_scaling=model_manager.supports_resolution_scaling,
+            quantized_fallback=model_manager.has_quantized_fallback(),
+        ))
+    return _degradation_controller
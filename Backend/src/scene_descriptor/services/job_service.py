@@ -0,0 +1,215 @@
+"""
+Asynchronous caption jobs for uploaded video files.
+
+Clients that cannot use WebRTC upload a recorded clip, get a job id
+back at once and poll for the caption. Jobs run on a few job threads
+and submit inference to the shared pool at background priority, so
+they only use capacity live sessions leave free.
+"""
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Optional
+
+from ..config import settings
+from ..enums import JobStatus
+from ..utils.exceptions import RequestError
+from ..utils.logging import get_logger
+from .video_service import get_video_service
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class CaptionJob:
+    """One uploaded video waiting for, or done with, captioning."""
+
+    id: str
+    filename: str
+    upload_path: Path
+    max_length: Optional[int] = None
+    status: JobStatus = JobStatus.QUEUED
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    caption: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def finished(self) -> bool:
+        """Whether the job is done or failed."""
+        return self.status in (JobStatus.DONE, JobStatus.FAILED)
+
+    def to_dict(self, position: Optional[int] = None) -> dict:
+        """Get the client-facing job state (position: queued jobs ahead of this one)."""
+        return {
+            "job_id": self.id,
+            "status": self.status.value,
+            "filename": self.filename,
+            "caption": self.caption,
+            "error": self.error,
+            "position": position,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class JobService:
+    """
+    In-memory caption job queue.
+
+    Jobs are lost on restart. Finished jobs are kept for
+    settings.job_retention_seconds, then forgotten.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        retention_seconds: Optional[float] = None
+    ):
+        """
+        Initialize the service.
+
+        Args:
+            workers: Jobs run at once (default: settings.job_workers)
+            max_pending: Most queued or running jobs (default: settings.job_max_pending)
+            retention_seconds: How long finished jobs are kept (default: settings.job_retention_seconds)
+        """
+        self._workers = max(1, workers or settings.job_workers)
+        self._max_pending = max_pending or settings.job_max_pending
+        self._retention_seconds = (
+            retention_seconds if retention_seconds is not None else settings.job_retention_seconds
+        )
+        self._executor = ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix="caption-job")
+        self._jobs: Dict[str, CaptionJob] = OrderedDict()
+        self._lock = threading.Lock()
+        logger.debug(f"JobService initialized with {self._workers} worker(s)")
+
+    @property
+    def pending(self) -> int:
+        """Number of queued or running jobs."""
+        with self._lock:
+            return sum(1 for job in self._jobs.values() if not job.finished)
+
+    def has_capacity(self) -> bool:
+        """Whether another job can be accepted."""
+        return self.pending < self._max_pending
+
+    def submit(self, upload_path: Path, filename: str, max_length: Optional[int] = None) -> CaptionJob:
+        """
+        Queue an uploaded video for captioning.
+
+        The job owns the upload from here on and deletes it when done.
+
+        Args:
+            upload_path: Temporary file holding the video
+            filename: Client's name for the file
+            max_length: Maximum caption length (uses settings default if None)
+
+        Returns:
+            The queued job
+
+        Raises:
+            RequestError: If settings.job_max_pending jobs are already queued or running
+        """
+        self._prune()
+        with self._lock:
+            if sum(1 for job in self._jobs.values() if not job.finished) >= self._max_pending:
+                raise RequestError(f"Job queue full ({self._max_pending} pending)")
+            job = CaptionJob(uuid.uuid4().hex, filename, Path(upload_path), max_length)
+            self._jobs[job.id] = job
+
+        self._executor.submit(self._run, job)
+        logger.info(f"Queued caption job {job.id} for {filename}")
+        return job
+
+    def get(self, job_id: str) -> Optional[CaptionJob]:
+        """Get a job by id (None if unknown or expired)."""
+        self._prune()
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def position(self, job: CaptionJob) -> Optional[int]:
+        """Number of queued jobs ahead of a queued job (None once it has started)."""
+        if job.status != JobStatus.QUEUED:
+            return None
+        with self._lock:
+            ahead = 0
+            for other in self._jobs.values():
+                if other is job:
+                    return ahead
+                if other.status == JobStatus.QUEUED:
+                    ahead += 1
+        return None
+
+    def shutdown(self) -> None:
+        """Cancel queued jobs and delete their uploads; running jobs finish in the background."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        with self._lock:
+            for job in self._jobs.values():
+                if job.status == JobStatus.QUEUED:
+                    job.upload_path.unlink(missing_ok=True)
+
+    def _run(self, job: CaptionJob) -> None:
+        """Caption one job's upload (runs on a job thread)."""
+        job.started_at = time.time()
+        job.status = JobStatus.RUNNING
+        status = JobStatus.FAILED
+        try:
+            # Temp uploads would only clutter the caption cache's content-hash memo
+            result = get_video_service().caption_files([job.upload_path], job.max_length, use_cache=False)[0]
+            if result.ok:
+                job.caption = result.caption
+                status = JobStatus.DONE
+            else:
+                job.error = result.error
+        except Exception as e:
+            logger.error(f"Caption job {job.id} failed: {e}", exc_info=True)
+            job.error = str(e)
+        finally:
+            job.upload_path.unlink(missing_ok=True)
+            # finished_at first: other threads treat a finished status as having one
+            job.finished_at = time.time()
+            job.status = status
+
+        logger.info(
+            f"Caption job {job.id} {job.status.value} in {job.finished_at - job.created_at:.2f}s"
+        )
+
+    def _prune(self) -> None:
+        """Forget finished jobs older than the retention period."""
+        cutoff = time.time() - self._retention_seconds
+        with self._lock:
+            expired = [
+                job_id for job_id, job in self._jobs.items()
+                if job.finished and job.finished_at is not None and job.finished_at < cutoff
+            ]
+            for job_id in expired:
+                del self._jobs[job_id]
+
+
+# Singleton instance
+_job_service: Optional[JobService] = None
+
+
+def get_job_service() -> JobService:
+    """Get the job service singleton."""
+    global _job_service
+    if _job_service is None:
+        _job_service = JobService()
+    return _job_service
+
+
+def shutdown_job_service() -> None:
+    """Stop the job service singleton if it was created."""
+    global _job_service
+    if _job_service is not None:
+        _job_service.shutdown()
+        _job_service = None
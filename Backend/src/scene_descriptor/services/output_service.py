@@ -0,0 +1,378 @@
+"""
+Streaming result output for batch captioning.
+
+Results are appended as each video finishes and synced to disk
+periodically, so a crash loses at most the last few seconds of work and
+a rerun can skip the videos that already have a caption.
+"""
+
+import csv
+import json
+import os
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+from ..enums import OutputFormat
+from ..utils.exceptions import ConfigurationError
+from ..utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Columns of a result record
+RESULT_FIELDS = ["video", "caption", "path"]
+
+# Seconds between fsyncs of appended results
+DEFAULT_FSYNC_INTERVAL = 5.0
+
+# Parquet rows buffered before a part file is written
+PARQUET_ROWS_PER_PART = 500
+
+# Shortest time between Parquet part files written for the sync interval
+PARQUET_MIN_PART_SECONDS = 60.0
+
+
+def infer_output_format(path: Path) -> OutputFormat:
+    """
+    Guess the output format from a file name (CSV unless .jsonl or .parquet).
+
+    Args:
+        path: Output path
+
+    Returns:
+        OutputFormat
+    """
+    suffix = Path(path).suffix.lower()
+    if suffix in (".jsonl", ".ndjson"):
+        return OutputFormat.JSONL
+    if suffix == ".parquet":
+        return OutputFormat.PARQUET
+    return OutputFormat.CSV
+
+
+def result_record(video_path: Path, caption: str) -> Dict[str, str]:
+    """
+    Build the result record for a captioned video.
+
+    Args:
+        video_path: Path to the video file
+        caption: Generated caption
+
+    Returns:
+        Record with RESULT_FIELDS
+    """
+    return {"video": video_path.name, "caption": caption, "path": str(Path(video_path).resolve())}
+
+
+def _truncate_partial_line(path: Path) -> None:
+    """Drop a final line left incomplete by a crash mid-write."""
+    with open(path, "rb+") as f:
+        size = f.seek(0, os.SEEK_END)
+        if size == 0:
+            return
+        f.seek(size - 1)
+        if f.read(1) == b"\n":
+            return
+
+        # Scan back for the last complete line
+        position = size
+        while position > 0:
+            step = min(4096, position)
+            f.seek(position - step)
+            chunk = f.read(step)
+            newline = chunk.rfind(b"\n")
+            if newline >= 0:
+                f.truncate(position - step + newline + 1)
+                break
+            position -= step
+        else:
+            f.truncate(0)
+
+    logger.warning(f"Dropped incomplete last line of {path}")
+
+
+class ResultWriter(ABC):
+    """
+    Appends result records to an output and syncs them periodically.
+
+    Subclasses implement one file format; one that misses a method fails
+    when it is created, not partway through a run. Writers are context managers;
+    closing one flushes and syncs everything written.
+    """
+
+    def __init__(self, path: Path, fsync_interval: float = DEFAULT_FSYNC_INTERVAL):
+        """
+        Initialize the writer.
+
+        Args:
+            path: Output path
+            fsync_interval: Seconds between fsyncs (0 syncs every record)
+        """
+        self.path = Path(path)
+        self._fsync_interval = fsync_interval
+        self._last_sync = time.monotonic()
+        self.written = 0
+
+    def write(self, record: Dict[str, str]) -> None:
+        """
+        Append one record and sync if the interval has passed.
+
+        Args:
+            record: Result fields
+        """
+        self._write(record)
+        self.written += 1
+        if time.monotonic() - self._last_sync >= self._fsync_interval:
+            self.sync()
+
+    def sync(self) -> None:
+        """Flush buffered records and fsync them to disk."""
+        self._sync()
+        self._last_sync = time.monotonic()
+
+    def close(self) -> None:
+        """Sync and close the output."""
+        self.sync()
+        self._close()
+
+    def completed(self) -> Set[str]:
+        """
+        Get the videos already present in the output.
+
+        Returns:
+            Resolved paths (or bare file names for records without a path)
+        """
+        return {record.get("path") or record.get("video", "") for record in self.read()}
+
+    @abstractmethod
+    def read(self) -> List[Dict[str, str]]:
+        """Read back the records already in the output."""
+
+    @abstractmethod
+    def _write(self, record: Dict[str, str]) -> None:
+        """Append one record to the output buffer."""
+
+    @abstractmethod
+    def _sync(self) -> None:
+        """Flush and fsync buffered records."""
+
+    @abstractmethod
+    def _close(self) -> None:
+        """Release the output."""
+
+    def __enter__(self) -> "ResultWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+class _LineResultWriter(ResultWriter):
+    """Base for line-oriented text outputs (one record per line)."""
+
+    def __init__(
+        self,
+        path: Path,
+        append: bool = False,
+        fsync_interval: float = DEFAULT_FSYNC_INTERVAL
+    ):
+        """
+        Open the output file.
+
+        Args:
+            path: Output file
+            append: Keep existing records (resume) instead of overwriting
+            fsync_interval: Seconds between fsyncs (0 syncs every record)
+        """
+        super().__init__(path, fsync_interval)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        if append and self.path.exists():
+            _truncate_partial_line(self.path)
+        self._file = open(self.path, "a" if append else "w", newline="", encoding="utf-8")
+        self._is_empty = self._file.tell() == 0
+
+    def _sync(self) -> None:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def _close(self) -> None:
+        self._file.close()
+
+
+class CsvResultWriter(_LineResultWriter):
+    """Appends results to a CSV file with a header row."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._writer = csv.DictWriter(self._file, fieldnames=RESULT_FIELDS, extrasaction="ignore")
+        if self._is_empty:
+            self._writer.writeheader()
+
+    def _write(self, record: Dict[str, str]) -> None:
+        self._writer.writerow(record)
+        self._file.flush()
+
+    def read(self) -> List[Dict[str, str]]:
+        if not self.path.exists():
+            return []
+        with open(self.path, newline="", encoding="utf-8") as f:
+            return [row for row in csv.DictReader(f) if row.get("caption")]
+
+
+class JsonlResultWriter(_LineResultWriter):
+    """Appends results as one JSON object per line."""
+
+    def _write(self, record: Dict[str, str]) -> None:
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def read(self) -> List[Dict[str, str]]:
+        if not self.path.exists():
+            return []
+        records = []
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+        return records
+
+
+class ParquetResultWriter(ResultWriter):
+    """
+    Writes results as a directory of Parquet part files.
+
+    Parquet files are only readable once closed, so rows are buffered and
+    written as a new part file every PARQUET_ROWS_PER_PART rows (or on
+    sync, at most every PARQUET_MIN_PART_SECONDS). Each part is written
+    to a temporary name and renamed, so a crash never leaves a torn part.
+    pandas and pyarrow read the directory as one table.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        append: bool = False,
+        fsync_interval: float = DEFAULT_FSYNC_INTERVAL
+    ):
+        """
+        Prepare the output directory.
+
+        Args:
+            path: Output directory
+            append: Keep existing parts (resume) instead of removing them
+            fsync_interval: Seconds between syncs (raised to PARQUET_MIN_PART_SECONDS)
+
+        Raises:
+            ConfigurationError: If pyarrow is not installed
+        """
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError as e:
+            raise ConfigurationError(
+                "pyarrow is required for Parquet output (pip install scene-descriptor[parquet])",
+                cause=e
+            )
+        self._pa = pyarrow
+        self._pq = pyarrow.parquet
+
+        super().__init__(path, max(fsync_interval, PARQUET_MIN_PART_SECONDS))
+        self.path.mkdir(parents=True, exist_ok=True)
+
+        if not append:
+            for part in self._parts():
+                part.unlink()
+        for leftover in self.path.glob(".part-*.tmp"):
+            leftover.unlink()
+
+        self._rows: List[Dict[str, str]] = []
+        self._next_part = len(self._parts())
+
+    def _parts(self) -> List[Path]:
+        return sorted(self.path.glob("part-*.parquet"))
+
+    def _write(self, record: Dict[str, str]) -> None:
+        self._rows.append({field: record.get(field, "") for field in RESULT_FIELDS})
+        if len(self._rows) >= PARQUET_ROWS_PER_PART:
+            self._sync()
+
+    def _sync(self) -> None:
+        if not self._rows:
+            return
+
+        table = self._pa.Table.from_pylist(self._rows)
+        name = f"part-{self._next_part:05d}.parquet"
+        tmp_path = self.path / f".{name}.tmp"
+        with open(tmp_path, "wb") as f:
+            self._pq.write_table(table, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path / name)
+
+        self._next_part += 1
+        self._rows = []
+
+    def _close(self) -> None:
+        pass
+
+    def read(self) -> List[Dict[str, str]]:
+        records = []
+        for part in self._parts():
+            records.extend(self._pq.read_table(part).to_pylist())
+        return records
+
+
+def open_result_writer(
+    path: Path,
+    output_format: Optional[OutputFormat] = None,
+    append: bool = False,
+    fsync_interval: float = DEFAULT_FSYNC_INTERVAL
+) -> ResultWriter:
+    """
+    Open a result writer for a path.
+
+    Args:
+        path: Output file (or directory for Parquet)
+        output_format: Format to write (inferred from the path if None)
+        append: Keep existing results (resume) instead of overwriting
+        fsync_interval: Seconds between fsyncs
+
+    Returns:
+        ResultWriter for the format
+    """
+    output_format = output_format or infer_output_format(path)
+    writer_class = {
+        OutputFormat.CSV: CsvResultWriter,
+        OutputFormat.JSONL: JsonlResultWriter,
+        OutputFormat.PARQUET: ParquetResultWriter,
+    }[OutputFormat(output_format)]
+    return writer_class(path, append=append, fsync_interval=fsync_interval)
+
+
+def error_log_path(output_path: Path) -> Path:
+    """Default error log next to an output: <stem>.errors.jsonl."""
+    output_path = Path(output_path)
+    return output_path.with_name(f"{output_path.stem}.errors.jsonl")
+
+
+def error_record(video_path: Path, error: str) -> Dict[str, str]:
+    """
+    Build an error log record for a video that failed.
+
+    Args:
+        video_path: Path to the video file
+        error: Failure reason
+
+    Returns:
+        Record with video, path, error and a UTC timestamp
+    """
+    return {
+        "video": video_path.name,
+        "path": str(Path(video_path).resolve()),
+        "error": error,
+        "time": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
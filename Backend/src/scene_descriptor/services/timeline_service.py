@@ -0,0 +1,165 @@
+"""
+Dense timeline captioning for long videos.
+
+Splits a video into fixed or scene-detected segments, captions every
+segment through a BatchCaptionPipeline (segments are decoded in parallel
+and batched for the model), and writes the result as a WebVTT or SRT
+subtitle track.
+"""
+
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+from ..models import fixed_segments, scene_segments
+from ..utils.logging import get_logger
+from .batch_service import BatchCaptionPipeline, ClipResult
+
+logger = get_logger(__name__)
+
+# Subtitle formats write_timeline() supports
+TIMELINE_FORMATS = ("vtt", "srt")
+
+
+@dataclass
+class TimelineCue:
+    """One caption shown over a time range."""
+
+    start: float
+    end: float
+    text: str
+
+
+def format_timestamp(seconds: float, decimal: str = ".") -> str:
+    """
+    Format seconds as HH:MM:SS.mmm (WebVTT) or HH:MM:SS,mmm (SRT).
+
+    Args:
+        seconds: Time from the start of the video
+        decimal: Separator before the milliseconds
+
+    Returns:
+        Timestamp string
+    """
+    millis = int(round(max(0.0, seconds) * 1000))
+    hours, millis = divmod(millis, 3_600_000)
+    minutes, millis = divmod(millis, 60_000)
+    secs, millis = divmod(millis, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}{decimal}{millis:03d}"
+
+
+def build_cues(results: Iterable[ClipResult], merge_repeats: bool = True) -> List[TimelineCue]:
+    """
+    Turn segment results into time-ordered cues.
+
+    Failed segments leave a gap. Consecutive segments with the same
+    caption become one cue.
+
+    Args:
+        results: ClipResults of one video's segments, in any order
+        merge_repeats: Merge consecutive identical captions
+
+    Returns:
+        Cues ordered by time
+    """
+    results = sorted((r for r in results if r.segment is not None), key=lambda r: r.segment.index)
+
+    cues: List[TimelineCue] = []
+    previous_index = None
+    for result in results:
+        segment = result.segment
+        if not result.ok:
+            logger.warning(f"No caption for segment {segment.index} of {segment.video_path}: {result.error}")
+            previous_index = None
+            continue
+
+        text = result.caption.strip()
+        if (merge_repeats and cues and previous_index == segment.index - 1
+                and cues[-1].text == text):
+            cues[-1].end = segment.end
+        else:
+            cues.append(TimelineCue(segment.start, segment.end, text))
+        previous_index = segment.index
+
+    return cues
+
+
+def render_webvtt(cues: List[TimelineCue]) -> str:
+    """Render cues as a WebVTT document."""
+    blocks = ["WEBVTT"]
+    for cue in cues:
+        blocks.append(
+            f"{format_timestamp(cue.start)} --> {format_timestamp(cue.end)}\n{cue.text}"
+        )
+    return "\n\n".join(blocks) + "\n"
+
+
+def render_srt(cues: List[TimelineCue]) -> str:
+    """Render cues as an SRT document."""
+    blocks = []
+    for number, cue in enumerate(cues, start=1):
+        blocks.append(
+            f"{number}\n{format_timestamp(cue.start, ',')} --> {format_timestamp(cue.end, ',')}\n{cue.text}"
+        )
+    return "\n\n".join(blocks) + "\n"
+
+
+def write_timeline(cues: List[TimelineCue], path: Path, timeline_format: Optional[str] = None) -> None:
+    """
+    Write cues as a subtitle file (atomically replacing any existing one).
+
+    Args:
+        cues: Cues ordered by time
+        path: Output file
+        timeline_format: vtt or srt (default: from the file extension)
+    """
+    path = Path(path)
+    timeline_format = (timeline_format or path.suffix.lstrip(".") or "vtt").lower()
+    if timeline_format not in TIMELINE_FORMATS:
+        raise ValueError(f"Unsupported timeline format: {timeline_format}")
+
+    text = render_srt(cues) if timeline_format == "srt" else render_webvtt(cues)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    tmp_path.write_text(text, encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def caption_timeline(
+    video_path: Path,
+    pipeline: BatchCaptionPipeline,
+    segment_seconds: float = 10.0,
+    scenes: bool = False,
+    min_scene_seconds: float = 2.0,
+    max_scene_seconds: float = 30.0
+) -> List[TimelineCue]:
+    """
+    Caption a video segment by segment.
+
+    Segments are generated lazily: with scene detection, captioning of
+    earlier segments starts while later ones are still being found.
+    Memory is bounded by the pipeline's prefetch, not the video length.
+
+    Args:
+        video_path: Path to the video file
+        pipeline: Pipeline used to decode and caption the segments
+        segment_seconds: Segment length for fixed segmentation
+        scenes: Split at scene cuts instead of fixed lengths
+        min_scene_seconds: Shortest scene segment
+        max_scene_seconds: Longest scene segment
+
+    Returns:
+        Cues ordered by time
+    """
+    if scenes:
+        segments = scene_segments(video_path, min_scene_seconds, max_scene_seconds)
+    else:
+        segments = fixed_segments(video_path, segment_seconds)
+
+    results = list(pipeline.run(segments))
+    failed = sum(1 for result in results if not result.ok)
+    logger.info(f"Captioned {len(results) - failed}/{len(results)} segments of {video_path}")
+
+    return build_cues(results)
@@ -6,14 +6,24 @@ Handles video file operations and frame extraction.
 
 import os
 from pathlib import Path
-from typing import List, Optional, Generator
+from typing import Iterable, Iterator, List, Optional, Generator
 
 import numpy as np
 
-from ..models import read_video_frames, read_video_opencv, sample_frames
+from ..models import (
+    PRIORITY_BACKGROUND,
+    get_inference_pool,
+    get_model_manager,
+    read_video_frames,
+    read_video_opencv,
+    read_sampled_frames,
+    read_sampled_frames_opencv,
+)
 from ..config import settings, HP
 from ..utils.logging import get_logger
 from ..utils.exceptions import VideoReadError
+from .batch_service import BatchCaptionPipeline, ClipResult
+from .cache_service import CaptionCache
 
 logger = get_logger(__name__)
 
@@ -62,14 +72,19 @@ class VideoService:
     def get_sampled_frames(
         self,
         video_path: str,
-        num_samples: int = None
+        num_samples: int = None,
+        use_opencv: bool = False
     ) -> np.ndarray:
         """
         Read and sample frames from a video.
 
+        Only the sampled frames are decoded to RGB, so cost depends on
+        num_samples rather than video length.
+
         Args:
             video_path: Path to the video file
             num_samples: Number of frames to sample
+            use_opencv: Use OpenCV instead of PyAV
 
         Returns:
             Array of sampled frames
@@ -78,8 +93,13 @@ class VideoService:
             VideoReadError: If video cannot be read
         """
         num_samples = num_samples or HP.CLIP_LENGTH
-        frames = self.read_video(video_path)
-        return sample_frames(frames, num_samples)
+
+        if not os.path.exists(video_path):
+            raise VideoReadError(f"Video file not found: {video_path}")
+
+        if use_opencv:
+            return read_sampled_frames_opencv(video_path, num_samples)
+        return read_sampled_frames(video_path, num_samples)
 
     def list_videos(
         self,
@@ -138,6 +158,79 @@ class VideoService:
                 logger.error(f"Failed to process {video_path}: {e}")
                 continue
 
+    def caption_video_batch(
+        self,
+        directory: str,
+        max_length: Optional[int] = None,
+        use_cache: Optional[bool] = None
+    ) -> Iterator[ClipResult]:
+        """
+        Caption all videos in a directory with the loaded model.
+
+        Files already captioned with the same model and settings are
+        answered from the caption cache without decoding.
+
+        Args:
+            directory: Directory containing videos
+            max_length: Maximum caption length (uses settings default if None)
+            use_cache: Use the caption cache (default: settings.caption_cache_enabled)
+
+        Yields:
+            ClipResult per video, in completion order
+        """
+        if use_cache is None:
+            use_cache = settings.caption_cache_enabled
+        cache = CaptionCache() if use_cache else None
+
+        pipeline = BatchCaptionPipeline(get_model_manager(), max_length=max_length, cache=cache)
+        try:
+            yield from pipeline.run(self.list_videos(directory))
+        finally:
+            if cache is not None:
+                cache.close()
+
+    def caption_files(
+        self,
+        paths: Iterable[Path],
+        max_length: Optional[int] = None,
+        use_cache: Optional[bool] = None
+    ) -> List[ClipResult]:
+        """
+        Caption video files inside the running server.
+
+        Blocking; call from an executor. Files are decoded by
+        settings.caption_route_decode_workers threads and batched, and
+        inference queues on the shared InferencePool behind live sessions.
+        Its latency is recorded as background_caption_latency, so a long
+        run does not degrade live sessions or fail readiness.
+
+        Args:
+            paths: Video files to caption
+            max_length: Maximum caption length (uses settings default if None)
+            use_cache: Use the caption cache (default: settings.caption_cache_enabled)
+
+        Returns:
+            ClipResult per file, in completion order
+        """
+        if use_cache is None:
+            use_cache = settings.caption_cache_enabled
+        cache = CaptionCache() if use_cache else None
+
+        pipeline = BatchCaptionPipeline(
+            get_model_manager(),
+            batch_size=settings.caption_route_batch_size,
+            decode_workers=settings.caption_route_decode_workers,
+            max_length=max_length,
+            cache=cache,
+            inference_pool=get_inference_pool(),
+            inference_priority=PRIORITY_BACKGROUND,
+        )
+        try:
+            return list(pipeline.run(paths))
+        finally:
+            if cache is not None:
+                cache.close()
+
 
 # Singleton instance
 _video_service: Optional[VideoService] = None
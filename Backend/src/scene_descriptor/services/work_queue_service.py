@@ -0,0 +1,449 @@
+"""
+Lease-based work queue for captioning across processes and machines.
+
+The video list lives in one SQLite file, e.g. on a shared filesystem.
+Workers lease a few items at a time, renew their leases with heartbeats
+while they work, and commit each caption. Leases of workers that die
+expire and the items go back to pending, up to a retry limit.
+
+SQLite locks the whole file for writes, which is plenty for a few
+lease/commit transactions per second from a handful of hosts. WAL mode
+needs shared memory between processes, so the queue uses the default
+rollback journal, which also works on network filesystems with working
+POSIX locks.
+"""
+
+import os
+import socket
+import sqlite3
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from ..utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Seconds a lease lasts without a heartbeat
+DEFAULT_LEASE_SECONDS = 300.0
+
+# Leases that expire this many times mark the item failed
+DEFAULT_MAX_ATTEMPTS = 3
+
+# Window used for throughput and ETA
+RATE_WINDOW_SECONDS = 600.0
+
+# Item states
+PENDING = "pending"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    state TEXT NOT NULL DEFAULT 'pending',
+    worker TEXT,
+    lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    caption TEXT,
+    error TEXT,
+    enqueued_at REAL NOT NULL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS items_state ON items (state, lease_expires);
+CREATE INDEX IF NOT EXISTS items_finished ON items (finished_at);
+"""
+
+
+def default_worker_id() -> str:
+    """Identify this process as host:pid."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+@dataclass
+class WorkItem:
+    """A leased video."""
+
+    id: int
+    path: str
+    attempts: int
+
+
+@dataclass
+class QueueProgress:
+    """Cluster-wide queue counts, throughput and ETA."""
+
+    pending: int
+    leased: int
+    done: int
+    failed: int
+    active_workers: int
+    rate_per_minute: float
+    eta_seconds: Optional[float]
+    workers: Dict[str, float]
+
+    @property
+    def total(self) -> int:
+        """All items in the queue."""
+        return self.pending + self.leased + self.done + self.failed
+
+    @property
+    def finished(self) -> bool:
+        """Whether nothing is left to do."""
+        return self.pending == 0 and self.leased == 0
+
+    def to_dict(self) -> dict:
+        """Convert to a JSON-serializable dictionary."""
+        return {**asdict(self), "total": self.total}
+
+
+class WorkQueue:
+    """
+    SQLite-backed queue of videos with expiring leases.
+
+    One instance may be shared by threads in a process; any number of
+    processes may open the same file.
+    """
+
+    def __init__(self, path: Path, max_attempts: int = DEFAULT_MAX_ATTEMPTS):
+        """
+        Open (or create) a queue.
+
+        Args:
+            path: Queue database file
+            max_attempts: Leases an item may lose before it is marked failed
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._max_attempts = max_attempts
+
+        # Autocommit; write transactions are opened explicitly
+        self._conn = sqlite3.connect(
+            str(self.path),
+            timeout=60,
+            isolation_level=None,
+            check_same_thread=False
+        )
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def _write(self, sql_batches: List[tuple]) -> List[sqlite3.Cursor]:
+        """Run statements in one write transaction (BEGIN IMMEDIATE)."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                cursors = [self._conn.execute(sql, params) for sql, params in sql_batches]
+                self._conn.execute("COMMIT")
+                return cursors
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def enqueue(self, paths: Iterable[Path]) -> int:
+        """
+        Add videos; paths already in the queue are left as they are.
+
+        Paths are stored resolved, so every host must see the files at
+        the same location.
+
+        Args:
+            paths: Video files
+
+        Returns:
+            Number of new items
+        """
+        now = time.time()
+        rows = [(str(Path(p).resolve()), now) for p in paths]
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                before = self._conn.total_changes
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO items (path, enqueued_at) VALUES (?, ?)", rows
+                )
+                added = self._conn.total_changes - before
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        logger.info(f"Enqueued {added} new of {len(rows)} videos in {self.path}")
+        return added
+
+    def requeue_expired(self) -> int:
+        """
+        Return items whose lease has expired to pending (or failed after max attempts).
+
+        Returns:
+            Number of expired leases
+        """
+        now = time.time()
+        failed, requeued = self._write([
+            (
+                "UPDATE items SET state = ?, worker = NULL, lease_expires = NULL, finished_at = ?, "
+                "error = 'lease expired too many times' "
+                "WHERE state = ? AND lease_expires < ? AND attempts >= ?",
+                (FAILED, now, LEASED, now, self._max_attempts)
+            ),
+            (
+                "UPDATE items SET state = ?, worker = NULL, lease_expires = NULL "
+                "WHERE state = ? AND lease_expires < ?",
+                (PENDING, LEASED, now)
+            ),
+        ])
+        expired = failed.rowcount + requeued.rowcount
+        if expired:
+            logger.warning(f"Requeued {requeued.rowcount} expired leases, failed {failed.rowcount}")
+        return expired
+
+    def lease(
+        self,
+        worker: str,
+        count: int,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS
+    ) -> List[WorkItem]:
+        """
+        Lease up to count pending items.
+
+        Expired leases are requeued first, so a lease never waits for a
+        separate coordinator.
+
+        Args:
+            worker: Worker id holding the lease
+            count: Most items to lease
+            lease_seconds: Lease duration
+
+        Returns:
+            Leased items (empty if nothing is pending)
+        """
+        self.requeue_expired()
+        now = time.time()
+
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._conn.execute(
+                    "SELECT id, path, attempts FROM items WHERE state = ? ORDER BY id LIMIT ?",
+                    (PENDING, count)
+                ).fetchall()
+                self._conn.executemany(
+                    "UPDATE items SET state = ?, worker = ?, lease_expires = ?, attempts = attempts + 1 "
+                    "WHERE id = ?",
+                    [(LEASED, worker, now + lease_seconds, row[0]) for row in rows]
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        return [WorkItem(id=row[0], path=row[1], attempts=row[2] + 1) for row in rows]
+
+    def drain(
+        self,
+        worker: str,
+        count: int,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+        poll_seconds: float = 10.0
+    ) -> Iterator[WorkItem]:
+        """
+        Lease items in chunks until the whole queue is finished.
+
+        When nothing is pending but other workers still hold leases, polls
+        so that items from leases that expire are picked up too.
+
+        Args:
+            worker: Worker id holding the leases
+            count: Items leased per chunk
+            lease_seconds: Lease duration
+            poll_seconds: Wait between polls while others hold leases
+
+        Yields:
+            Leased items
+        """
+        while True:
+            items = self.lease(worker, count, lease_seconds)
+            if items:
+                yield from items
+                continue
+            if self.progress().finished:
+                return
+            time.sleep(poll_seconds)
+
+    def heartbeat(self, worker: str, lease_seconds: float = DEFAULT_LEASE_SECONDS) -> int:
+        """
+        Extend every lease a worker holds.
+
+        Args:
+            worker: Worker id
+            lease_seconds: New lease duration from now
+
+        Returns:
+            Number of leases extended
+        """
+        (cursor,) = self._write([(
+            "UPDATE items SET lease_expires = ? WHERE state = ? AND worker = ?",
+            (time.time() + lease_seconds, LEASED, worker)
+        )])
+        return cursor.rowcount
+
+    def commit(self, item_id: int, worker: str, caption: str) -> bool:
+        """
+        Record a caption for a leased item.
+
+        Args:
+            item_id: Item id
+            worker: Worker id that leased it
+            caption: Generated caption
+
+        Returns:
+            False if the lease was lost (expired and taken by another worker)
+        """
+        (cursor,) = self._write([(
+            "UPDATE items SET state = ?, caption = ?, error = NULL, finished_at = ?, lease_expires = NULL "
+            "WHERE id = ? AND state = ? AND worker = ?",
+            (DONE, caption, time.time(), item_id, LEASED, worker)
+        )])
+        if cursor.rowcount == 0:
+            logger.warning(f"Lease on item {item_id} lost before commit; result dropped")
+        return cursor.rowcount > 0
+
+    def fail(self, item_id: int, worker: str, error: str) -> bool:
+        """
+        Record a failure; the item is retried until max attempts.
+
+        Args:
+            item_id: Item id
+            worker: Worker id that leased it
+            error: Failure reason
+
+        Returns:
+            False if the lease was lost
+        """
+        now = time.time()
+        (cursor,) = self._write([(
+            "UPDATE items SET "
+            "state = CASE WHEN attempts >= ? THEN ? ELSE ? END, "
+            "finished_at = CASE WHEN attempts >= ? THEN ? ELSE NULL END, "
+            "error = ?, worker = NULL, lease_expires = NULL "
+            "WHERE id = ? AND state = ? AND worker = ?",
+            (self._max_attempts, FAILED, PENDING, self._max_attempts, now, error, item_id, LEASED, worker)
+        )])
+        return cursor.rowcount > 0
+
+    def retry_failed(self) -> int:
+        """
+        Move failed items back to pending with a fresh attempt count.
+
+        Returns:
+            Number of items requeued
+        """
+        (cursor,) = self._write([(
+            "UPDATE items SET state = ?, attempts = 0, finished_at = NULL WHERE state = ?",
+            (PENDING, FAILED)
+        )])
+        return cursor.rowcount
+
+    def progress(self) -> QueueProgress:
+        """Get counts by state, recent throughput per worker and ETA."""
+        now = time.time()
+        since = now - RATE_WINDOW_SECONDS
+
+        with self._lock:
+            counts = dict(self._conn.execute(
+                "SELECT state, COUNT(*) FROM items GROUP BY state"
+            ).fetchall())
+            active = self._conn.execute(
+                "SELECT COUNT(DISTINCT worker) FROM items WHERE state = ? AND lease_expires >= ?",
+                (LEASED, now)
+            ).fetchone()[0]
+            first_finished, recent = self._conn.execute(
+                "SELECT MIN(finished_at), COUNT(*) FROM items WHERE state = ? AND finished_at >= ?",
+                (DONE, since)
+            ).fetchone()
+            per_worker = self._conn.execute(
+                "SELECT worker, COUNT(*) FROM items WHERE state = ? AND finished_at >= ? GROUP BY worker",
+                (DONE, since)
+            ).fetchall()
+
+        window = RATE_WINDOW_SECONDS
+        if first_finished is not None:
+            # A run younger than the window is measured from its first commit
+            window = min(window, max(1.0, now - first_finished))
+        rate = recent / window
+
+        remaining = counts.get(PENDING, 0) + counts.get(LEASED, 0)
+        return QueueProgress(
+            pending=counts.get(PENDING, 0),
+            leased=counts.get(LEASED, 0),
+            done=counts.get(DONE, 0),
+            failed=counts.get(FAILED, 0),
+            active_workers=active,
+            rate_per_minute=rate * 60,
+            eta_seconds=remaining / rate if rate > 0 else None,
+            workers={worker: count / window * 60 for worker, count in per_worker if worker},
+        )
+
+    def results(self, state: str = DONE) -> List[dict]:
+        """
+        Get finished items.
+
+        Args:
+            state: done (captions) or failed (errors)
+
+        Returns:
+            Rows with path, caption, error and worker
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT path, caption, error, worker FROM items WHERE state = ? ORDER BY id",
+                (state,)
+            ).fetchall()
+        return [{"path": r[0], "caption": r[1], "error": r[2], "worker": r[3]} for r in rows]
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            self._conn.close()
+
+
+class LeaseHeartbeat:
+    """Background thread that renews a worker's leases until stopped."""
+
+    def __init__(
+        self,
+        work_queue: WorkQueue,
+        worker: str,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS
+    ):
+        """
+        Initialize the heartbeat.
+
+        Args:
+            work_queue: Queue holding the leases
+            worker: Worker id
+            lease_seconds: Lease duration; renewed every third of it
+        """
+        self._queue = work_queue
+        self._worker = worker
+        self._lease_seconds = lease_seconds
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="lease-heartbeat", daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._lease_seconds / 3):
+            try:
+                self._queue.heartbeat(self._worker, self._lease_seconds)
+            except Exception as e:
+                logger.warning(f"Lease heartbeat failed: {e}")
+
+    def __enter__(self) -> "LeaseHeartbeat":
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._stop.set()
+        self._thread.join()
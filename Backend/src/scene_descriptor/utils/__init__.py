@@ -2,6 +2,8 @@
 
 from .logging import setup_logging, get_logger
 from .state import UseState, StateManager
+from .metrics import LatencyWindow, Metrics, get_metrics
+from .threads import apply_thread_env, get_available_cores, get_thread_env
 from .exceptions import (
     SceneDescriptorError,
     ModelError,
@@ -23,6 +25,7 @@ from .exceptions import (
     APIError,
     ValidationError,
     RequestError,
+    UploadTooLargeError,
 )
 
 __all__ = [
@@ -32,6 +35,14 @@ __all__ = [
     # State
     "UseState",
     "StateManager",
+    # Metrics
+    "LatencyWindow",
+    "Metrics",
+    "get_metrics",
+    # Threads
+    "apply_thread_env",
+    "get_available_cores",
+    "get_thread_env",
     # Exceptions
     "SceneDescriptorError",
     "ModelError",
@@ -53,4 +64,5 @@ __all__ = [
     "APIError",
     "ValidationError",
     "RequestError",
+    "UploadTooLargeError",
 ]
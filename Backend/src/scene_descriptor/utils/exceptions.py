@@ -149,3 +149,8 @@ class ValidationError(APIError):
 class RequestError(APIError):
     """Error processing API request."""
     pass
+
+
+class UploadTooLargeError(ValidationError):
+    """Uploaded body exceeds the configured size limit."""
+    pass
@@ -0,0 +1,140 @@
+"""
+In-process metrics for Scene Descriptor.
+
+Provides thread-safe counters, gauges and rolling latency windows used
+by health/readiness reporting and load control.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+
+
+class LatencyWindow:
+    """
+    Rolling window of recent latency samples.
+
+    Keeps at most max_samples samples no older than max_age seconds.
+    """
+
+    def __init__(self, max_samples: int = 200, max_age: float = 120.0):
+        """
+        Initialize the window.
+
+        Args:
+            max_samples: Maximum number of samples kept
+            max_age: Samples older than this (seconds) are ignored
+        """
+        self._samples: Deque[Tuple[float, float]] = deque(maxlen=max_samples)
+        self._max_age = max_age
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        """
+        Add a latency sample.
+
+        Args:
+            seconds: Measured latency
+        """
+        with self._lock:
+            self._samples.append((time.monotonic(), seconds))
+
+    def values(self, since: Optional[float] = None) -> list:
+        """
+        Get the samples still inside the age window.
+
+        Args:
+            since: Only include samples recorded at or after this time.monotonic() value
+        """
+        cutoff = time.monotonic() - self._max_age
+        if since is not None:
+            cutoff = max(cutoff, since)
+        with self._lock:
+            return [value for timestamp, value in self._samples if timestamp >= cutoff]
+
+    def percentile(self, pct: float, since: Optional[float] = None) -> Optional[float]:
+        """
+        Get a percentile of recent samples.
+
+        Args:
+            pct: Percentile in [0, 100]
+            since: Only include samples recorded at or after this time.monotonic() value
+
+        Returns:
+            Latency in seconds, or None if there are no recent samples
+        """
+        values = sorted(self.values(since))
+        if not values:
+            return None
+        index = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+        return values[index]
+
+    def mean(self) -> Optional[float]:
+        """Get the mean of recent samples, or None if empty."""
+        values = self.values()
+        return sum(values) / len(values) if values else None
+
+
+class Metrics:
+    """Registry of named counters, gauges and latency windows."""
+
+    def __init__(self):
+        self._counters: Dict[str, int] = {}
+        self._gauges: Dict[str, float] = {}
+        self._latencies: Dict[str, LatencyWindow] = {}
+        self._lock = threading.Lock()
+
+    def increment(self, name: str, amount: int = 1) -> None:
+        """Increase a counter."""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def set_gauge(self, name: str, value: float) -> None:
+        """Set a gauge to its current value."""
+        with self._lock:
+            self._gauges[name] = value
+
+    def gauge(self, name: str, default: float = 0) -> float:
+        """Get a gauge value."""
+        return self._gauges.get(name, default)
+
+    def latency(self, name: str) -> LatencyWindow:
+        """Get (or create) a named latency window."""
+        with self._lock:
+            if name not in self._latencies:
+                self._latencies[name] = LatencyWindow()
+            return self._latencies[name]
+
+    def observe(self, name: str, seconds: float) -> None:
+        """Record a latency sample in a named window."""
+        self.latency(name).record(seconds)
+
+    def snapshot(self) -> dict:
+        """Get all metrics as a JSON-serializable dictionary."""
+        with self._lock:
+            counters = dict(self._counters)
+            gauges = dict(self._gauges)
+            latencies = dict(self._latencies)
+
+        return {
+            "counters": counters,
+            "gauges": gauges,
+            "latencies": {
+                name: {
+                    "p50": window.percentile(50),
+                    "p95": window.percentile(95),
+                    "samples": len(window.values()),
+                }
+                for name, window in latencies.items()
+            },
+        }
+
+
+# Singleton instance (created eagerly: metrics are recorded from worker threads)
+_metrics = Metrics()
+
+
+def get_metrics() -> Metrics:
+    """Get the metrics registry singleton."""
+    return _metrics
@@ -0,0 +1,66 @@
+"""
+Thread environment for the OpenMP / BLAS runtimes bundled with torch.
+
+Those runtimes read OMP_NUM_THREADS and friends once, when torch is
+first imported; setting them later has no effect. The package __init__
+therefore applies them before any module imports torch.
+"""
+
+import os
+import sys
+from typing import Dict, List
+
+from ..config import settings
+from .logging import get_logger
+
+logger = get_logger(__name__)
+
+# Environment variables read by the OpenMP / BLAS runtimes bundled with torch
+THREAD_ENV_VARS = ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS")
+
+# Variables in effect when torch loaded (empty if applied too late)
+_thread_env: Dict[str, str] = {}
+
+
+def get_available_cores() -> List[int]:
+    """
+    Get the CPU cores this process is allowed to run on.
+
+    Returns:
+        Sorted list of core ids
+    """
+    try:
+        return sorted(os.sched_getaffinity(0))
+    except AttributeError:
+        # sched_getaffinity is Linux-only
+        return list(range(os.cpu_count() or 1))
+
+
+def apply_thread_env() -> Dict[str, str]:
+    """
+    Size the OpenMP/MKL/OpenBLAS pools for the configured inference workers.
+
+    Uses settings.torch_num_threads, else the available cores split
+    between settings.inference_workers. Variables already set in the
+    environment are kept.
+
+    Returns:
+        The variables in effect, or an empty dict if torch was already imported
+    """
+    global _thread_env
+    if "torch" in sys.modules:
+        logger.warning("torch already imported; OpenMP/BLAS thread variables not applied")
+        return {}
+
+    workers = max(1, settings.inference_workers)
+    threads = settings.torch_num_threads or max(1, len(get_available_cores()) // workers)
+    for var in THREAD_ENV_VARS:
+        os.environ.setdefault(var, str(threads))
+
+    _thread_env = {var: os.environ[var] for var in THREAD_ENV_VARS}
+    return dict(_thread_env)
+
+
+def get_thread_env() -> Dict[str, str]:
+    """Get the thread variables applied before torch loaded (empty if none)."""
+    return dict(_thread_env)
@@ -1,26 +1,54 @@
 """WebRTC module for Scene Descriptor."""
 
-from .tracks import VideoCaptionTrack
+from .tracks import CaptionSession, VideoCaptionTrack
+from .capture_window import CaptureWindowController
+from .media_clock import MediaClock
 from .connection import (
     create_peer_connection,
     remove_peer_connection,
     close_all_connections,
     get_connection_count,
+    add_frame_socket,
+    remove_frame_socket,
+    get_frame_socket_count,
     get_relay,
     create_media_player,
     create_media_recorder,
 )
 from .channels import DataChannelManager, create_data_channel_manager
+from .messages import caption_message
+from .commands import Command, parse_command
+from .flow_control import VideoConstraints, constrain_video_answer, target_constraints
+from .frame_socket import (
+    FrameSocketSession,
+    get_frame_decode_pool,
+    shutdown_frame_decode_pool,
+)
 
 __all__ = [
+    "CaptionSession",
     "VideoCaptionTrack",
+    "CaptureWindowController",
+    "MediaClock",
     "create_peer_connection",
     "remove_peer_connection",
     "close_all_connections",
     "get_connection_count",
+    "add_frame_socket",
+    "remove_frame_socket",
+    "get_frame_socket_count",
     "get_relay",
     "create_media_player",
     "create_media_recorder",
     "DataChannelManager",
     "create_data_channel_manager",
+    "caption_message",
+    "Command",
+    "parse_command",
+    "VideoConstraints",
+    "constrain_video_answer",
+    "target_constraints",
+    "FrameSocketSession",
+    "get_frame_decode_pool",
+    "shutdown_frame_decode_pool",
 ]
@@ -0,0 +1,89 @@
+"""
+Adaptive capture window for caption sessions.
+
+Sizes each session's frame-collection window from its recent inference
+time and queue wait, so captions arrive as often as the hardware allows
+without windows piling up behind inference.
+"""
+
+import threading
+from typing import Optional
+
+from ..config import settings
+from ..utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class CaptureWindowController:
+    """
+    Chooses the next capture window length for one session.
+
+    Keeps exponentially smoothed estimates of inference time and queue
+    wait and sets the window to their sum times a headroom factor. A
+    window just longer than a caption takes keeps about one caption in
+    flight per session; when other sessions make the queue wait grow,
+    the window grows with it.
+    """
+
+    def __init__(
+        self,
+        initial_seconds: Optional[float] = None,
+        min_seconds: Optional[float] = None,
+        max_seconds: Optional[float] = None,
+        headroom: Optional[float] = None,
+        smoothing: float = 0.3
+    ):
+        """
+        Initialize the controller.
+
+        Args:
+            initial_seconds: Window used until the first caption is measured
+            min_seconds: Shortest window
+            max_seconds: Longest window
+            headroom: Window / (inference + queue wait) ratio to aim for
+            smoothing: Weight of the newest sample in the moving averages
+        """
+        self._initial = initial_seconds or settings.frame_capture_seconds
+        self._min = min_seconds or settings.min_capture_seconds
+        self._max = max_seconds or settings.max_capture_seconds
+        self._headroom = headroom or settings.capture_window_headroom
+        self._smoothing = smoothing
+
+        self._inference: Optional[float] = None
+        self._queue_wait: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def _smooth(self, current: Optional[float], sample: float) -> float:
+        """Exponential moving average step."""
+        if current is None:
+            return sample
+        return self._smoothing * sample + (1 - self._smoothing) * current
+
+    def record(self, inference_seconds: float, queue_wait_seconds: float) -> None:
+        """
+        Add a measurement from a finished caption.
+
+        Args:
+            inference_seconds: Time spent generating the caption
+            queue_wait_seconds: Time the job waited for an inference worker
+        """
+        with self._lock:
+            self._inference = self._smooth(self._inference, inference_seconds)
+            self._queue_wait = self._smooth(self._queue_wait, queue_wait_seconds)
+
+        logger.debug(
+            f"Capture window sample: inference {inference_seconds:.2f}s, "
+            f"queue wait {queue_wait_seconds:.2f}s -> next window {self.seconds:.2f}s"
+        )
+
+    @property
+    def seconds(self) -> float:
+        """Length of the next capture window."""
+        with self._lock:
+            if not settings.adaptive_capture_window or self._inference is None:
+                target = self._initial
+            else:
+                target = self._headroom * (self._inference + self._queue_wait)
+
+        return min(self._max, max(self._min, target))
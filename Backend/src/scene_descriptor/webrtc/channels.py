@@ -4,12 +4,18 @@ WebRTC data channel management.
 Handles creation and communication via data channels.
 """
 
+import json
 from typing import Callable, Optional
 
 from aiortc import RTCDataChannel, RTCPeerConnection
 
+from .commands import Command, parse_command
+from .flow_control import VideoConstraints
+from .messages import caption_message
 from ..config import WEBRTC_CONST
-from ..enums import DataChannelStatus
+from ..enums import DataChannelStatus, MessageFormat
+from ..services.degradation_service import DegradationLevel
+from ..utils.exceptions import DataChannelError
 from ..utils.logging import get_logger
 from ..utils.state import UseState
 
@@ -20,20 +26,30 @@ class DataChannelManager:
     """
     Manages WebRTC data channel for sending captions.
 
-    Provides state management and message sending capabilities.
+    Provides state management, message sending, and dispatch of client
+    commands (see commands.py) to a registered handler.
     """
 
-    def __init__(self, pc: RTCPeerConnection, channel_name: str = None):
+    def __init__(
+        self,
+        pc: RTCPeerConnection,
+        channel_name: str = None,
+        message_format: MessageFormat = MessageFormat.TEXT
+    ):
         """
         Initialize the data channel manager.
 
         Args:
             pc: The peer connection to create channel on
             channel_name: Name for the data channel
+            message_format: Format of messages sent to the client
         """
         channel_name = channel_name or WEBRTC_CONST.DATA_CHANNEL_NAME
         self._channel: RTCDataChannel = pc.createDataChannel(channel_name)
         self._status = DataChannelStatus.CLOSED
+        self._message_format = message_format
+        self._command_handler: Optional[Callable[[Command], None]] = None
+        self._sent_constraints: Optional[VideoConstraints] = None
 
         # Set up event handlers
         self._setup_handlers()
@@ -61,6 +77,39 @@ class DataChannelManager:
         @self._channel.on("message")
         def on_message(message):
             logger.debug(f"Received message: {message}")
+            self._handle_message(message)
+
+    def _handle_message(self, message) -> None:
+        """Parse a client command and pass it to the command handler."""
+        try:
+            command = parse_command(message)
+        except DataChannelError as e:
+            self.send_status({"type": "error", "error": e.message})
+            return
+
+        if self._command_handler is None:
+            logger.warning(f"Ignoring {command.type.value} command: no video track yet")
+            self.send_status({"type": "error", "error": "no video track", "command": command.type.value})
+            return
+
+        try:
+            self._command_handler(command)
+        except Exception as e:
+            logger.error(f"Command {command.type.value} failed: {e}", exc_info=True)
+            self.send_status({"type": "error", "error": str(e), "command": command.type.value})
+            return
+
+        logger.info(f"Client command: {command.type.value} (seconds={command.seconds})")
+        self.send_status({"type": "ack", "command": command.type.value, "seconds": command.seconds})
+
+    def on_command(self, handler: Callable[[Command], None]) -> None:
+        """
+        Register the handler for client commands.
+
+        Args:
+            handler: Called with each valid Command
+        """
+        self._command_handler = handler
 
     @property
     def status(self) -> DataChannelStatus:
@@ -99,22 +148,68 @@ class DataChannelManager:
             logger.error(f"Failed to send message: {e}")
             return False
 
-    def send_caption(self, caption: str) -> bool:
+    @property
+    def message_format(self) -> MessageFormat:
+        """Get the session message format."""
+        return self._message_format
+
+    def send_caption(
+        self,
+        caption: str,
+        degradation: Optional[DegradationLevel] = None
+    ) -> bool:
         """
         Send a caption through the data channel.
 
         Args:
             caption: The caption text to send
+            degradation: Degradation level the caption was generated at
+
+        Returns:
+            True if sent successfully, False otherwise
+        """
+        return self.send(caption_message(caption, self._message_format, degradation))
+
+    def send_status(self, payload: dict) -> bool:
+        """
+        Send a non-caption status message (JSON sessions only).
+
+        Text sessions get nothing, because the app speaks every message.
+
+        Args:
+            payload: JSON-serializable message
 
         Returns:
             True if sent successfully, False otherwise
         """
-        return self.send(caption)
+        if self._message_format != MessageFormat.JSON:
+            return False
+        return self.send(json.dumps(payload))
+
+    def send_video_constraints(self, constraints: VideoConstraints) -> bool:
+        """
+        Ask the client to limit what its camera sends, if the limits changed.
+
+        Args:
+            constraints: Current send limits for the session
+
+        Returns:
+            True if a message was sent
+        """
+        if constraints == self._sent_constraints or not self.is_open:
+            return False
+
+        sent = self.send_status(constraints.to_message())
+        if sent:
+            logger.info(f"Requested client video limits: {constraints}")
+        self._sent_constraints = constraints
+        return sent
 
 
 def create_data_channel_manager(
     pc: RTCPeerConnection,
-    channel_name: str = None
+    channel_name: str = None,
+    message_format: MessageFormat = MessageFormat.TEXT
 ) -> DataChannelManager:
     """
     Create a new data channel manager.
@@ -122,8 +217,9 @@ def create_data_channel_manager(
     Args:
         pc: The peer connection
         channel_name: Optional channel name
+        message_format: Format of messages sent to the client
 
     Returns:
         DataChannelManager instance
     """
-    return DataChannelManager(pc, channel_name)
+    return DataChannelManager(pc, channel_name, message_format)
@@ -0,0 +1,82 @@
+"""
+Client command protocol for the data channel.
+
+Clients send JSON objects such as {"type": "describe", "seconds": 3}, or
+a bare command name ("describe", "pause", "resume").
+
+Commands:
+    describe  Caption the last `seconds` seconds right away
+    pause     Stop captioning (frames are discarded)
+    resume    Resume captioning
+    cadence   Set periodic captioning: `seconds` > 0 fixed window,
+              0 on demand only, omitted/null adaptive
+"""
+
+import json
+import math
+from dataclasses import dataclass
+from typing import Optional
+
+from ..config import settings
+from ..enums import ClientCommand
+from ..utils.exceptions import DataChannelError
+
+# Cadence value meaning "only caption on describe"
+ON_DEMAND = 0.0
+
+
+@dataclass
+class Command:
+    """A parsed client command."""
+
+    type: ClientCommand
+    seconds: Optional[float] = None
+
+
+def parse_command(message) -> Command:
+    """
+    Parse a data channel message into a command.
+
+    Args:
+        message: Raw message (str or bytes)
+
+    Returns:
+        Parsed Command
+
+    Raises:
+        DataChannelError: If the message is not a valid command
+    """
+    if isinstance(message, bytes):
+        message = message.decode("utf-8", errors="replace")
+
+    text = message.strip()
+    try:
+        payload = json.loads(text) if text.startswith("{") else {"type": text}
+    except json.JSONDecodeError as e:
+        raise DataChannelError(f"Invalid command JSON: {text[:50]}", cause=e)
+
+    try:
+        command_type = ClientCommand(str(payload.get("type", "")).lower())
+    except ValueError:
+        raise DataChannelError(f"Unknown command: {payload.get('type')}")
+
+    seconds = payload.get("seconds")
+    if seconds is not None:
+        try:
+            seconds = float(seconds)
+        except (TypeError, ValueError):
+            raise DataChannelError(f"Invalid seconds for {command_type.value}: {seconds}")
+        if not math.isfinite(seconds) or seconds < 0:
+            raise DataChannelError(f"Invalid seconds for {command_type.value}: {seconds}")
+
+    if command_type == ClientCommand.DESCRIBE:
+        seconds = min(seconds or settings.describe_default_seconds, settings.describe_max_seconds)
+    elif command_type == ClientCommand.CADENCE and seconds:
+        seconds = min(settings.max_capture_seconds, max(settings.min_capture_seconds, seconds))
+
+    return Command(type=command_type, seconds=seconds)
+
+
+def initial_cadence() -> Optional[float]:
+    """Cadence new sessions start with (from settings.caption_mode)."""
+    return ON_DEMAND if settings.caption_mode.lower() == "on_demand" else None
@@ -1,25 +1,34 @@
 """
 WebRTC peer connection management.
 
-Handles creation and lifecycle of peer connections.
+Handles creation and lifecycle of peer connections, and tracks frame
+sockets (see frame_socket.py) so both count as active sessions.
 """
 
 import uuid
 from typing import Set, Optional
 
+from aiohttp import WSCloseCode, web
 from aiortc import RTCPeerConnection, RTCSessionDescription
 from aiortc.contrib.media import MediaBlackhole, MediaPlayer, MediaRelay
 
 from ..config import settings, WEBRTC_CONST
 from ..utils.logging import get_logger
+from ..utils.metrics import get_metrics
 
 logger = get_logger(__name__)
 
 # Global connection tracking
 _peer_connections: Set[RTCPeerConnection] = set()
+_frame_sockets: Set[web.WebSocketResponse] = set()
 _relay: Optional[MediaRelay] = None
 
 
+def _update_session_gauge() -> None:
+    """Publish the number of live sessions of either kind."""
+    get_metrics().set_gauge("active_sessions", len(_peer_connections) + len(_frame_sockets))
+
+
 def get_relay() -> MediaRelay:
     """Get or create the media relay singleton."""
     global _relay
@@ -39,6 +48,7 @@ def create_peer_connection() -> tuple[RTCPeerConnection, str]:
     pc_id = f"PeerConnection({uuid.uuid4()})"
 
     _peer_connections.add(pc)
+    _update_session_gauge()
     logger.info(f"Created peer connection: {pc_id}")
 
     return pc, pc_id
@@ -52,12 +62,39 @@ def remove_peer_connection(pc: RTCPeerConnection) -> None:
         pc: The peer connection to remove
     """
     _peer_connections.discard(pc)
+    _update_session_gauge()
     logger.debug(f"Removed peer connection, {len(_peer_connections)} remaining")
 
 
+def add_frame_socket(ws: web.WebSocketResponse) -> None:
+    """
+    Track a frame socket session.
+
+    Args:
+        ws: The prepared WebSocket
+    """
+    _frame_sockets.add(ws)
+    _update_session_gauge()
+    logger.info(f"Opened frame socket, {len(_frame_sockets)} active")
+
+
+def remove_frame_socket(ws: web.WebSocketResponse) -> None:
+    """
+    Remove a frame socket session from tracking.
+
+    Args:
+        ws: The WebSocket to remove
+    """
+    _frame_sockets.discard(ws)
+    _update_session_gauge()
+    logger.debug(f"Removed frame socket, {len(_frame_sockets)} remaining")
+
+
 async def close_all_connections() -> None:
-    """Close all tracked peer connections."""
-    logger.info(f"Closing {len(_peer_connections)} peer connections")
+    """Close all tracked peer connections and frame sockets."""
+    logger.info(
+        f"Closing {len(_peer_connections)} peer connections and {len(_frame_sockets)} frame sockets"
+    )
 
     for pc in list(_peer_connections):
         try:
@@ -65,7 +102,15 @@ async def close_all_connections() -> None:
         except Exception as e:
             logger.warning(f"Error closing peer connection: {e}")
 
+    for ws in list(_frame_sockets):
+        try:
+            await ws.close(code=WSCloseCode.GOING_AWAY, message=b"Server shutdown")
+        except Exception as e:
+            logger.warning(f"Error closing frame socket: {e}")
+
     _peer_connections.clear()
+    _frame_sockets.clear()
+    get_metrics().set_gauge("active_sessions", 0)
     logger.info("All peer connections closed")
 
 
@@ -74,6 +119,11 @@ def get_connection_count() -> int:
     return len(_peer_connections)
 
 
+def get_frame_socket_count() -> int:
+    """Get the number of active frame sockets."""
+    return len(_frame_sockets)
+
+
 def create_media_player(audio_file: str) -> MediaPlayer:
     """
     Create a media player for audio playback.
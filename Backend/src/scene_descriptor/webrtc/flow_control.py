@@ -0,0 +1,143 @@
+"""
+Sender-side flow control for client cameras.
+
+Captioning only needs a few small frames per window, so the server asks
+clients not to send more: limits in the SDP answer when the session
+starts, and video_constraints messages when load or session state
+changes.
+"""
+
+from dataclasses import asdict, dataclass
+from typing import List, Optional
+
+from ..config import settings
+from ..services.degradation_service import DegradationLevel
+from ..utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Frame rate requested while captioning is paused
+PAUSED_FRAMERATE = 1
+
+# Lowest bitrate ever requested (kbps)
+MIN_BITRATE_KBPS = 100
+
+
+@dataclass(frozen=True)
+class VideoConstraints:
+    """Upper limits for what a client camera should send."""
+
+    max_width: int
+    max_height: int
+    max_framerate: int
+    max_bitrate_kbps: int
+
+    def to_message(self) -> dict:
+        """Convert to a data channel control message."""
+        return {"type": "video_constraints", **asdict(self)}
+
+
+def target_constraints(
+    level: Optional[DegradationLevel] = None,
+    paused: bool = False
+) -> VideoConstraints:
+    """
+    Get the send limits for a session.
+
+    Frame rate and bitrate are halved while the server is degraded (decode
+    cost grows with both) and dropped to a trickle while paused.
+
+    Args:
+        level: Current degradation level
+        paused: Whether the session has paused captioning
+
+    Returns:
+        VideoConstraints for the client
+    """
+    framerate = settings.target_video_fps
+    bitrate = settings.target_video_bitrate_kbps
+
+    if paused:
+        framerate = PAUSED_FRAMERATE
+        bitrate = MIN_BITRATE_KBPS
+    elif level is not None and level.level > 0:
+        framerate = max(PAUSED_FRAMERATE, framerate // 2)
+        bitrate = max(MIN_BITRATE_KBPS, bitrate // 2)
+
+    return VideoConstraints(
+        max_width=settings.target_video_width,
+        max_height=settings.target_video_height,
+        max_framerate=framerate,
+        max_bitrate_kbps=bitrate,
+    )
+
+
+def _video_section_lines(constraints: VideoConstraints) -> List[str]:
+    """SDP attribute lines appended to the video media section."""
+    return [
+        f"a=framerate:{constraints.max_framerate}",
+        f"a=imageattr:* recv [x=[16:{constraints.max_width}],y=[16:{constraints.max_height}]]",
+    ]
+
+
+def constrain_video_answer(sdp: str, constraints: VideoConstraints) -> str:
+    """
+    Add bandwidth, frame rate and resolution limits to an SDP answer.
+
+    Adds b=AS / b=TIAS to each video media section, which browsers and
+    flutter-webrtc apply as the sender's bitrate cap; the encoder then
+    lowers resolution and frame rate to fit. a=framerate and
+    a=imageattr state the preferred limits explicitly for clients that
+    honour them.
+
+    Args:
+        sdp: SDP answer from the peer connection
+        constraints: Limits to request
+
+    Returns:
+        Modified SDP
+    """
+    lines = sdp.split("\r\n")
+    trailing = lines[-1] == ""
+    if trailing:
+        lines = lines[:-1]
+
+    bandwidth = [
+        f"b=AS:{constraints.max_bitrate_kbps}",
+        f"b=TIAS:{constraints.max_bitrate_kbps * 1000}",
+    ]
+
+    result: List[str] = []
+    in_video = False
+    pending_bandwidth = False
+
+    def close_section() -> None:
+        if in_video:
+            if pending_bandwidth:
+                result.extend(bandwidth)
+            result.extend(_video_section_lines(constraints))
+
+    for line in lines:
+        if line.startswith("m="):
+            close_section()
+            in_video = line.startswith("m=video")
+            pending_bandwidth = in_video
+            result.append(line)
+            continue
+
+        if in_video:
+            # Drop existing limits; ours replace them
+            if line.startswith(("b=AS:", "b=TIAS:", "a=framerate:", "a=imageattr:")):
+                continue
+            # b= lines follow i= and c= lines (RFC 4566 field order)
+            if pending_bandwidth and not line.startswith(("i=", "c=")):
+                result.extend(bandwidth)
+                pending_bandwidth = False
+
+        result.append(line)
+
+    close_section()
+
+    if trailing:
+        result.append("")
+    return "\r\n".join(result)
@@ -0,0 +1,302 @@
+"""
+WebSocket frame ingest, a lightweight alternative to WebRTC.
+
+Clients that cannot afford a WebRTC stack send downscaled JPEG frames
+over one WebSocket and get captions back on the same socket. Frames are
+decoded on a small thread pool shared by all sockets, straight into the
+session's keyframe store, and feed the same CaptionSession pipeline as
+VideoCaptionTrack.
+
+Protocol:
+    binary  One frame: an 8-byte big-endian float64 timestamp in seconds
+            (capture time, any origin) followed by the JPEG. A message
+            that starts with the JPEG itself uses arrival time instead.
+    text    A client command (see commands.py); JSON sessions get an
+            ack or error status back.
+
+    Server messages are the same as on the data channel: captions as
+    plain text or JSON (see messages.py), and for JSON sessions status
+    and video_constraints messages.
+
+Each socket decodes at most one frame at a time. Frames arriving while
+one is being decoded replace the waiting frame (latest-frame mode), so a
+slow server drops frames instead of falling behind the camera.
+"""
+
+import asyncio
+import json
+import struct
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+from aiohttp import WSMsgType, web
+
+from .commands import parse_command
+from .flow_control import VideoConstraints
+from .messages import caption_message
+from .tracks import CaptionSession
+from ..config import settings
+from ..enums import CapStatus, MessageFormat
+from ..utils.exceptions import DataChannelError, FrameProcessingError
+from ..utils.logging import get_logger
+from ..utils.metrics import get_metrics
+
+logger = get_logger(__name__)
+
+# Binary frame header: capture timestamp in seconds
+FRAME_HEADER = struct.Struct(">d")
+
+# JPEG start-of-image marker (frames sent without a header)
+JPEG_SOI = b"\xff\xd8"
+
+
+def parse_frame_message(data: bytes) -> Tuple[float, bytes]:
+    """
+    Split a binary frame message into timestamp and JPEG.
+
+    Args:
+        data: Raw WebSocket message
+
+    Returns:
+        (timestamp in seconds, JPEG bytes)
+
+    Raises:
+        FrameProcessingError: If the message holds no JPEG
+    """
+    if data.startswith(JPEG_SOI):
+        return time.monotonic(), data
+    if len(data) <= FRAME_HEADER.size:
+        raise FrameProcessingError(f"Frame message too short ({len(data)} bytes)")
+
+    (timestamp,) = FRAME_HEADER.unpack_from(data)
+    jpeg = data[FRAME_HEADER.size:]
+    if not jpeg.startswith(JPEG_SOI) or not np.isfinite(timestamp):
+        raise FrameProcessingError("Frame message is not a timestamp followed by a JPEG")
+    return timestamp, jpeg
+
+
+def decode_jpeg(jpeg: bytes, analysis_width: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Decode a JPEG frame and its scoring plane (runs on the decode pool).
+
+    Args:
+        jpeg: Encoded frame
+        analysis_width: Width of the grey plane used for keyframe scoring
+
+    Returns:
+        (BGR frame, grey plane analysis_width wide)
+
+    Raises:
+        FrameProcessingError: If the JPEG cannot be decoded
+    """
+    image = cv2.imdecode(np.frombuffer(jpeg, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if image is None:
+        raise FrameProcessingError("Could not decode JPEG frame")
+
+    height, width = image.shape[:2]
+    luma_height = max(2, round(height * analysis_width / width / 2) * 2)
+    luma = cv2.resize(
+        cv2.cvtColor(image, cv2.COLOR_BGR2GRAY),
+        (analysis_width, luma_height),
+        interpolation=cv2.INTER_AREA
+    )
+    return image, luma
+
+
+def _to_rgb(image: np.ndarray, width: int, height: int) -> np.ndarray:
+    """Convert a decoded BGR frame to RGB at the window's frame size."""
+    if image.shape[1] != width or image.shape[0] != height:
+        image = cv2.resize(image, (width, height), interpolation=cv2.INTER_AREA)
+    return cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+
+
+class FrameSocketSession:
+    """
+    Caption session fed by JPEG frames over a WebSocket.
+
+    Reads frames and commands from the socket, decodes the latest frame
+    on the shared decode pool, and pushes captions back as soon as
+    inference finishes.
+    """
+
+    def __init__(
+        self,
+        ws: web.WebSocketResponse,
+        message_format: MessageFormat = MessageFormat.TEXT
+    ):
+        """
+        Initialize the session.
+
+        Args:
+            ws: The prepared WebSocket
+            message_format: Format of messages sent to the client
+        """
+        self._ws = ws
+        self._message_format = message_format
+        self._captioner = CaptionSession()
+        self._loop = asyncio.get_running_loop()
+
+        # Latest frame waiting for the decoder (timestamp, JPEG)
+        self._pending: Optional[Tuple[float, bytes]] = None
+        self._frame_ready = asyncio.Event()
+
+        self._caption_events: asyncio.Queue = asyncio.Queue()
+        self._sent_constraints: Optional[VideoConstraints] = None
+        self._frames: int = 0
+
+        logger.debug("FrameSocketSession initialized")
+
+    async def run(self) -> None:
+        """Serve the socket until the client disconnects."""
+        decoder = asyncio.create_task(self._decode_frames())
+        sender = asyncio.create_task(self._send_captions())
+        await self._send_video_constraints()
+
+        try:
+            async for message in self._ws:
+                if message.type == WSMsgType.BINARY:
+                    self._offer_frame(message.data)
+                elif message.type == WSMsgType.TEXT:
+                    await self._handle_command(message.data)
+                elif message.type == WSMsgType.ERROR:
+                    logger.warning(f"Frame socket error: {self._ws.exception()}")
+                    break
+        finally:
+            decoder.cancel()
+            sender.cancel()
+            await asyncio.gather(decoder, sender, return_exceptions=True)
+            logger.info(f"Frame socket closed after {self._frames} frames")
+
+    def _offer_frame(self, data: bytes) -> None:
+        """Queue a frame for decoding, replacing one still waiting."""
+        if not self._captioner.accepting_frames:
+            return
+
+        try:
+            frame = parse_frame_message(data)
+        except FrameProcessingError:
+            get_metrics().increment("frame_socket_bad_frames")
+            return
+
+        if self._pending is not None:
+            self._captioner.drop_frame("frames_dropped_busy")
+        self._pending = frame
+        self._frame_ready.set()
+
+    async def _decode_frames(self) -> None:
+        """Decode the latest waiting frame and add it to the caption window."""
+        pool = get_frame_decode_pool()
+        while True:
+            await self._frame_ready.wait()
+            self._frame_ready.clear()
+            timestamp, jpeg = self._pending
+            self._pending = None
+
+            try:
+                await self._ingest_frame(pool, timestamp, jpeg)
+            except FrameProcessingError:
+                get_metrics().increment("frame_socket_bad_frames")
+            except Exception as e:
+                # Keep the session alive; one bad frame must not stop captioning
+                logger.error(f"Frame socket ingest failed: {e}", exc_info=True)
+                get_metrics().increment("frame_socket_ingest_errors")
+
+    async def _ingest_frame(self, pool: ThreadPoolExecutor, timestamp: float, jpeg: bytes) -> None:
+        """Decode one frame on the pool and add it to the caption window."""
+        image, luma = await self._loop.run_in_executor(
+            pool, decode_jpeg, jpeg, settings.keyframe_analysis_width
+        )
+
+        # Paused while this frame was being decoded
+        if not self._captioner.accepting_frames:
+            return
+
+        self._frames += 1
+        self._captioner.ingest(
+            timestamp,
+            (image.shape[1], image.shape[0]),
+            luma,
+            lambda width, height: _to_rgb(image, width, height),
+            self._set_caption_state
+        )
+        await self._send_video_constraints()
+
+    def _set_caption_state(self, status: CapStatus) -> None:
+        """Caption state callback; called from inference workers."""
+        self._loop.call_soon_threadsafe(self._caption_events.put_nowait, status)
+
+    async def _send_captions(self) -> None:
+        """Send each new caption as soon as it is generated."""
+        while True:
+            status = await self._caption_events.get()
+            caption = self._captioner.caption
+            if status != CapStatus.NEW_CAP or not caption:
+                continue
+            await self._send(caption_message(caption, self._message_format, self._captioner.degradation))
+
+    async def _handle_command(self, message: str) -> None:
+        """Parse a client command and apply it to the session."""
+        try:
+            command = parse_command(message)
+        except DataChannelError as e:
+            await self._send_status({"type": "error", "error": e.message})
+            return
+
+        try:
+            self._captioner.handle_command(command)
+        except Exception as e:
+            logger.error(f"Command {command.type.value} failed: {e}", exc_info=True)
+            await self._send_status({"type": "error", "error": str(e), "command": command.type.value})
+            return
+
+        logger.info(f"Client command: {command.type.value} (seconds={command.seconds})")
+        await self._send_status({"type": "ack", "command": command.type.value, "seconds": command.seconds})
+        await self._send_video_constraints()
+
+    async def _send_video_constraints(self) -> None:
+        """Ask the client to limit what it sends, if the limits changed."""
+        constraints = self._captioner.video_constraints()
+        if constraints == self._sent_constraints:
+            return
+        self._sent_constraints = constraints
+        await self._send_status(constraints.to_message())
+
+    async def _send_status(self, payload: dict) -> None:
+        """Send a non-caption status message (JSON sessions only)."""
+        if self._message_format == MessageFormat.JSON:
+            await self._send(json.dumps(payload))
+
+    async def _send(self, message: str) -> None:
+        """Send a text message unless the socket is closing."""
+        if self._ws.closed:
+            return
+        try:
+            await self._ws.send_str(message)
+        except ConnectionResetError as e:
+            logger.debug(f"Frame socket gone while sending: {e}")
+
+
+# Singleton instance
+_decode_pool: Optional[ThreadPoolExecutor] = None
+
+
+def get_frame_decode_pool() -> ThreadPoolExecutor:
+    """Get the JPEG decode pool shared by all frame sockets."""
+    global _decode_pool
+    if _decode_pool is None:
+        _decode_pool = ThreadPoolExecutor(
+            max_workers=max(1, settings.frame_socket_decode_workers),
+            thread_name_prefix="frame-decode"
+        )
+    return _decode_pool
+
+
+def shutdown_frame_decode_pool() -> None:
+    """Stop the decode pool if it was created."""
+    global _decode_pool
+    if _decode_pool is not None:
+        _decode_pool.shutdown(wait=False, cancel_futures=True)
+        _decode_pool = None
@@ -0,0 +1,102 @@
+"""
+Media clock for received video frames.
+
+Maps frame presentation timestamps to wall-clock time so the receive
+loop can tell how far behind the camera it is running.
+"""
+
+import time
+from collections import deque
+from fractions import Fraction
+from typing import Deque, Optional, Tuple
+
+from ..utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# A pts jump larger than this (seconds) is treated as a stream discontinuity
+DISCONTINUITY_SECONDS = 5.0
+
+# The zero-lag baseline is the smallest offset seen over this many seconds
+# of live streaming (see MediaClock)
+BASELINE_WINDOW_SECONDS = 5.0
+
+
+class MediaClock:
+    """
+    Tracks the offset between frame pts and the local wall clock.
+
+    The smallest (arrival time - pts) offset observed over the last
+    BASELINE_WINDOW_SECONDS is taken as the zero-lag baseline, since that
+    frame reached us with the least delay. A frame's lag is how much later
+    than that baseline it arrived. Because old offsets age out, a lasting
+    rise in network delay or clock drift moves the baseline up instead of
+    making every later frame look stale.
+
+    The window ages by the smaller of the arrival and pts steps between
+    frames. A receive loop stall (a long arrival step) and the burst of
+    buffered frames that follows (short arrival steps) therefore barely
+    age it, so the baseline survives the stall and the buffered frames
+    show their real lag.
+    """
+
+    def __init__(self):
+        """Initialize with no baseline."""
+        # (window time, offset) with increasing offsets; the first is the minimum
+        self._offsets: Deque[Tuple[float, float]] = deque()
+        self._last_pts_seconds: Optional[float] = None
+        self._last_arrival: Optional[float] = None
+        # Seconds of live streaming observed, used to age the window
+        self._window_time: float = 0.0
+
+    @staticmethod
+    def pts_seconds(frame) -> Optional[float]:
+        """
+        Get a frame's presentation time in seconds.
+
+        Args:
+            frame: av.VideoFrame
+
+        Returns:
+            pts * time_base, or None if the frame has no timestamp
+        """
+        if frame.pts is None or frame.time_base is None:
+            return None
+        return float(frame.pts * Fraction(frame.time_base))
+
+    def lag(self, frame, now: Optional[float] = None) -> float:
+        """
+        Observe a frame and return how far behind real time it is.
+
+        Args:
+            frame: av.VideoFrame just returned by the track
+            now: Arrival time (time.monotonic(); defaults to now)
+
+        Returns:
+            Lag in seconds (0 for frames without a timestamp)
+        """
+        pts_seconds = self.pts_seconds(frame)
+        if pts_seconds is None:
+            return 0.0
+
+        now = time.monotonic() if now is None else now
+
+        if self._last_pts_seconds is not None:
+            pts_step = pts_seconds - self._last_pts_seconds
+            if abs(pts_step) > DISCONTINUITY_SECONDS:
+                logger.debug("Frame pts discontinuity, resetting media clock")
+                self._offsets.clear()
+            else:
+                self._window_time += max(0.0, min(pts_step, now - self._last_arrival))
+        self._last_pts_seconds = pts_seconds
+        self._last_arrival = now
+
+        # Sliding-window minimum of the offset
+        offset = now - pts_seconds
+        while self._offsets and self._offsets[-1][1] >= offset:
+            self._offsets.pop()
+        self._offsets.append((self._window_time, offset))
+        while self._offsets[0][0] < self._window_time - BASELINE_WINDOW_SECONDS:
+            self._offsets.popleft()
+
+        return offset - self._offsets[0][1]
@@ -0,0 +1,37 @@
+"""
+Data channel message formatting.
+
+Caption messages are plain text by default, which the app speaks as-is.
+Sessions that opt into JSON also receive server status with each caption.
+"""
+
+import json
+from typing import Optional
+
+from ..enums import MessageFormat
+from ..services.degradation_service import DegradationLevel
+
+
+def caption_message(
+    caption: str,
+    message_format: MessageFormat = MessageFormat.TEXT,
+    degradation: Optional[DegradationLevel] = None
+) -> str:
+    """
+    Format a caption for the data channel.
+
+    Args:
+        caption: Caption text
+        message_format: Session message format
+        degradation: Degradation level the caption was generated at
+
+    Returns:
+        Message string to send
+    """
+    if message_format != MessageFormat.JSON:
+        return caption
+
+    payload = {"type": "caption", "text": caption}
+    if degradation is not None:
+        payload["degradation"] = {"level": degradation.level, "name": degradation.name}
+    return json.dumps(payload)
@@ -2,115 +2,170 @@
 Video track handler for WebRTC streams.
 
 Processes video frames from WebRTC connections and generates captions.
+CaptionSession holds the transport-independent part, so other frame
+sources (see frame_socket.py) feed the same pipeline.
 """
 
 import time
-from threading import Thread
-from typing import Callable, List, Optional
+from typing import Callable, Optional, Tuple
 
 import av
 import numpy as np
 from aiortc import MediaStreamTrack
 from aiortc.mediastreams import MediaStreamError
 
-from ..config import HP, settings
-from ..enums import CapStatus
-from ..models import get_model_manager, sample_frames, convert_frames_to_av
+from ..config import settings
+from ..enums import CapStatus, ClientCommand
+from ..models import (
+    get_model_manager,
+    get_inference_pool,
+    KeyframeSelector,
+    convert_frames_to_av,
+)
+from .capture_window import CaptureWindowController
+from .commands import ON_DEMAND, Command, initial_cadence
+from .flow_control import VideoConstraints, target_constraints
+from .media_clock import MediaClock
+from ..services.degradation_service import DegradationLevel, get_degradation_controller
 from ..utils.logging import get_logger
+from ..utils.metrics import get_metrics
 from ..utils.exceptions import FrameProcessingError
 
 logger = get_logger(__name__)
 
 
-class VideoCaptionTrack:
+class CaptionSession:
     """
-    Video stream track that processes frames and generates captions.
+    Caption state of one live session, fed one frame at a time.
 
-    Collects frames for a configurable duration, samples them,
-    and runs ML inference in a background thread.
-    """
+    Collects frames for a configurable duration of media time (frame
+    timestamps), keeps the best-scoring keyframes, and runs ML inference on
+    the shared inference pool. The window length adapts to measured
+    inference time and queue wait unless the client sets a fixed cadence;
+    window length, frame count, caption length, resolution and model also
+    follow the current degradation level.
 
-    def __init__(self, track: MediaStreamTrack):
-        """
-        Initialize the video caption track.
+    Clients can pause captioning, switch to on-demand captioning, or ask
+    for a description of the last few seconds (see commands.py).
+    """
 
-        Args:
-            track: The WebRTC media stream track to process
-        """
-        self._track: MediaStreamTrack = track
+    def __init__(self):
+        """Initialize the caption session."""
         self._model_manager = get_model_manager()
 
         # Frame collection
-        self._frames: List[np.ndarray] = []
+        self._keyframes = KeyframeSelector(settings.keyframe_candidates, settings.keyframe_recent_frames)
+        self._frame_size: Optional[tuple] = None
         self._count: int = 0
+        self._dropped: int = 0
+
+        # Media time (pts seconds) of the window's first and latest frame
+        self._window_start: Optional[float] = None
+        self._last_timestamp: Optional[float] = None
+        self._window_end_arrival: float = 0.0
+
+        # Client controls
+        self._paused: bool = False
+        self._cadence: Optional[float] = initial_cadence()
+        self._describe_seconds: Optional[float] = None
+        self._describe_fill: bool = False
 
         # Timing
-        self._start_time: float = time.time()
-        self._is_receiving: bool = False
+        self._capture_window = CaptureWindowController()
+
+        # Degradation level for the current window and the last caption
+        self._level: DegradationLevel = get_degradation_controller().current
+        self._caption_level: Optional[DegradationLevel] = None
 
         # Caption state
         self._caption: str = ""
 
-        logger.debug("VideoCaptionTrack initialized")
-
     @property
     def caption(self) -> str:
         """Get the most recently generated caption."""
         return self._caption
 
-    def _sample_indices(
-        self,
-        clip_len: int,
-        seg_len: int,
-        frame_sample_rate: int = 4
-    ) -> np.ndarray:
+    @property
+    def degradation(self) -> Optional[DegradationLevel]:
+        """Get the degradation level the most recent caption was generated at."""
+        return self._caption_level
+
+    @property
+    def accepting_frames(self) -> bool:
+        """Whether frames are used; paused sessions skip decoding them."""
+        return not self._paused or self._describe_seconds is not None
+
+    def drop_frame(self, metric: str) -> None:
         """
-        Sample frame indices evenly across the collected frames.
+        Count a frame discarded before ingest.
 
         Args:
-            clip_len: Number of frames to sample
-            seg_len: Total number of frames available
-            frame_sample_rate: Sampling rate (unused, kept for compatibility)
-
-        Returns:
-            Array of indices to sample
+            metric: Counter to increment (e.g. frames_dropped_stale)
         """
-        indices = np.linspace(0, seg_len - 1, num=clip_len)
-        indices = np.clip(indices, 0, seg_len - 1).astype(np.int64)
-        return indices
+        self._dropped += 1
+        get_metrics().increment(metric)
 
-    def _sample_frames(self, frames: List[np.ndarray]) -> np.ndarray:
+    def video_constraints(self) -> VideoConstraints:
+        """Get the send limits the client should currently apply."""
+        return target_constraints(self._level, paused=self._paused)
+
+    def handle_command(self, command: Command) -> None:
         """
-        Sample frames from the collected frame list.
+        Apply a client command.
 
         Args:
-            frames: List of frame arrays
-
-        Returns:
-            Array of sampled frames
+            command: Parsed data channel command
         """
-        indices = self._sample_indices(
-            clip_len=HP.CLIP_LENGTH,
-            seg_len=len(frames)
-        )
-        logger.debug(f"Sampling {HP.CLIP_LENGTH} frames from {len(frames)} total")
-        return np.array(frames)[indices]
+        if command.type == ClientCommand.PAUSE:
+            self._paused = True
+            self._describe_seconds = None
+            self._reset()
+        elif command.type == ClientCommand.RESUME:
+            self._paused = False
+            self._reset()
+        elif command.type == ClientCommand.CADENCE:
+            self._cadence = command.seconds
+            self._reset()
+        elif command.type == ClientCommand.DESCRIBE:
+            # Served on the next frame from buffered frames; with nothing
+            # buffered (e.g. paused) it collects `seconds` of new frames first
+            self._describe_seconds = command.seconds
+            self._describe_fill = self._window_start is None
+            get_metrics().increment("describe_requests")
 
     def _predict_caption(
         self,
         pixel_values: np.ndarray,
-        set_caption_state: Callable[[CapStatus], None]
+        set_caption_state: Callable[[CapStatus], None],
+        level: DegradationLevel,
+        submitted_at: float,
+        window_end_arrival: float
     ) -> None:
         """
-        Generate caption in a background thread.
+        Generate caption on an inference worker.
 
         Args:
             pixel_values: Preprocessed frame tensor
             set_caption_state: Callback to update caption state
+            level: Degradation level to generate at
+            submitted_at: time.perf_counter() when the job was queued
+            window_end_arrival: time.monotonic() when the window's last frame arrived
         """
         try:
-            caption = self._model_manager.generate_caption(pixel_values)
+            start_time = time.perf_counter()
+            caption = self._model_manager.generate_caption(
+                pixel_values,
+                max_length=level.max_caption_length,
+                quantized=level.quantized
+            )
+            self._capture_window.record(
+                inference_seconds=time.perf_counter() - start_time,
+                queue_wait_seconds=start_time - submitted_at
+            )
+            # Age of the described scene when its caption became available
+            get_metrics().observe("caption_age", time.monotonic() - window_end_arrival)
             self._caption = caption
+            self._caption_level = level
             logger.info(f"Caption generated: {caption}")
             set_caption_state(CapStatus.NEW_CAP)
 
@@ -118,76 +173,265 @@ class VideoCaptionTrack:
             logger.error(f"Caption generation failed: {e}", exc_info=True)
             set_caption_state(CapStatus.ERROR)
 
-    async def receive(self, set_caption_state: Callable[[CapStatus], None]) -> None:
+    def ingest(
+        self,
+        timestamp: float,
+        size: Tuple[int, int],
+        luma: np.ndarray,
+        load_frame: Callable[[int, int], np.ndarray],
+        set_caption_state: Callable[[CapStatus], None]
+    ) -> None:
         """
-        Receive and process video frames.
+        Add one frame to the current window.
 
-        Collects frames for the configured duration, then processes
-        them and generates a caption.
+        When the window spans the capture duration in media time, or the
+        client asked for a description, processes it and queues a caption.
 
         Args:
+            timestamp: Media time of the frame in seconds
+            size: Frame (width, height)
+            luma: Grey plane settings.keyframe_analysis_width wide, for scoring
+            load_frame: Returns the RGB frame at (width, height); only called if kept
             set_caption_state: Callback to update caption state
         """
-        elapsed = time.time() - self._start_time
-
-        if elapsed <= settings.frame_capture_seconds:
-            # Still collecting frames
-            try:
-                frame = await self._track.recv()
-
-                # Update start time on first frame
-                if not self._is_receiving:
-                    self._start_time = time.time()
-                    self._is_receiving = True
-                    logger.debug("Started receiving frames")
-
-                self._count += 1
 
-                # Convert frame to numpy array
-                img: np.ndarray = frame.to_ndarray(format="rgb24")
-                self._frames.append(img)
-
-            except MediaStreamError as e:
-                logger.warning(f"Media stream error: {e}")
-                return
-
-        else:
-            # Time to process collected frames
-            if not self._frames:
-                logger.warning("No frames collected, skipping processing")
+        if self._last_timestamp is not None:
+            gap = timestamp - self._last_timestamp
+            if gap < -settings.max_frame_gap:
+                logger.info(f"Frame pts jumped back {-gap:.2f}s, restarting window")
                 self._reset()
-                return
+            elif gap > settings.max_frame_gap:
+                logger.info(f"{gap:.2f}s gap in stream, closing window early")
+                if self._cadence == ON_DEMAND or self._paused:
+                    self._reset()
+                else:
+                    self._process_window(set_caption_state, early=True)
+            elif gap < 0:
+                # Reordering jitter: keep timestamps monotonic
+                timestamp = self._last_timestamp
+
+        self._count += 1
+
+        # Score on a small luma plane; only kept candidates are converted to RGB
+        start_time = time.perf_counter()
+        if self._frame_size is None:
+            self._frame_size = size
+        width, height = self._frame_size
+        self._keyframes.add(
+            luma,
+            timestamp,
+            # Clients may change resolution mid-window; keep one size per window
+            lambda: load_frame(width, height)
+        )
+        get_metrics().observe("frame_ingest_time", time.perf_counter() - start_time)
+        if self._window_start is None:
+            self._window_start = timestamp
+        self._last_timestamp = timestamp
+        self._window_end_arrival = time.monotonic()
+
+        if self._describe_seconds is not None:
+            span = timestamp - self._window_start
+            if not self._describe_fill or span >= self._describe_seconds:
+                since = timestamp - self._describe_seconds
+                self._describe_seconds = None
+                self._process_window(set_caption_state, since=since)
+        elif self._cadence == ON_DEMAND:
+            # Keep a rolling window long enough for any describe request
+            self._trim_window(timestamp - settings.describe_max_seconds)
+        elif timestamp - self._window_start >= self._capture_seconds():
+            self._process_window(set_caption_state)
+
+    def _capture_seconds(self) -> float:
+        """Length of the current window: client cadence or adaptive, scaled by degradation."""
+        base = self._cadence if self._cadence else self._capture_window.seconds
+        return base * self._level.capture_scale
+
+    def _trim_window(self, since: float) -> None:
+        """Drop candidates older than `since` from the current window."""
+        if self._window_start is not None and self._window_start < since:
+            self._keyframes.evict_before(since)
+            self._window_start = since
+
+    def _process_window(
+        self,
+        set_caption_state: Callable[[CapStatus], None],
+        early: bool = False,
+        since: Optional[float] = None
+    ) -> None:
+        """
+        Sample and preprocess the collected window and queue its caption.
 
-            logger.info(f"Processing {len(self._frames)} frames")
+        Args:
+            set_caption_state: Callback to update caption state
+            early: Window was cut short by a stream gap
+            since: Only use frames from this media time on (describe requests)
+        """
+        if since is not None:
+            self._trim_window(since)
 
-            try:
-                # Sample frames
-                sampled_frames = self._sample_frames(self._frames)
+        if not len(self._keyframes):
+            logger.warning("No frames collected, skipping processing")
+            self._reset()
+            return
 
-                # Convert to AV format
-                processed_frames = convert_frames_to_av(sampled_frames)
+        duration = self._last_timestamp - self._window_start
+        if early and duration < settings.min_capture_seconds:
+            logger.info(f"Discarding {duration:.2f}s window cut short by a gap")
+            self._reset()
+            return
 
-                # Preprocess for model
-                pixel_values = self._model_manager.preprocess_frames(processed_frames)
+        logger.info(
+            f"Processing {self._count} frames over {duration:.2f}s "
+            f"({self._dropped} stale frames dropped)"
+        )
 
-                # Start inference in background thread
-                logger.debug("Starting caption generation thread")
-                thread = Thread(
-                    target=self._predict_caption,
-                    args=(pixel_values, set_caption_state)
-                )
-                thread.start()
+        # Pick the level for this caption (and the next window) from current load
+        level = get_degradation_controller().evaluate()
+        self._level = level
 
-            except Exception as e:
-                logger.error(f"Frame processing failed: {e}", exc_info=True)
-                set_caption_state(CapStatus.ERROR)
+        try:
+            # Pick sharp, well-spread keyframes
+            sampled_frames, _ = self._keyframes.select(
+                level.clip_length, self._window_start, self._last_timestamp
+            )
+
+            # Convert to AV format
+            processed_frames = convert_frames_to_av(sampled_frames)
+
+            # Preprocess for model
+            pixel_values = self._model_manager.preprocess_frames(
+                processed_frames,
+                image_size=level.image_size
+            )
+
+            # Queue inference on the shared worker pool
+            logger.debug("Queueing caption generation")
+            get_inference_pool().submit(
+                self._predict_caption,
+                pixel_values,
+                set_caption_state,
+                level,
+                time.perf_counter(),
+                self._window_end_arrival
+            )
 
-            # Reset for next batch
-            self._reset()
+        except Exception as e:
+            logger.error(f"Frame processing failed: {e}", exc_info=True)
+            set_caption_state(CapStatus.ERROR)
+
+        # Reset for next batch
+        self._reset()
 
     def _reset(self) -> None:
         """Reset frame collection for the next batch."""
         self._count = 0
-        self._frames = []
-        self._start_time = time.time()
+        self._dropped = 0
+        self._keyframes.reset()
+        self._window_start = None
+        self._last_timestamp = None
+        self._frame_size = None
         logger.debug("Frame collection reset")
+
+
+class VideoCaptionTrack(CaptionSession):
+    """
+    Caption session fed by a WebRTC video track.
+
+    Drops frames that lag real time (latest-frame mode) before decoding
+    them to RGB, and scores frames on a luma plane scaled by libav.
+    """
+
+    def __init__(self, track: MediaStreamTrack):
+        """
+        Initialize the video caption track.
+
+        Args:
+            track: The WebRTC media stream track to process
+        """
+        super().__init__()
+        self._track: MediaStreamTrack = track
+        self._media_clock = MediaClock()
+        self._is_receiving: bool = False
+
+        # Media time and arrival of the last ingested frame, for frames without pts
+        self._last_media_time: Optional[float] = None
+        self._last_arrival: float = 0.0
+
+        logger.debug("VideoCaptionTrack initialized")
+
+    async def receive(self, set_caption_state: Callable[[CapStatus], None]) -> None:
+        """
+        Receive and process video frames.
+
+        Receives one frame from the track and ingests it into the current
+        window, unless it is stale or the session is paused.
+
+        Args:
+            set_caption_state: Callback to update caption state
+        """
+        try:
+            frame = await self._track.recv()
+        except MediaStreamError as e:
+            logger.warning(f"Media stream error: {e}")
+            return
+
+        if not self._is_receiving:
+            self._is_receiving = True
+            logger.debug("Started receiving frames")
+
+        # Latest-frame mode: skip frames buffered while we were busy
+        if self._is_stale(frame):
+            self.drop_frame("frames_dropped_stale")
+            return
+
+        # Paused: keep draining the track without spending CPU on frames
+        if not self.accepting_frames:
+            return
+
+        self.ingest(
+            self._media_time(frame),
+            (frame.width, frame.height),
+            self._luma(frame),
+            lambda width, height: frame.to_ndarray(width=width, height=height, format="rgb24"),
+            set_caption_state
+        )
+
+    def _luma(self, frame: av.VideoFrame) -> np.ndarray:
+        """Downscale a frame to a grey plane settings.keyframe_analysis_width wide."""
+        width = settings.keyframe_analysis_width
+        height = max(2, round(frame.height * width / frame.width / 2) * 2)
+        return frame.reformat(width=width, height=height, format="gray").to_ndarray()
+
+    def _media_time(self, frame: av.VideoFrame) -> float:
+        """
+        Get a frame's media time in seconds.
+
+        A frame without pts continues from the previous frame's media time
+        by the arrival time since it, so one session never mixes pts with
+        the wall clock (which would look like a huge gap or a jump back).
+        """
+        now = time.monotonic()
+        pts_seconds = MediaClock.pts_seconds(frame)
+        if pts_seconds is not None:
+            media_time = pts_seconds
+        elif self._last_media_time is not None:
+            media_time = self._last_media_time + (now - self._last_arrival)
+        else:
+            media_time = 0.0
+
+        self._last_media_time = media_time
+        self._last_arrival = now
+        return media_time
+
+    def _is_stale(self, frame: av.VideoFrame) -> bool:
+        """
+        Check whether a frame lags real time by more than settings.max_frame_lag.
+
+        Args:
+            frame: Frame just returned by the track
+
+        Returns:
+            True if the frame should be dropped before conversion
+        """
+        lag = self._media_clock.lag(frame)
+        return settings.latest_frame_mode and lag > settings.max_frame_lag
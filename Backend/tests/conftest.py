@@ -0,0 +1,68 @@
+"""Shared fixtures."""
+
+from types import SimpleNamespace
+
+import pytest
+import torch
+from transformers import GitConfig, GitForCausalLM
+
+from scene_descriptor.config import HP
+from scene_descriptor.models.model_manager import ModelManager
+
+# Side of the square frames the tiny model sees
+TINY_IMAGE_SIZE = 32
+
+
+@pytest.fixture
+def tiny_git_model():
+    """A randomly initialized GIT model small enough to run in tests."""
+    config = GitConfig(
+        vision_config={
+            "hidden_size": 32,
+            "intermediate_size": 64,
+            "num_hidden_layers": 2,
+            "num_attention_heads": 2,
+            "image_size": TINY_IMAGE_SIZE,
+            "patch_size": 16,
+            "initializer_range": 0.5,
+        },
+        vocab_size=99,
+        hidden_size=32,
+        num_hidden_layers=2,
+        num_attention_heads=2,
+        intermediate_size=64,
+        max_position_embeddings=64,
+        num_image_with_embedding=HP.CLIP_LENGTH,
+        bos_token_id=1,
+        eos_token_id=2,
+        pad_token_id=0,
+        # Large random weights, so captions depend on the clip
+        initializer_range=0.5,
+    )
+    torch.manual_seed(0)
+    return GitForCausalLM(config).eval()
+
+
+@pytest.fixture
+def tiny_pixel_values():
+    """A batch of two random clips shaped for tiny_git_model."""
+    torch.manual_seed(1)
+    return torch.rand(2, HP.CLIP_LENGTH, 3, TINY_IMAGE_SIZE, TINY_IMAGE_SIZE)
+
+
+@pytest.fixture
+def tiny_model_manager(tiny_git_model):
+    """The ModelManager singleton serving tiny_git_model on the torch backend."""
+    ModelManager.reset_instance()
+    manager = ModelManager.get_instance()
+    manager._backend = "torch"
+    manager._device = torch.device("cpu")
+    manager._git_model = tiny_git_model
+    manager._current_model = tiny_git_model
+    # Stands in for the GIT processor, which needs downloaded tokenizer files
+    manager._processor = SimpleNamespace(
+        image_processor=SimpleNamespace(crop_size={"height": TINY_IMAGE_SIZE, "width": TINY_IMAGE_SIZE}),
+        batch_decode=lambda ids, skip_special_tokens=True: [" ".join(map(str, row.tolist())) for row in ids],
+    )
+    yield manager
+    ModelManager.reset_instance()
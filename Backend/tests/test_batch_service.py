@@ -0,0 +1,73 @@
+"""Tests for caption caching in the batch pipeline."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from scene_descriptor.services.batch_service import BatchCaptionPipeline, _ReadyClip
+from scene_descriptor.services.cache_service import CaptionCache
+
+
+class _StubManager(SimpleNamespace):
+    """Captions each clip by its index; can switch models during generate."""
+
+    def stack_clips(self, clips):
+        return clips
+
+    def generate_captions(self, pixel_values, max_length=None, priority=0):
+        captions = [f"{self.model_identity} {index}" for index in pixel_values]
+        if self.switch_to is not None:
+            self.model_identity = self.switch_to
+        return captions
+
+
+@pytest.fixture
+def videos(tmp_path):
+    paths = []
+    for i in range(2):
+        path = tmp_path / f"clip{i}.mp4"
+        path.write_bytes(bytes([i]) * 16)
+        paths.append(path)
+    return paths
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = CaptionCache(tmp_path / "cache.sqlite3")
+    yield cache
+    cache.close()
+
+
+def _pipeline(cache, model_id, switch_to=None):
+    manager = _StubManager(model_identity=model_id, switch_to=switch_to)
+    return BatchCaptionPipeline(manager, cache=cache, max_length=5)
+
+
+def _ready(pipeline, videos, model_id):
+    return [
+        _ReadyClip(path, i, 0.0, pipeline._cache_key(path, model_id), model_id)
+        for i, path in enumerate(videos)
+    ]
+
+
+def test_captions_cached_under_the_model_that_made_them(cache, videos):
+    pipeline = _pipeline(cache, "old")
+    batch = _ready(pipeline, videos, "old")
+
+    # /change_model between decode and generate
+    pipeline._model_manager.model_identity = "new"
+    results = pipeline._caption(batch)
+    assert [r.caption for r in results] == ["new 0", "new 1"]
+
+    for path in videos:
+        assert cache.get(pipeline._cache_key(path, "old")) is None
+    assert cache.get(pipeline._cache_key(videos[1], "new")) == "new 1"
+    assert cache.stats().models == {"new": 2}
+
+
+def test_batch_spanning_a_model_change_not_cached(cache, videos):
+    pipeline = _pipeline(cache, "old", switch_to="new")
+    results = pipeline._caption(_ready(pipeline, videos, "old"))
+
+    assert all(r.ok for r in results)
+    assert cache.stats().entries == 0
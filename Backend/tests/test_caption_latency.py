@@ -0,0 +1,45 @@
+"""Tests that background captioning stays out of the live latency metric."""
+
+import time
+from pathlib import Path
+
+import pytest
+
+from scene_descriptor.models import PRIORITY_BACKGROUND
+from scene_descriptor.services.batch_service import BatchCaptionPipeline, _ReadyClip
+from scene_descriptor.utils import metrics
+
+
+@pytest.fixture
+def fresh_metrics(monkeypatch):
+    registry = metrics.Metrics()
+    monkeypatch.setattr(metrics, "_metrics", registry)
+    return registry
+
+
+def test_live_captions_feed_caption_latency(tiny_model_manager, tiny_pixel_values, fresh_metrics):
+    captions = tiny_model_manager.generate_captions(tiny_pixel_values, max_length=5)
+
+    assert len(captions) == 2
+    assert len(fresh_metrics.latency("caption_latency").values()) == 1
+    assert fresh_metrics.latency("background_caption_latency").values() == []
+
+
+def test_background_batches_leave_live_p95_unchanged(tiny_model_manager, tiny_pixel_values, fresh_metrics):
+    for _ in range(3):
+        tiny_model_manager.generate_captions(tiny_pixel_values[:1], max_length=5)
+    live_p95 = fresh_metrics.latency("caption_latency").percentile(95)
+
+    # Background work through the batch pipeline, as /caption and /jobs run it
+    pipeline = BatchCaptionPipeline(tiny_model_manager, max_length=5, inference_priority=PRIORITY_BACKGROUND)
+    clips = [
+        _ReadyClip(source=Path(f"video{i}.mp4"), pixel_values=tiny_pixel_values[i:i + 1], ready_at=time.perf_counter())
+        for i in range(2)
+    ]
+    for _ in range(3):
+        assert all(result.ok for result in pipeline._caption(clips))
+    tiny_model_manager.generate_captions(tiny_pixel_values, max_length=5, priority=PRIORITY_BACKGROUND)
+
+    assert fresh_metrics.latency("caption_latency").percentile(95) == live_p95
+    assert len(fresh_metrics.latency("caption_latency").values()) == 3
+    assert len(fresh_metrics.latency("background_caption_latency").values()) == 4
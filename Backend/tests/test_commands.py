@@ -0,0 +1,48 @@
+"""Tests for the client command protocol."""
+
+import pytest
+
+from scene_descriptor.config import settings
+from scene_descriptor.enums import ClientCommand
+from scene_descriptor.utils.exceptions import DataChannelError
+from scene_descriptor.webrtc.commands import parse_command
+
+
+def test_bare_command_name():
+    command = parse_command(" Pause\n")
+    assert command.type == ClientCommand.PAUSE
+    assert command.seconds is None
+
+
+def test_bytes_message():
+    assert parse_command(b'{"type": "resume"}').type == ClientCommand.RESUME
+
+
+def test_describe_defaults_and_clamps_seconds():
+    assert parse_command("describe").seconds == settings.describe_default_seconds
+    assert parse_command('{"type": "describe", "seconds": 2}').seconds == 2.0
+    assert parse_command('{"type": "describe", "seconds": 1000}').seconds == settings.describe_max_seconds
+
+
+def test_cadence_clamps_to_capture_range():
+    assert parse_command('{"type": "cadence", "seconds": 0.1}').seconds == settings.min_capture_seconds
+    assert parse_command('{"type": "cadence", "seconds": 1000}').seconds == settings.max_capture_seconds
+
+
+def test_cadence_on_demand_and_adaptive():
+    assert parse_command('{"type": "cadence", "seconds": 0}').seconds == 0.0
+    assert parse_command('{"type": "cadence", "seconds": null}').seconds is None
+
+
+@pytest.mark.parametrize("message", [
+    "{not json",
+    "dance",
+    '{"seconds": 3}',
+    '{"type": "describe", "seconds": "soon"}',
+    '{"type": "describe", "seconds": -1}',
+    '{"type": "cadence", "seconds": NaN}',
+    '{"type": "cadence", "seconds": Infinity}',
+])
+def test_invalid_commands(message):
+    with pytest.raises(DataChannelError):
+        parse_command(message)
@@ -0,0 +1,120 @@
+"""Tests for batch-size bucketing and the torch.compile path."""
+
+import os
+from pathlib import Path
+
+import pytest
+import torch
+from torch import nn
+
+from scene_descriptor.config import settings
+from scene_descriptor.models import model_manager as model_manager_module
+from scene_descriptor.models.compilation import (
+    bucket_for,
+    compile_cache_key,
+    compile_git_model,
+    enable_compile_cache,
+    parse_buckets,
+    uncompile_git_model,
+)
+
+
+def test_parse_buckets_sorts_and_deduplicates():
+    assert parse_buckets("4,1, 2,4") == [1, 2, 4]
+
+
+def test_parse_buckets_drops_non_positive_and_empty():
+    assert parse_buckets("0,-2,,8") == [8]
+    assert parse_buckets("") == [1]
+    assert parse_buckets("0") == [1]
+
+
+def test_bucket_for():
+    buckets = [1, 2, 4, 8]
+    assert bucket_for(1, buckets) == 1
+    assert bucket_for(3, buckets) == 4
+    assert bucket_for(8, buckets) == 8
+    assert bucket_for(9, buckets) == 9
+
+
+def test_compile_cache_key_tracks_inputs():
+    shapes = [(1, 6, 3, 224, 224)]
+    key = compile_cache_key("abc", shapes, torch.float32, "default")
+
+    assert key == compile_cache_key("abc", list(shapes), torch.float32, "default")
+    assert key != compile_cache_key("abd", shapes, torch.float32, "default")
+    assert key != compile_cache_key("abc", [(2, 6, 3, 224, 224)], torch.float32, "default")
+    assert key != compile_cache_key("abc", shapes, torch.bfloat16, "default")
+    assert key != compile_cache_key("abc", shapes, torch.float32, "max-autotune")
+
+
+def test_enable_compile_cache_uses_keyed_dir(tmp_path, monkeypatch):
+    for var in ("TORCHINDUCTOR_CACHE_DIR", "TORCHINDUCTOR_FX_GRAPH_CACHE", "TORCHINDUCTOR_AUTOGRAD_CACHE"):
+        monkeypatch.delenv(var, raising=False)
+    (tmp_path / "key1").mkdir()
+    (tmp_path / "key1" / "artifacts.bin").write_bytes(b"not artifacts")
+
+    keyed_dir = enable_compile_cache(tmp_path, "key1")
+    assert keyed_dir == tmp_path / "key1"
+    assert os.environ["TORCHINDUCTOR_CACHE_DIR"] == str(keyed_dir / "inductor")
+
+    # A new key gets a fresh directory
+    assert enable_compile_cache(tmp_path, "key2") == tmp_path / "key2"
+    assert os.environ["TORCHINDUCTOR_CACHE_DIR"] == str(tmp_path / "key2" / "inductor")
+
+
+def test_uncompile_restores_eager_modules(tiny_git_model):
+    encoder = tiny_git_model.git.image_encoder
+    compile_git_model(tiny_git_model)
+    assert tiny_git_model.git.image_encoder is not encoder
+
+    uncompile_git_model(tiny_git_model)
+    assert tiny_git_model.git.image_encoder is encoder
+    uncompile_git_model(tiny_git_model)
+    assert tiny_git_model.git.image_encoder is encoder
+
+
+@pytest.fixture
+def compiling_manager(tiny_model_manager, tmp_path, monkeypatch):
+    """The tiny ModelManager set up for _compile_models."""
+    monkeypatch.setattr(settings, "compile_cache_dir", tmp_path / "cache")
+    monkeypatch.setattr(settings, "compile_batch_buckets", "1,2")
+    monkeypatch.setattr(settings, "max_caption_length", 5)
+    for var in ("TORCHINDUCTOR_CACHE_DIR", "TORCHINDUCTOR_FX_GRAPH_CACHE", "TORCHINDUCTOR_AUTOGRAD_CACHE"):
+        monkeypatch.delenv(var, raising=False)
+
+    tiny_model_manager._backend = "compiled"
+    return tiny_model_manager
+
+
+def test_eager_fallback_when_compile_unavailable(compiling_manager, monkeypatch):
+    monkeypatch.setattr(model_manager_module, "compile_available", lambda: False)
+    encoder = compiling_manager._git_model.git.image_encoder
+
+    compiling_manager._compile_models(Path("missing"))
+    assert compiling_manager.backend == "torch"
+    assert compiling_manager._git_model.git.image_encoder is encoder
+
+
+def test_eager_fallback_when_compile_fails(compiling_manager, monkeypatch):
+    def broken_compile(module, **kwargs):
+        # Fails on first use, like inductor without a C compiler
+        class Broken(nn.Module):
+            def __init__(self):
+                super().__init__()
+                self._orig_mod = module
+
+            def forward(self, *args, **kwargs):
+                raise RuntimeError("no compiler")
+
+        return Broken()
+
+    monkeypatch.setattr(torch, "compile", broken_compile)
+    monkeypatch.setattr(model_manager_module, "compile_available", lambda: True)
+    model = compiling_manager._git_model
+    encoder = model.git.image_encoder
+
+    compiling_manager._compile_models(Path("missing"))
+    assert compiling_manager.backend == "torch"
+    assert model.git.image_encoder is encoder
+    assert compiling_manager._pad_to_bucket(torch.zeros(1, 2)).shape == (1, 2)
@@ -0,0 +1,22 @@
+"""Tests for CPU thread topology."""
+
+from scene_descriptor.models.cpu_topology import configure_cpu_topology, get_cpu_topology, partition_cores
+
+
+def test_configure_cpu_topology_can_run_twice():
+    first = configure_cpu_topology(num_workers=1, pin_workers=False)
+    # Inter-op threads can only be set once per process; later calls keep them
+    second = configure_cpu_topology(num_workers=1, pin_workers=False)
+
+    assert first.inter_op_threads >= 1
+    assert second.inter_op_threads >= 1
+    assert get_cpu_topology() is second
+
+
+def test_partition_cores_splits_evenly():
+    assert partition_cores([0, 1, 2, 3], 2) == [[0, 1], [2, 3]]
+
+
+def test_partition_cores_spreads_remainder_and_shares_when_short():
+    assert partition_cores([0, 1, 2], 2) == [[0, 1], [2]]
+    assert partition_cores([0], 3) == [[0], [0], [0]]
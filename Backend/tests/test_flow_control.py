@@ -0,0 +1,87 @@
+"""Tests for sender-side flow control."""
+
+from scene_descriptor.config import settings
+from scene_descriptor.services.degradation_service import DegradationLevel
+from scene_descriptor.webrtc.flow_control import (
+    MIN_BITRATE_KBPS,
+    PAUSED_FRAMERATE,
+    VideoConstraints,
+    constrain_video_answer,
+    target_constraints,
+)
+
+CONSTRAINTS = VideoConstraints(max_width=640, max_height=480, max_framerate=10, max_bitrate_kbps=300)
+
+ANSWER = "\r\n".join([
+    "v=0",
+    "o=- 1 1 IN IP4 0.0.0.0",
+    "s=-",
+    "t=0 0",
+    "m=audio 9 UDP/TLS/RTP/SAVPF 111",
+    "c=IN IP4 0.0.0.0",
+    "a=rtpmap:111 opus/48000/2",
+    "m=video 9 UDP/TLS/RTP/SAVPF 96",
+    "c=IN IP4 0.0.0.0",
+    "b=AS:2000",
+    "a=framerate:30",
+    "a=rtpmap:96 VP8/90000",
+    "",
+])
+
+
+def _section(sdp, kind):
+    sections = sdp.split("\r\nm=")
+    return next(s for s in sections if s.startswith(kind)).split("\r\n")
+
+
+def test_video_section_gets_limits():
+    video = _section(constrain_video_answer(ANSWER, CONSTRAINTS), "video")
+    assert video == [
+        "video 9 UDP/TLS/RTP/SAVPF 96",
+        "c=IN IP4 0.0.0.0",
+        "b=AS:300",
+        "b=TIAS:300000",
+        "a=rtpmap:96 VP8/90000",
+        "a=framerate:10",
+        "a=imageattr:* recv [x=[16:640],y=[16:480]]",
+        "",
+    ]
+
+
+def test_audio_section_untouched():
+    sdp = constrain_video_answer(ANSWER, CONSTRAINTS)
+    assert _section(sdp, "audio") == _section(ANSWER, "audio")
+    assert sdp.endswith("\r\n")
+
+
+def test_video_section_without_attributes():
+    sdp = "v=0\r\nm=video 9 UDP/TLS/RTP/SAVPF 96"
+    lines = constrain_video_answer(sdp, CONSTRAINTS).split("\r\n")
+    assert lines[2:4] == ["b=AS:300", "b=TIAS:300000"]
+    assert lines[-1].startswith("a=imageattr:")
+
+
+def test_target_constraints_defaults():
+    constraints = target_constraints()
+    assert constraints.max_framerate == settings.target_video_fps
+    assert constraints.max_bitrate_kbps == settings.target_video_bitrate_kbps
+    assert constraints.max_width == settings.target_video_width
+
+
+def test_target_constraints_paused():
+    constraints = target_constraints(paused=True)
+    assert constraints.max_framerate == PAUSED_FRAMERATE
+    assert constraints.max_bitrate_kbps == MIN_BITRATE_KBPS
+
+
+def test_target_constraints_degraded():
+    level = DegradationLevel(level=1, name="reduced", capture_scale=0.5, clip_length=4, max_caption_length=20)
+    constraints = target_constraints(level)
+    assert constraints.max_framerate == max(PAUSED_FRAMERATE, settings.target_video_fps // 2)
+    assert constraints.max_bitrate_kbps == max(MIN_BITRATE_KBPS, settings.target_video_bitrate_kbps // 2)
+
+
+def test_to_message():
+    message = CONSTRAINTS.to_message()
+    assert message["type"] == "video_constraints"
+    assert message["max_bitrate_kbps"] == 300
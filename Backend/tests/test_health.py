@@ -0,0 +1,34 @@
+"""Tests for the health endpoint."""
+
+import json
+
+import pytest
+from aiohttp.test_utils import make_mocked_request
+
+from scene_descriptor.api.handlers import health_handler
+from scene_descriptor.enums import ModelStatus
+from scene_descriptor.models.model_manager import ModelManager
+
+
+@pytest.fixture
+def model_manager():
+    ModelManager.reset_instance()
+    yield ModelManager.get_instance()
+    ModelManager.reset_instance()
+
+
+@pytest.mark.parametrize("status, expected", [
+    (ModelStatus.NOT_LOADED, "starting"),
+    (ModelStatus.LOADING, "starting"),
+    (ModelStatus.WARMING_UP, "starting"),
+    (ModelStatus.ERROR, "error"),
+])
+async def test_not_ready_is_unhealthy(model_manager, status, expected):
+    model_manager._status = status
+
+    response = await health_handler(make_mocked_request("GET", "/health"))
+    assert response.status == 503
+    body = json.loads(response.body)
+    assert body["status"] == expected
+    assert body["model_status"] == status.value
+    assert body["model_ready"] is False
@@ -0,0 +1,123 @@
+"""Tests for quality-aware keyframe selection."""
+
+import numpy as np
+import pytest
+
+from scene_descriptor.models.keyframes import KeyframeSelector, exposure_score, laplacian_variance
+from scene_descriptor.utils.exceptions import FrameSamplingError
+
+SIZE = (48, 64)
+
+
+def _sharp(seed=0):
+    return np.random.default_rng(seed).integers(0, 256, SIZE, dtype=np.uint8)
+
+
+def _flat(level=128):
+    return np.full(SIZE, level, dtype=np.uint8)
+
+
+def _add(selector, luma, timestamp):
+    return selector.add(luma, timestamp, lambda: np.full((2, 2, 3), timestamp))
+
+
+def test_laplacian_variance_prefers_detail():
+    assert laplacian_variance(_flat() / 255.0) == 0.0
+    assert laplacian_variance(_sharp() / 255.0) > 0.0
+
+
+def test_exposure_score_penalizes_clipping():
+    assert exposure_score(_flat(128) / 255.0) > 0.9
+    assert exposure_score(_flat(0) / 255.0) == 0.0
+
+
+def test_invalid_capacity():
+    with pytest.raises(FrameSamplingError):
+        KeyframeSelector(0)
+
+
+def test_keeps_top_k_and_loads_only_kept_frames():
+    selector = KeyframeSelector(2)
+    assert _add(selector, _sharp(1), 0.0)
+    assert _add(selector, _sharp(2), 1.0)
+
+    loads = []
+    kept = selector.add(_flat(0), 2.0, lambda: loads.append(2.0))
+    assert not kept
+    assert loads == []
+    assert len(selector) == 2
+
+
+def test_select_spreads_over_window():
+    selector = KeyframeSelector(8)
+    for i in range(8):
+        _add(selector, _sharp(i), float(i))
+
+    frames, times = selector.select(4, 0.0, 8.0)
+    assert frames.shape == (4, 2, 2, 3)
+    assert list(np.diff(times) > 0) == [True] * 3
+    # One frame per two-second bin
+    assert list(times // 2) == [0, 1, 2, 3]
+    assert frames[:, 0, 0, 0].tolist() == times.tolist()
+
+
+def test_select_fills_empty_bins():
+    selector = KeyframeSelector(4)
+    _add(selector, _sharp(0), 0.5)
+    _add(selector, _sharp(1), 1.0)
+
+    frames, times = selector.select(4, 0.0, 8.0)
+    assert len(frames) == 4
+    assert set(times) <= {0.5, 1.0}
+
+
+def test_select_without_candidates():
+    with pytest.raises(FrameSamplingError):
+        KeyframeSelector(2).select(4, 0.0, 1.0)
+
+
+def test_evict_before_and_reset():
+    selector = KeyframeSelector(4)
+    for i in range(4):
+        _add(selector, _sharp(i), float(i))
+
+    selector.evict_before(2.0)
+    assert len(selector) == 2
+    _, times = selector.select(2, 2.0, 4.0)
+    assert times.tolist() == [2.0, 3.0]
+
+    selector.reset()
+    assert len(selector) == 0
+
+
+def test_invalid_recent_count():
+    with pytest.raises(FrameSamplingError):
+        KeyframeSelector(2, recent=2)
+
+
+def test_recent_frames_kept_whatever_their_score():
+    selector = KeyframeSelector(4, recent=2)
+    for i in range(4):
+        _add(selector, _sharp(i), float(i))
+
+    # Dark, flat frames would never beat the sharp ones on score
+    for t in (10.0, 11.0, 12.0):
+        assert _add(selector, _flat(0), t)
+
+    selector.evict_before(10.0)
+    assert len(selector) == 2
+    _, times = selector.select(2, 10.0, 12.0)
+    assert times.tolist() == [11.0, 12.0]
+
+
+def test_describe_span_always_has_frames():
+    selector = KeyframeSelector(6, recent=1)
+    for i in range(30):
+        # Sharp early frames, then the scene goes dark
+        _add(selector, _sharp(i) if i < 20 else _flat(0), i / 10)
+
+    # Describe the last 0.05 s: only the newest frame is in the span
+    selector.evict_before(2.85)
+    frames, times = selector.select(4, 2.85, 2.9)
+    assert len(frames) == 4
+    assert set(times.tolist()) == {2.9}
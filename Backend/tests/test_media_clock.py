@@ -0,0 +1,60 @@
+"""Tests for the received-frame media clock."""
+
+from fractions import Fraction
+from types import SimpleNamespace
+
+from scene_descriptor.webrtc.media_clock import BASELINE_WINDOW_SECONDS, MediaClock
+
+FPS = 30
+TIME_BASE = Fraction(1, 90000)
+
+
+def _frame(seconds):
+    return SimpleNamespace(pts=round(seconds * 90000), time_base=TIME_BASE)
+
+
+def test_frames_without_pts_have_no_lag():
+    clock = MediaClock()
+    assert clock.lag(SimpleNamespace(pts=None, time_base=TIME_BASE), now=10.0) == 0.0
+
+
+def test_steady_stream_has_no_lag():
+    clock = MediaClock()
+    lags = [clock.lag(_frame(i / FPS), now=100.0 + i / FPS) for i in range(90)]
+    assert max(lags) < 1e-3
+
+
+def test_stall_longer_than_window_reports_lag():
+    clock = MediaClock()
+    for i in range(FPS):
+        clock.lag(_frame(i / FPS), now=100.0 + i / FPS)
+
+    # The receive loop stalls; frames captured meanwhile arrive in a burst
+    stall = BASELINE_WINDOW_SECONDS + 1.0
+    resume = 101.0 + stall
+    buffered = [i / FPS for i in range(FPS, FPS + int(stall * FPS))]
+    arrivals = [resume + n * 0.001 for n in range(len(buffered))]
+    lags = [clock.lag(_frame(pts), now=now) for pts, now in zip(buffered, arrivals)]
+
+    # Every buffered frame reports its real age against the pre-stall baseline
+    for pts, now, lag in zip(buffered, arrivals, lags):
+        assert abs(lag - (now - 100.0 - pts)) < 1e-3
+    assert lags[0] > stall - 0.1
+
+
+def test_lasting_delay_rise_becomes_baseline():
+    clock = MediaClock()
+    for i in range(FPS):
+        clock.lag(_frame(i / FPS), now=100.0 + i / FPS)
+
+    # Network delay rises by 1 s and stays there
+    frames = range(FPS, FPS * 10)
+    lags = [clock.lag(_frame(i / FPS), now=101.0 + i / FPS) for i in frames]
+    assert lags[0] > 0.9
+    assert lags[-1] < 1e-3
+
+
+def test_discontinuity_resets_baseline():
+    clock = MediaClock()
+    clock.lag(_frame(0.0), now=100.0)
+    assert clock.lag(_frame(1000.0), now=100.5) == 0.0
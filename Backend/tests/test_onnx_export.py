@@ -0,0 +1,66 @@
+"""Parity of the exported ONNX graphs with the PyTorch model."""
+
+import numpy as np
+import pytest
+import torch
+
+from scene_descriptor.config import HP
+from scene_descriptor.models.onnx_export import (
+    DecoderStepWrapper,
+    PrefillWrapper,
+    _check_decode_parity,
+    export_git_onnx,
+)
+from scene_descriptor.utils.exceptions import ModelError
+
+from .conftest import TINY_IMAGE_SIZE
+
+pytest.importorskip("onnx")
+pytest.importorskip("onnxruntime")
+
+
+def _generate(model, pixel_values, max_length):
+    """model.generate, padded with pad_token_id to max_length."""
+    with torch.no_grad():
+        ids = model.generate(pixel_values=pixel_values, max_length=max_length).numpy()
+    padding = np.full((ids.shape[0], max_length - ids.shape[1]), model.config.pad_token_id)
+    return np.concatenate([ids, padding], axis=1)
+
+
+def test_onnx_greedy_matches_generate(tiny_git_model, tmp_path):
+    from scene_descriptor.models.onnx_backend import OnnxCaptionModel
+
+    export_git_onnx(tiny_git_model, tmp_path, clip_length=HP.CLIP_LENGTH, image_size=TINY_IMAGE_SIZE)
+    onnx_model = OnnxCaptionModel(tmp_path)
+
+    # A batch size and caption length other than the ones traced at export
+    torch.manual_seed(2)
+    pixel_values = torch.rand(3, HP.CLIP_LENGTH, 3, TINY_IMAGE_SIZE, TINY_IMAGE_SIZE)
+    token_ids = onnx_model.generate(pixel_values=pixel_values.numpy(), max_length=16)
+
+    expected = _generate(tiny_git_model, pixel_values, 16)
+    assert len({tuple(row) for row in expected}) > 1, "captions should depend on the clip"
+    np.testing.assert_array_equal(token_ids, expected[:, :token_ids.shape[1]])
+    assert token_ids.shape[1] == 16 or (token_ids == tiny_git_model.config.eos_token_id).any(axis=1).all()
+
+
+def test_onnx_prefill_logits_match_forward(tiny_git_model, tiny_pixel_values, tmp_path):
+    import onnxruntime as ort
+
+    export_git_onnx(tiny_git_model, tmp_path, clip_length=HP.CLIP_LENGTH, image_size=TINY_IMAGE_SIZE)
+    session = ort.InferenceSession(str(tmp_path / "prefill.onnx"), providers=["CPUExecutionProvider"])
+    logits = session.run(None, {"pixel_values": tiny_pixel_values.numpy()})[0]
+
+    input_ids = torch.full((2, 1), tiny_git_model.config.bos_token_id)
+    with torch.no_grad():
+        expected = tiny_git_model(input_ids=input_ids, pixel_values=tiny_pixel_values).logits[:, -1]
+    np.testing.assert_allclose(logits, expected.numpy(), atol=1e-4)
+
+
+def test_parity_check_rejects_wrong_decoding(tiny_git_model, tiny_pixel_values):
+    prefill = PrefillWrapper(tiny_git_model)
+    # Counting image tokens as text positions decodes differently
+    decoder = DecoderStepWrapper(tiny_git_model, num_image_tokens=0)
+
+    with torch.no_grad(), pytest.raises(ModelError, match="transformers"):
+        _check_decode_parity(tiny_git_model, prefill, decoder, tiny_pixel_values)
@@ -0,0 +1,82 @@
+"""Tests for result writers and crash-safe resume."""
+
+from pathlib import Path
+
+from scene_descriptor.services.output_service import (
+    CsvResultWriter,
+    JsonlResultWriter,
+    _truncate_partial_line,
+    open_result_writer,
+    result_record,
+)
+
+
+def test_truncate_partial_line_drops_torn_record(tmp_path):
+    path = tmp_path / "out.jsonl"
+    path.write_bytes(b'{"a": 1}\n{"b": 2}\n{"c":')
+
+    _truncate_partial_line(path)
+    assert path.read_bytes() == b'{"a": 1}\n{"b": 2}\n'
+
+
+def test_truncate_partial_line_keeps_complete_file(tmp_path):
+    path = tmp_path / "out.jsonl"
+    path.write_bytes(b'{"a": 1}\n')
+
+    _truncate_partial_line(path)
+    assert path.read_bytes() == b'{"a": 1}\n'
+
+
+def test_truncate_partial_line_single_torn_line(tmp_path):
+    path = tmp_path / "out.jsonl"
+    path.write_bytes(b"x" * 10000)
+
+    _truncate_partial_line(path)
+    assert path.read_bytes() == b""
+
+
+def test_truncate_partial_line_empty_file(tmp_path):
+    path = tmp_path / "out.jsonl"
+    path.write_bytes(b"")
+
+    _truncate_partial_line(path)
+    assert path.read_bytes() == b""
+
+
+def test_jsonl_writer_resumes_after_crash(tmp_path):
+    path = tmp_path / "out.jsonl"
+    with JsonlResultWriter(path) as writer:
+        writer.write(result_record(Path("a.mp4"), "first"))
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"video": "b.mp4", "capt')
+
+    with JsonlResultWriter(path, append=True) as writer:
+        assert writer.completed() == {str(Path("a.mp4").resolve())}
+        writer.write(result_record(Path("c.mp4"), "second"))
+
+    captions = [record["caption"] for record in JsonlResultWriter(path, append=True).read()]
+    assert captions == ["first", "second"]
+
+
+def test_csv_writer_writes_header_once(tmp_path):
+    path = tmp_path / "out.csv"
+    with CsvResultWriter(path) as writer:
+        writer.write(result_record(Path("a.mp4"), "first"))
+    with CsvResultWriter(path, append=True) as writer:
+        writer.write(result_record(Path("b.mp4"), "second, with comma"))
+
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert lines[0] == "video,caption,path"
+    assert len(lines) == 3
+
+    with CsvResultWriter(path, append=True) as writer:
+        assert [record["caption"] for record in writer.read()] == ["first", "second, with comma"]
+
+
+def test_writer_without_append_overwrites(tmp_path):
+    path = tmp_path / "out.jsonl"
+    with open_result_writer(path) as writer:
+        writer.write(result_record(Path("a.mp4"), "first"))
+    with open_result_writer(path) as writer:
+        assert isinstance(writer, JsonlResultWriter)
+        assert writer.read() == []
@@ -0,0 +1,77 @@
+"""Tests for timeline cue building and subtitle rendering."""
+
+from pathlib import Path
+
+from scene_descriptor.models.segments import VideoSegment
+from scene_descriptor.services.batch_service import ClipResult
+from scene_descriptor.services.timeline_service import (
+    TimelineCue,
+    build_cues,
+    format_timestamp,
+    render_srt,
+    render_webvtt,
+)
+
+VIDEO = Path("video.mp4")
+
+
+def _result(index, caption=None, error=None, length=10.0):
+    segment = VideoSegment(VIDEO, index, index * length, (index + 1) * length)
+    return ClipResult(VIDEO, caption=caption, error=error, segment=segment)
+
+
+def test_format_timestamp():
+    assert format_timestamp(0) == "00:00:00.000"
+    assert format_timestamp(3723.456) == "01:02:03.456"
+    assert format_timestamp(59.9996) == "00:01:00.000"
+    assert format_timestamp(1.5, ",") == "00:00:01,500"
+
+
+def test_format_timestamp_clamps_negative():
+    assert format_timestamp(-2.0) == "00:00:00.000"
+
+
+def test_build_cues_sorts_by_segment_index():
+    cues = build_cues([_result(1, "b"), _result(0, "a")])
+    assert cues == [TimelineCue(0.0, 10.0, "a"), TimelineCue(10.0, 20.0, "b")]
+
+
+def test_build_cues_merges_consecutive_repeats():
+    cues = build_cues([_result(0, "same "), _result(1, "same"), _result(2, "other")])
+    assert cues == [TimelineCue(0.0, 20.0, "same"), TimelineCue(20.0, 30.0, "other")]
+
+
+def test_build_cues_keeps_repeats_without_merging():
+    cues = build_cues([_result(0, "same"), _result(1, "same")], merge_repeats=False)
+    assert len(cues) == 2
+
+
+def test_build_cues_failed_segment_leaves_gap():
+    cues = build_cues([_result(0, "same"), _result(1, error="boom"), _result(2, "same")])
+    assert cues == [TimelineCue(0.0, 10.0, "same"), TimelineCue(20.0, 30.0, "same")]
+
+
+def test_build_cues_skips_results_without_segment():
+    cues = build_cues([ClipResult(VIDEO, caption="whole video"), _result(0, "a")])
+    assert cues == [TimelineCue(0.0, 10.0, "a")]
+
+
+def test_render_webvtt():
+    cues = [TimelineCue(0.0, 1.5, "a dog"), TimelineCue(1.5, 3.0, "a cat")]
+    assert render_webvtt(cues) == (
+        "WEBVTT\n\n"
+        "00:00:00.000 --> 00:00:01.500\na dog\n\n"
+        "00:00:01.500 --> 00:00:03.000\na cat\n"
+    )
+
+
+def test_render_webvtt_empty():
+    assert render_webvtt([]) == "WEBVTT\n"
+
+
+def test_render_srt():
+    cues = [TimelineCue(0.0, 1.5, "a dog"), TimelineCue(1.5, 3.0, "a cat")]
+    assert render_srt(cues) == (
+        "1\n00:00:00,000 --> 00:00:01,500\na dog\n\n"
+        "2\n00:00:01,500 --> 00:00:03,000\na cat\n"
+    )
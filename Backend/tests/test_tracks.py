@@ -0,0 +1,54 @@
+"""Tests for live caption sessions."""
+
+from fractions import Fraction
+from types import SimpleNamespace
+
+import pytest
+
+from scene_descriptor.webrtc import tracks
+from scene_descriptor.webrtc.tracks import VideoCaptionTrack
+
+TIME_BASE = Fraction(1, 90000)
+
+
+class FakeClock:
+    """Stands in for time.monotonic."""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(tracks.time, "monotonic", fake)
+    return fake
+
+
+def _frame(seconds=None):
+    pts = None if seconds is None else round(seconds * 90000)
+    return SimpleNamespace(pts=pts, time_base=TIME_BASE)
+
+
+def test_frames_without_pts_continue_the_pts_clock(clock):
+    track = VideoCaptionTrack(track=None)
+    times = []
+    for i in range(6):
+        # Every other frame arrives without a timestamp
+        times.append(track._media_time(_frame(5.0 + i * 0.1 if i % 2 == 0 else None)))
+        clock.now += 0.1
+
+    assert times == pytest.approx([5.0 + i * 0.1 for i in range(6)])
+
+
+def test_session_without_pts_uses_arrival_spacing(clock):
+    track = VideoCaptionTrack(track=None)
+    times = []
+    for _ in range(3):
+        times.append(track._media_time(_frame()))
+        clock.now += 0.5
+
+    assert times == pytest.approx([0.0, 0.5, 1.0])
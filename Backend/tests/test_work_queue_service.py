@@ -0,0 +1,112 @@
+"""Tests for the lease-based work queue."""
+
+import time
+
+import pytest
+
+from scene_descriptor.services.work_queue_service import DONE, FAILED, WorkQueue
+
+
+@pytest.fixture
+def queue(tmp_path):
+    work_queue = WorkQueue(tmp_path / "queue.db", max_attempts=2)
+    yield work_queue
+    work_queue.close()
+
+
+def _videos(tmp_path, count):
+    return [tmp_path / f"video{i}.mp4" for i in range(count)]
+
+
+def test_enqueue_ignores_duplicates(queue, tmp_path):
+    videos = _videos(tmp_path, 3)
+    assert queue.enqueue(videos) == 3
+    assert queue.enqueue(videos[:2]) == 0
+    assert queue.progress().pending == 3
+
+
+def test_lease_takes_pending_items_in_order(queue, tmp_path):
+    videos = _videos(tmp_path, 3)
+    queue.enqueue(videos)
+
+    items = queue.lease("a", 2)
+    assert [item.path for item in items] == [str(v.resolve()) for v in videos[:2]]
+    assert all(item.attempts == 1 for item in items)
+
+    assert len(queue.lease("b", 5)) == 1
+    assert queue.lease("c", 5) == []
+
+    progress = queue.progress()
+    assert (progress.pending, progress.leased) == (0, 3)
+
+
+def test_commit_records_caption(queue, tmp_path):
+    queue.enqueue(_videos(tmp_path, 1))
+    (item,) = queue.lease("a", 1)
+
+    assert queue.commit(item.id, "a", "a dog runs")
+    progress = queue.progress()
+    assert progress.done == 1
+    assert progress.finished
+    assert queue.results(DONE) == [
+        {"path": item.path, "caption": "a dog runs", "error": None, "worker": "a"}
+    ]
+
+
+def test_commit_by_other_worker_is_rejected(queue, tmp_path):
+    queue.enqueue(_videos(tmp_path, 1))
+    (item,) = queue.lease("a", 1)
+
+    assert not queue.commit(item.id, "b", "stolen")
+    assert queue.progress().leased == 1
+
+
+def test_expired_lease_is_requeued(queue, tmp_path):
+    queue.enqueue(_videos(tmp_path, 1))
+    (item,) = queue.lease("a", 1, lease_seconds=0.01)
+    time.sleep(0.05)
+
+    (retry,) = queue.lease("b", 1)
+    assert retry.id == item.id
+    assert retry.attempts == 2
+
+    # The first worker lost its lease
+    assert not queue.commit(item.id, "a", "late")
+    assert queue.commit(retry.id, "b", "on time")
+
+
+def test_expired_lease_fails_after_max_attempts(queue, tmp_path):
+    queue.enqueue(_videos(tmp_path, 1))
+    for _ in range(2):
+        assert queue.lease("a", 1, lease_seconds=0.01)
+        time.sleep(0.05)
+
+    assert queue.requeue_expired() == 1
+    progress = queue.progress()
+    assert (progress.pending, progress.failed) == (0, 1)
+    assert queue.results(FAILED)[0]["error"] == "lease expired too many times"
+
+
+def test_heartbeat_extends_leases(queue, tmp_path):
+    queue.enqueue(_videos(tmp_path, 2))
+    queue.lease("a", 2, lease_seconds=0.05)
+
+    assert queue.heartbeat("a", lease_seconds=60) == 2
+    time.sleep(0.1)
+    assert queue.requeue_expired() == 0
+
+
+def test_fail_retries_until_max_attempts(queue, tmp_path):
+    queue.enqueue(_videos(tmp_path, 1))
+
+    (item,) = queue.lease("a", 1)
+    assert queue.fail(item.id, "a", "decode error")
+    assert queue.progress().pending == 1
+
+    (item,) = queue.lease("a", 1)
+    assert queue.fail(item.id, "a", "decode error")
+    assert queue.progress().failed == 1
+
+    assert queue.retry_failed() == 1
+    (item,) = queue.lease("a", 1)
+    assert item.attempts == 1